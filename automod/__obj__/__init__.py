@@ -1 +1,2 @@
-from .__base import TypeHintedToolboxObject
\ No newline at end of file
+from .__base import TypeHintedToolboxObject
+from .__view import ConfigView, ListView
\ No newline at end of file
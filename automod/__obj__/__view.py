@@ -0,0 +1,104 @@
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Iterator, Any
+
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_copy(x) for x in value]
+    else:
+        return value
+
+
+def _wrap(value: Any) -> Any:
+    if isinstance(value, dict):
+        return ConfigView(value)
+    elif isinstance(value, list):
+        return ListView(value)
+    else:
+        return value
+
+
+class ConfigView(Mapping):
+    """
+    Read-only attribute access to a (config) dict. Unlike ``TypeHintedToolboxObject`` nothing is copied,
+    nested dicts and lists are wrapped the first time they're accessed. Missing keys raise ``AttributeError``,
+    so ``hasattr()`` can be used to check for optional keys.
+    """
+    __slots__ = ("_data", "_wrapped")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_wrapped", {})
+
+
+    def __getitem__(self, k: str) -> Any:
+        try:
+            return self._wrapped[k]
+        except KeyError:
+            v = _wrap(self._data[k])
+            self._wrapped[k] = v
+            return v
+
+
+    def __getattr__(self, k: str) -> Any:
+        try:
+            return self[k]
+        except KeyError:
+            raise AttributeError(k)
+
+
+    def __setattr__(self, k: str, v: Any) -> None:
+        raise AttributeError("ConfigView is read-only")
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+    def __contains__(self, k: Any) -> bool:
+        return k in self._data
+
+
+    def __repr__(self) -> str:
+        return f"ConfigView({self._data!r})"
+
+
+    def raw(self) -> Dict[str, Any]:
+        """Returns a deep copy that can be modified and written back"""
+        return _copy(self._data)
+
+
+class ListView(Sequence):
+    __slots__ = ("_data",)
+
+    def __init__(self, data: List[Any]) -> None:
+        self._data = data
+
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [_wrap(x) for x in self._data[i]]
+        return _wrap(self._data[i])
+
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+    def __contains__(self, x: Any) -> bool:
+        return x in self._data
+
+
+    def __repr__(self) -> str:
+        return f"ListView({self._data!r})"
+
+
+    def raw(self) -> List[Any]:
+        return _copy(self._data)
@@ -6,6 +6,7 @@ from discord.ext import commands
 import json
 import traceback
 import requests
+from prometheus_client import start_http_server
 import datetime
 import asyncio
 from typing import Union, Tuple, Optional, Dict, List
@@ -15,8 +16,8 @@ import logging; log = logging.getLogger()
 from .__obj__ import TypeHintedToolboxObject as Object
 from .cache import InternalCache
 from .mongo import MongoDB
-from .schemas import GuildConfig, Stats
-from .utils import Translator, Emotes, LogQueue, MessageCache
+from .schemas import GuildConfig
+from .utils import Translator, Emotes, LogQueue, MessageCache, RulePlanCache, RegexSandbox, MessageFeatureCache, InviteResolver, RaidDetector, DeletionBatcher, PermissionCache, RuleMetrics, CounterAggregator, XPLedger
 from .types import embed, Context
 from .views import pages
 from .observer import Observer 
@@ -126,6 +127,21 @@ class ShardedBotInstance(commands.AutoShardedBot):
         self.locale = Translator(self)
         self._log_queue = LogQueue(self)
         self.message_cache = MessageCache()
+        self.rule_plans = RulePlanCache(self)
+        self.regex_sandbox = RegexSandbox(self)
+        self.message_features = MessageFeatureCache()
+        self.invites = InviteResolver(self)
+        self.raids = RaidDetector(self)
+        self.deletions = DeletionBatcher(self)
+        self.permissions = PermissionCache(self)
+        self.counters = CounterAggregator(self)
+        self.xp_ledger = XPLedger(self)
+        self.metrics = RuleMetrics(
+            self.config.metrics_sample_every or 10, 
+            self.config.metrics_per_guild == True
+        )
+        if (self.config.metrics_port or 0) > 0:
+            start_http_server(int(self.config.metrics_port), registry=self.metrics.registry)
 
 
     def _start_text(self) -> None:
@@ -209,6 +225,7 @@ class ShardedBotInstance(commands.AutoShardedBot):
                 await self.observer.start()
 
             for g in self.guilds:
+                self.cache.pin("configs", g.id)
                 if not self.db.configs.exists(g.id):
                     self.db.configs.insert(GuildConfig(g, self.config.default_prefix))
             
@@ -491,37 +508,28 @@ class ShardedBotInstance(commands.AutoShardedBot):
     
 
     def update_command_stats(self) -> None:
-        cur = self.db.stats.get(self.user.id, "used_commands")
-        if cur == None:
-            self.db.stats.insert(Stats(self.user.id, 1, 0))
-        else:
-            self.db.stats.update(self.user.id, "used_commands", cur + 1)
+        self.counters.inc("stats", self.user.id, "used_commands", upsert=True)
 
 
     def get_command_stats(self) -> int:
         cur = self.db.stats.get(self.user.id, "used_commands")
-        if cur == None:
-            self.db.stats.insert(Stats(self.user.id, 1, 0))
-            return 0
-        else:
-            return cur
+        return (cur or 0) + self.counters.pending("stats", self.user.id, "used_commands")
         
     
     def update_custom_stats(self) -> None:
-        cur = self.db.stats.get(self.user.id, "used_customs")
-        if cur == None:
-            self.db.stats.insert(Stats(self.user.id, 0, 1))
-        else:
-            self.db.stats.update(self.user.id, "used_customs", cur + 1)
+        self.counters.inc("stats", self.user.id, "used_customs", upsert=True)
 
 
     def get_custom_stats(self) -> int:
         cur = self.db.stats.get(self.user.id, "used_customs")
-        if cur == None:
-            self.db.stats.insert(Stats(self.user.id, 0, 1))
-            return 0
-        else:
-            return cur
+        return (cur or 0) + self.counters.pending("stats", self.user.id, "used_customs")
+
+
+    async def close(self) -> None:
+        await super().close()
+        await self.counters.flush()
+        await self.xp_ledger.flush()
+        await asyncio.to_thread(self.db.io.shutdown) # let queued writes finish
 
 
     def run(self) -> None:
@@ -1,76 +1,281 @@
 # type: ignore
 
 import logging; log = logging.getLogger(__name__)
-from typing import Union, List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Union, List, Dict, Set, Tuple, Any, Optional
+import time
 import os
 
 
 
+BATCH_SIZE = 1000 # documents per cursor batch
+LOAD_WORKERS = 4 # collections loaded at the same time
+PROGRESS_EVERY = 100000 # documents
+MAX_MISSING = 10000 # ids of documents that don't exist remembered per collection
+MISSING_TTL = 60 # seconds, after that a document that didn't exist is read from the db again
+
+
 class InternalCacheStore:
-    def __init__(self, _type: str, bot) -> None:
+    """
+    Cached documents of a collection, least recently used first. With ``cache_max_entries`` set for the collection
+    it holds at most that many documents, with ``cache_ttl`` documents that weren't used for that many seconds
+    are dropped. Pinned documents are kept apart in ``pinned_data``, they are never evicted and don't count towards
+    the limit. Misses are read from the database, so documents written by other processes show up as well, and
+    documents that don't exist are remembered for ``MISSING_TTL`` seconds.
+    """
+    def __init__(self, _type: str, bot, load: bool = True) -> None:
         self.bot = bot
         self._type = _type
-        self.data = {}
-        for i in (getattr(self.bot.db, self._type)).find({}):
-            if not str(i["id"]) in self.data:
-                self.data[str(i["id"])] = i
+        self.data: OrderedDict[str, dict] = OrderedDict()
+        self.max_entries = int((bot.config.cache_max_entries or {}).get(_type, 0)) # 0 means unlimited
+        self.ttl = float((bot.config.cache_ttl or {}).get(_type, 0))
+        # fields left out while loading (cache_projections), read from the db once a document is used as a whole
+        self.excluded: List[str] = list((bot.config.cache_projections or {}).get(_type, []))
+        self.partial: Set[str] = set()
+        self.pinned: Set[str] = set()
+        self.pinned_data: Dict[str, dict] = {}
+        self.missing: OrderedDict[str, float] = OrderedDict() # ids known to not exist -> when that was checked
+        self._seen: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if load: self.load()
+
+
+    def load(self) -> None:
+        col = getattr(self.bot.db, self._type)
+        start = time.perf_counter()
+        total = col.estimated_document_count()
+
+        projection = {"_id": 0, **{k: 0 for k in self.excluded}}
+        batch_size = int(self.bot.config.cache_batch_size or BATCH_SIZE)
+        cursor = col.find({}, projection, batch_size=batch_size)
+        if self.max_entries > 0: 
+            cursor = cursor.sort("$natural", -1).limit(self.max_entries) # newest documents first
+
+        now = time.monotonic()
+        for i, doc in enumerate(cursor, 1):
+            _id = str(doc["id"])
+            if not _id in self.data:
+                self.data[_id] = doc
+                if self.max_entries > 0: self.data.move_to_end(_id, last=False) # oldest ones get evicted first
+                self._seen[_id] = now
+                if len(self.excluded) > 0: self.partial.add(_id)
+            if i % PROGRESS_EVERY == 0:
+                log.info(f"[Database] Caching {self._type}: {i}/~{total} documents", extra={"loc": f"PID {os.getpid()}"})
+
         log.info(
-            "[Database] Cached {}/{} documents from {}".format(
+            "[Database] Cached {}/~{} documents from {} in {:.2f}s".format(
                 len(self.data),
-                len(list((getattr(self.bot.db, self._type)).find({}))),
-                self._type
+                total,
+                self._type,
+                time.perf_counter() - start
             ), 
             extra={"loc": f"PID {os.getpid()}"}
         )
 
 
+    def _complete(self, _id: str) -> None:
+        if not _id in self.partial: return
+        self.partial.discard(_id)
+
+        doc = (getattr(self.bot.db, self._type)).find_one({"id": _id}, {"_id": 0, **{k: 1 for k in self.excluded}})
+        self.merge(_id, doc)
+
+
+    def merge(self, _id: str, doc: Optional[dict]) -> None:
+        """Adds the projected out fields read by ``_complete()`` (or its async version) to the cached document"""
+        cached = self.peek(_id)
+        if doc != None and cached != None:
+            for k in self.excluded:
+                if k in doc and not k in cached: cached[k] = doc[k]
+
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while len(self.data) > 0:
+            _id = next(iter(self.data))
+            over = self.max_entries > 0 and len(self.data) > self.max_entries
+            idle = self.ttl > 0 and now - self._seen.get(_id, now) > self.ttl
+            if not over and not idle: break
+
+            del self.data[_id]
+            self._seen.pop(_id, None)
+            self.partial.discard(_id)
+            self.evictions += 1
+
+
+    def _touch(self, _id: str) -> None:
+        self.data.move_to_end(_id)
+        self._seen[_id] = time.monotonic()
+        self._evict()
+
+
+    def peek(self, _id: Union[str, int]) -> Optional[dict]:
+        """The cached document, without reading it from the database or counting as a use"""
+        _id = str(_id)
+        doc = self.pinned_data.get(_id, None)
+        return doc if doc != None else self.data.get(_id, None)
+
+
+    def items(self) -> List[Tuple[str, dict]]:
+        return [*self.pinned_data.items(), *self.data.items()]
+
+
+    def lookup(self, _id: Union[str, int]) -> Tuple[bool, Optional[dict]]:
+        """``(True, doc)`` if the cache knows the document (``doc`` is ``None`` if it doesn't exist), ``(False, None)`` otherwise"""
+        _id = str(_id)
+        doc = self.pinned_data.get(_id, None)
+        if doc != None:
+            self.hits += 1
+            return True, doc
+        doc = self.data.get(_id, None)
+        if doc != None:
+            self.hits += 1
+            self._touch(_id)
+            return True, doc
+        checked = self.missing.get(_id, None)
+        if checked != None:
+            if time.monotonic() - checked < MISSING_TTL:
+                self.hits += 1
+                return True, None
+            del self.missing[_id]
+        return False, None
+
+
+    def fill(self, _id: Union[str, int], doc: Optional[dict]) -> None:
+        """Stores the result of a database read after ``lookup()`` missed"""
+        _id = str(_id)
+        self.misses += 1
+        if doc == None:
+            self._missing(_id)
+        else:
+            doc.pop("_id", None)
+            self.insert(_id, doc)
+
+
+    def _fetch(self, _id: Union[str, int]) -> Optional[dict]:
+        known, doc = self.lookup(_id)
+        if known: return doc
+
+        doc = (getattr(self.bot.db, self._type)).get_doc_from_db(_id)
+        self.fill(_id, doc)
+        return doc
+
+
     def get(self, _id: Union[str, int], key: str) -> Optional[Union[str, int, Dict[Union[str, int], Any], List[Any]]]:
-        try:
-            r = self.data[str(_id)].get(key, None)
-        except KeyError:
-            r = (getattr(self.bot.db, self._type)).get_from_db(_id, key)
-            if r is not None:
-                self.data[_id].update({
-                    key: r
-                }) 
-        finally:
-            return r
+        doc = self._fetch(_id)
+        if doc == None: return None
+        if key in self.excluded: self._complete(str(_id))
+        return doc.get(key, None)
 
 
     def exists(self, _id: Union[str, int]) -> bool:
-        return str(_id) in self.data
+        return self._fetch(_id) != None
 
 
     def update(self, _id: Union[str, int], key: str, value: Union[str, int, Dict[Union[str, int], Any], List[Any]]) -> None:
-        if str(_id) in self.data:
-            self.data[str(_id)].update({
+        _id = str(_id)
+        if _id in self.pinned_data:
+            self.pinned_data[_id].update({
                 key: value
             })
+        elif _id in self.data:
+            self.data[_id].update({
+                key: value
+            })
+            self._touch(_id)
 
 
     def insert(self, _id: Union[str, int], schema: Dict[str, Any]) -> None:
-        if not str(_id) in self.data:
-            self.data[str(_id)] = schema
+        _id = str(_id)
+        self.missing.pop(_id, None)
+        if _id in self.pinned:
+            self.pinned_data.setdefault(_id, schema)
+        elif not _id in self.data:
+            self.data[_id] = schema
+            self._touch(_id)
 
 
     def get_all(self, _id: Union[str, int]) -> Optional[dict]:
-        if str(_id) in self.data:
-            return self.data[str(_id)]
-        return None
+        doc = self._fetch(_id)
+        if doc != None: self._complete(str(_id))
+        return doc
 
 
     def delete(self, _id: Union[str, int]) -> None:
-        if str(_id) in self.data:
-            del self.data[str(_id)]
+        _id = str(_id)
+        self.data.pop(_id, None)
+        self.pinned_data.pop(_id, None)
+        self._seen.pop(_id, None)
+        self.partial.discard(_id)
+        self._missing(_id)
+
+
+    def forget(self, _id: Union[str, int]) -> None:
+        """Drops whatever is cached about the document, so the next use reads it from the database"""
+        _id = str(_id)
+        self.data.pop(_id, None)
+        self.pinned_data.pop(_id, None)
+        self.missing.pop(_id, None)
+        self._seen.pop(_id, None)
+        self.partial.discard(_id)
+
+
+    def _missing(self, _id: str) -> None:
+        self.missing[_id] = time.monotonic()
+        self.missing.move_to_end(_id)
+        if len(self.missing) > MAX_MISSING: self.missing.popitem(last=False)
+
+
+    def pin(self, _id: Union[str, int]) -> None:
+        """Keeps the document cached no matter the limits, e.g. configs of guilds the bot is in"""
+        _id = str(_id)
+        self.pinned.add(_id)
+        doc = self.data.pop(_id, None)
+        if doc != None:
+            self.pinned_data[_id] = doc
+            self._seen.pop(_id, None)
+
+
+    def unpin(self, _id: Union[str, int]) -> None:
+        _id = str(_id)
+        self.pinned.discard(_id)
+        doc = self.pinned_data.pop(_id, None)
+        if doc != None:
+            self.data[_id] = doc
+            self._touch(_id)
+
+
+    def __len__(self) -> int:
+        return len(self.data) + len(self.pinned_data)
 
 
 class InternalCache:
     def __init__(self, bot) -> None:
         self.bot = bot
-        for i in bot.config.cache_options:
-            setattr(self, i, InternalCacheStore(i, bot))
+        self.new()
 
 
     def new(self) -> None:
-        for i in self.bot.config.cache_options:
-            setattr(self, i, InternalCacheStore(i, self.bot))
\ No newline at end of file
+        """(Re)loads all cached collections, a few at the same time"""
+        start = time.perf_counter()
+        stores = [InternalCacheStore(i, self.bot, load=False) for i in self.bot.config.cache_options]
+        with ThreadPoolExecutor(max_workers=LOAD_WORKERS, thread_name_prefix="cache-load") as pool:
+            for _ in pool.map(lambda x: x.load(), stores): pass # re-raises errors
+
+        for store in stores:
+            old = getattr(self, store._type, None)
+            if old != None:
+                for _id in old.pinned: store.pin(_id)
+            setattr(self, store._type, store)
+        log.info(f"[Database] Loaded {len(stores)} cached collection(s) in {time.perf_counter() - start:.2f}s", extra={"loc": f"PID {os.getpid()}"})
+
+
+    def pin(self, collection: str, _id: Union[str, int]) -> None:
+        if collection in self.bot.config.cache_options: getattr(self, collection).pin(_id)
+
+
+    def unpin(self, collection: str, _id: Union[str, int]) -> None:
+        if collection in self.bot.config.cache_options: getattr(self, collection).unpin(_id)
@@ -260,7 +260,7 @@ class CommandEditModal(TextModalBase):
 
 
 class AutomodRuleModal(TextModalBase):
-    def __init__(self, bot, title: str, _type: str, amount: str, response: Optional[str], reason: Optional[str], callback: Callable) -> None:
+    def __init__(self, bot, title: str, _type: str, amount: str, response: Optional[str], reason: Optional[str], callback: Callable, density: Optional[float] = None, budget: Optional[str] = None) -> None:
         super().__init__(bot, title, callback)
         self._vars_text = "{user}  ━ The mention of the user, e.g. @paul \n{username}  ━ The name of the user, e.g. paul \n{avatar}  ━ The avatar URL of the user\n{channel}  ━ The channel name \n{server}  ━ The server name"
 
@@ -273,6 +273,26 @@ class AutomodRuleModal(TextModalBase):
             required=True,
             max_length=2 if title.split(" ")[1].lower() != "length" else 4
         ))
+        if density != None:
+            self.add_item(discord.ui.TextInput(
+                custom_id="density",
+                label="Density",
+                style=discord.TextStyle.short,
+                default=str(density),
+                placeholder="Combining marks per character that count as zalgo (e.g. 0.8)",
+                required=False,
+                max_length=4
+            ))
+        if budget != None:
+            self.add_item(discord.ui.TextInput(
+                custom_id="budget",
+                label="Budget",
+                style=discord.TextStyle.short,
+                default=budget if budget != "" else None,
+                placeholder="Max per user in 60 seconds (leave blank for " + ("no limit)" if _type == "warns" else "3x the threshold)"),
+                required=False,
+                max_length=3
+            ))
         self.add_item(discord.ui.TextInput(
             custom_id="response",
             label="Custom Response",
@@ -1,12 +1,38 @@
 # type: ignore
 
-from typing import Union, Dict, List, Any, Optional
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Union, Dict, List, Tuple, Any, Optional
 from toolbox import Database, Collection
+from .__obj__ import ConfigView
 import os
 import logging; log = logging.getLogger(__name__)
 
 
 
+IO_SHARDS = 4
+
+
+class IOExecutor:
+    """
+    Runs blocking pymongo calls off the event loop. Every shard is a single thread and all calls for a document
+    id go to the same shard, so writes to a document are applied in the order they were made.
+    """
+    def __init__(self, shards: int = IO_SHARDS) -> None:
+        self.shards = [ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"mongo-io-{i}") for i in range(shards)]
+
+
+    def run(self, _id: Union[str, int], func: Callable, *args, **kwargs) -> asyncio.Future:
+        shard = self.shards[hash(str(_id)) % len(self.shards)]
+        return asyncio.get_running_loop().run_in_executor(shard, functools.partial(func, *args, **kwargs))
+
+
+    def shutdown(self) -> None:
+        """Waits for all queued calls to finish"""
+        for shard in self.shards: shard.shutdown(wait=True)
+
+
 class MongoCollection(Collection):
     def __init__(self, bot, database: Database, name: str) -> None:
         super().__init__(
@@ -16,6 +42,31 @@ class MongoCollection(Collection):
         self.bot = bot
         self.collection_name = name
         self.cached = name in bot.config.cache_options
+        self._versions: Dict[str, int] = {}
+        self._key_versions: Dict[Tuple[str, str], int] = {}
+        self._resets: Dict[str, int] = {} # version of the last write that replaced the whole document
+        self._views: Dict[str, tuple] = {}
+
+
+    def _bump(self, _id: Union[str, int], keys: Optional[List[str]] = None) -> None:
+        """``keys`` are the fields that were written, ``None`` if it could've been the whole document"""
+        version = self._versions.get(str(_id), 0) + 1
+        self._versions[str(_id)] = version
+        if keys == None:
+            self._resets[str(_id)] = version
+        else:
+            for k in keys: self._key_versions[(str(_id), k)] = version
+        self._views.pop(str(_id), None)
+
+
+    def version(self, _id: Union[str, int]) -> int:
+        """Incremented every time the document is written through this collection"""
+        return self._versions.get(str(_id), 0)
+
+
+    def key_version(self, _id: Union[str, int], key: str) -> int:
+        """Like ``version()``, but only changes when ``key`` (or the whole document) was written"""
+        return max(self._key_versions.get((str(_id), key), 0), self._resets.get(str(_id), 0))
 
 
     def get(self, _id: Union[str, int], key: str) -> Optional[Union[str, int, Dict[Union[str, int], Any], List[Any]]]:
@@ -32,18 +83,47 @@ class MongoCollection(Collection):
             return super().get_doc(_id)
 
 
+    def get_view(self, _id: Union[str, int]) -> Optional[ConfigView]:
+        """Read-only view of the document, only rebuilt after the document was written to"""
+        doc = self.get_doc(_id)
+        if doc == None: return None
+        if not self.cached: return ConfigView(doc)
+
+        version = self.version(_id)
+        entry = self._views.get(str(_id), None)
+        if entry == None or entry[0] != version or entry[1] is not doc:
+            # top-level copy, so keys updated later don't leak into this snapshot
+            entry = (version, doc, ConfigView(dict(doc)))
+            self._views[str(_id)] = entry
+        return entry[2]
+
+
     def get_from_db(self, _id: Union[str, int], key: str) -> Optional[Union[str, int, Dict[Union[str, int], Any], List[Any]]]:
         return super().get(_id, key)
 
 
+    def get_doc_from_db(self, _id: Union[str, int]) -> Optional[dict]:
+        # unlike get_doc() this raises on errors, so they don't get cached as missing documents
+        return super().find_one({"id": f"{_id}"})
+
+
+    def exists(self, _id: Union[str, int]) -> bool:
+        if self.cached:
+            return (getattr(self.bot.cache, self.collection_name)).exists(_id)
+        else:
+            return super().exists(_id)
+
+
     def insert(self, schema: Dict[str, Any]) -> None:
         super().insert_one(schema)
         if self.cached: (getattr(self.bot.cache, self.collection_name)).insert(schema["id"], schema)
+        self._bump(schema["id"])
 
 
     def update(self, _id: Union[str, int], key: str, value: Union[str, int, Dict[Union[str, int], Any], List[Any]]) -> None:
         super().update(_id, key, value)
         if self.cached: (getattr(self.bot.cache, self.collection_name)).update(_id, key, value)
+        self._bump(_id, [key])
 
 
     def multi_update(self, _id: Union[str, int], updates: Dict[str, Any]) -> None:
@@ -54,15 +134,103 @@ class MongoCollection(Collection):
     def delete(self, _id: Union[str, int]) -> None:
         super().delete(_id)
         if self.cached: (getattr(self.bot.cache, self.collection_name)).delete(_id)
+        self._bump(_id)
+
+
+    async def _read_through(self, _id: Union[str, int]) -> Optional[dict]:
+        cache = getattr(self.bot.cache, self.collection_name)
+        known, doc = cache.lookup(_id)
+        if known: return doc
+
+        doc = await self.database.io.run(_id, self.get_doc_from_db, _id)
+        cache.fill(_id, doc)
+        return doc
+
+
+    async def _complete_async(self, _id: Union[str, int]) -> None:
+        cache = getattr(self.bot.cache, self.collection_name)
+        if not str(_id) in cache.partial: return
+
+        doc = await self.database.io.run(_id, super().find_one, {"id": f"{_id}"}, {"_id": 0, **{k: 1 for k in cache.excluded}})
+        cache.partial.discard(str(_id))
+        cache.merge(str(_id), doc)
+
+
+    async def get_async(self, _id: Union[str, int], key: str) -> Optional[Union[str, int, Dict[Union[str, int], Any], List[Any]]]:
+        if self.cached:
+            doc = await self._read_through(_id)
+            if doc == None: return None
+            if key in (getattr(self.bot.cache, self.collection_name)).excluded: await self._complete_async(_id)
+            return doc.get(key, None)
+        return await self.database.io.run(_id, super().get, _id, key)
+
+
+    async def get_doc_async(self, _id: Union[str, int]) -> Optional[dict]:
+        if self.cached:
+            doc = await self._read_through(_id)
+            if doc != None: await self._complete_async(_id)
+            return doc
+        return await self.database.io.run(_id, super().get_doc, _id)
+
+
+    async def exists_async(self, _id: Union[str, int]) -> bool:
+        if self.cached: return (await self._read_through(_id)) != None
+        return await self.database.io.run(_id, super().exists, _id)
+
+
+    async def _write(self, _id: Union[str, int], func: Callable, *args, **kwargs) -> None:
+        # the cache was changed before the write, if it fails the document is read from the db again
+        try:
+            await self.database.io.run(_id, func, *args, **kwargs)
+        except Exception:
+            if self.cached: (getattr(self.bot.cache, self.collection_name)).forget(_id)
+            self._bump(_id)
+            raise
+
+
+    async def insert_async(self, schema: Dict[str, Any]) -> None:
+        """Like ``insert()``, but only the cache is updated right away, the write happens in the background"""
+        if self.cached: (getattr(self.bot.cache, self.collection_name)).insert(schema["id"], schema)
+        self._bump(schema["id"])
+        await self._write(schema["id"], super().insert_one, schema)
+
+
+    async def update_async(self, _id: Union[str, int], key: str, value: Union[str, int, Dict[Union[str, int], Any], List[Any]]) -> None:
+        if self.cached: (getattr(self.bot.cache, self.collection_name)).update(_id, key, value)
+        self._bump(_id, [key])
+        await self._write(_id, super().update, _id, key, value)
+
+
+    async def multi_update_async(self, _id: Union[str, int], updates: Dict[str, Any]) -> None:
+        """Sets all keys with one write (``multi_update()`` does one per key)"""
+        if self.cached:
+            for k, v in updates.items(): (getattr(self.bot.cache, self.collection_name)).update(_id, k, v)
+        self._bump(_id, list(updates))
+        await self._write(_id, super().update_one, {"id": f"{_id}"}, {"$set": updates})
+
+
+    async def inc_async(self, _id: Union[str, int], key: str, amount: int = 1) -> None:
+        """Adds ``amount`` to a number with ``$inc``, so concurrent increments don't overwrite each other"""
+        if self.cached:
+            doc = (getattr(self.bot.cache, self.collection_name)).peek(_id)
+            if doc != None: doc[key] = (doc.get(key, None) or 0) + amount
+        self._bump(_id, [key])
+        await self._write(_id, super().update_one, {"id": f"{_id}"}, {"$inc": {key: amount}})
+
+
+    async def delete_async(self, _id: Union[str, int]) -> None:
+        if self.cached: (getattr(self.bot.cache, self.collection_name)).delete(_id)
+        self._bump(_id)
+        await self._write(_id, super().delete, _id)
 
 
     def multi_delete(self,  _filter: Dict[Any, Any]) -> None:
         super().delete_many(_filter)
         if self.cached:
-            data = (getattr(self.bot.cache, self.collection_name)).data
-            for k in (getattr(self.bot.cache, self.collection_name)).data.copy():
-                if data[k][list(_filter.keys())[0]] == list(_filter.values())[0]:
+            for k, doc in (getattr(self.bot.cache, self.collection_name)).items():
+                if doc[list(_filter.keys())[0]] == list(_filter.values())[0]:
                     (getattr(self.bot.cache, self.collection_name)).delete(k)
+                    self._bump(k)
 
 
 class MongoDB(Database):
@@ -71,6 +239,7 @@ class MongoDB(Database):
             name=bot.config.db_name, 
             host=bot.config.mongo_url
         )
+        self.io = IOExecutor()
         # Only doing this to have type hints
         self.configs = MongoCollection(bot, self, "configs")
         self.tags = MongoCollection(bot, self, "tags")
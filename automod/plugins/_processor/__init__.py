@@ -1,3 +1,4 @@
 from .actions import ActionProcessor
 from .log import LogProcessor
 from .dm import DMProcessor
+from .queue import ActionQueue
\ No newline at end of file
@@ -28,7 +28,7 @@ class ActionProcessor:
         self.dm_processor = DMProcessor(bot)
 
 
-    def new_case(
+    async def new_case(
         self, 
         _type: str, 
         msg: Union[discord.Message, discord.Interaction], 
@@ -40,13 +40,6 @@ class ActionProcessor:
     ) -> int:
         case = self.bot.db.configs.get(msg.guild.id, "cases") + 1
 
-        if self.bot.db.cases.exists(f"{msg.guild.id}-{case}"):
-            self.bot.db.cases.delete(f"{msg.guild.id}-{case}") # we need to overwrite old cases
-        
-        now = datetime.datetime.utcnow()
-        self.bot.db.cases.insert(Case(case, _type, msg, mod, user, reason, now, warns_added, until))
-        self.bot.db.configs.update(msg.guild.id, "cases", case)
-
         case_ids = self.bot.db.configs.get(msg.guild.id, "case_ids")
         case_ids.update(
             {
@@ -57,7 +50,17 @@ class ActionProcessor:
                 }
             }
         )
-        self.bot.db.configs.update(msg.guild.id, "case_ids", case_ids)
+        # the cache is updated before the first await, so concurrent cases get their own number
+        await self.bot.db.configs.multi_update_async(msg.guild.id, {
+            "cases": case,
+            "case_ids": case_ids
+        })
+
+        if await self.bot.db.cases.exists_async(f"{msg.guild.id}-{case}"):
+            await self.bot.db.cases.delete_async(f"{msg.guild.id}-{case}") # we need to overwrite old cases
+        
+        now = datetime.datetime.utcnow()
+        await self.bot.db.cases.insert_async(Case(case, _type, msg, mod, user, reason, now, warns_added, until))
         return case
 
 
@@ -154,7 +157,7 @@ class ActionProcessor:
 
             log_kwargs.update(
                 {
-                    "case": self.new_case("warn", msg, mod, user, reason, warns_added=warns),
+                    "case": await self.new_case("warn", msg, mod, user, reason, warns_added=warns),
                     "old_warns": old_warns,
                     "new_warns": new_warns
                 }
@@ -196,7 +199,7 @@ class ActionProcessor:
 
             log_kwargs.update(
                 {
-                    "case": self.new_case("ban", msg, mod, user, reason)
+                    "case": await self.new_case("ban", msg, mod, user, reason)
                 }
             )
             await self.log_processor.execute(msg.guild, "ban", **log_kwargs)
@@ -238,7 +241,7 @@ class ActionProcessor:
 
             log_kwargs.update(
                 {
-                    "case": self.new_case("kick", msg, mod, user, reason)
+                    "case": await self.new_case("kick", msg, mod, user, reason)
                 }
             )
             await self.log_processor.execute(msg.guild, "kick", **log_kwargs)
@@ -290,7 +293,7 @@ class ActionProcessor:
             log_kwargs.pop("length")
             log_kwargs.update(
                 {
-                    "case": self.new_case("mute", msg, mod, user, reason, until=until),
+                    "case": await self.new_case("mute", msg, mod, user, reason, until=until),
                     "until": f"<t:{round(until.timestamp())}>"
                 }
             )
@@ -345,7 +348,7 @@ class ActionProcessor:
             log_kwargs.pop("length")
             log_kwargs.update(
                 {
-                    "case": self.new_case("tempban", msg, mod, user, reason, until=until),
+                    "case": await self.new_case("tempban", msg, mod, user, reason, until=until),
                     "until": f"<t:{round(until.timestamp())}>"
                 }
             )
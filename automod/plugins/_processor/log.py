@@ -152,6 +152,12 @@ LOG_TYPES = {
     "bot_added": {
         "channel": "join_log",
     },
+    "raid": {
+        "channel": "join_log",
+    },
+    "flood": {
+        "channel": "mod_log",
+    },
 
     "role_created": {
         "channel": "server_log",
@@ -232,6 +238,9 @@ LOG_TYPES = {
         "emote": "NO_ENTRY",
         "action": "Word filter triggered"
     },
+    "regex_disabled": {
+        "channel": "automod_log",
+    },
 
     "report": {
         "channel": "report_log"
@@ -0,0 +1,141 @@
+# type: ignore
+
+import asyncio
+import heapq
+import itertools
+from typing import Callable, Optional, Dict, List, Tuple, Any, Hashable
+import os
+import logging; log = logging.getLogger(__name__)
+
+from ...bot import ShardedBotInstance
+
+
+
+PRIORITIES = {
+    "punish": 0, # warns & escalations (bans, kicks, mutes)
+    "log": 1, # cases & log messages for rules without warns
+    "response": 2, # custom rule responses
+    "dm": 3
+}
+MAX_QUEUED = 250 # per guild
+WORKERS = 8
+
+
+class _Job:
+    __slots__ = ("priority", "seq", "key", "func", "args", "merge", "done")
+
+    def __init__(self, priority: int, seq: int, key: Hashable, func: Callable, args: Tuple[Any, ...], merge: Optional[Callable]) -> None:
+        self.priority = priority
+        self.seq = seq
+        self.key = key
+        self.func = func
+        self.args = args
+        self.merge = merge
+        self.done = False
+
+
+    def __lt__(self, other: "_Job") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class _GuildQueue:
+    __slots__ = ("heap", "jobs", "scheduled", "dropped")
+
+    def __init__(self) -> None:
+        self.heap: List[_Job] = []
+        self.jobs: Dict[Hashable, _Job] = {}
+        self.scheduled = False
+        self.dropped = 0
+
+
+    def pop(self) -> Optional[_Job]:
+        while self.heap:
+            job = heapq.heappop(self.heap)
+            if job.done == True: continue # evicted
+            job.done = True
+            del self.jobs[job.key]
+            return job
+        return None
+
+
+class ActionQueue:
+    """
+    Bounded per-guild queue for the work automod does after flagging a message (punishments, cases, logs,
+    responses, DMs), so the message listener doesn't have to wait for it. Jobs run by priority, one at a time
+    per guild and fair between guilds. A job with the same key as a pending one is merged into it (or dropped).
+    Once a guild has ``MAX_QUEUED`` jobs pending, less important ones are evicted for new ones or new ones are
+    dropped, a summary is logged after the queue drained.
+    """
+    def __init__(self, bot: ShardedBotInstance, workers: int = WORKERS, max_queued: int = MAX_QUEUED) -> None:
+        self.bot = bot
+        self.max_queued = max_queued
+        self.__guilds: Dict[int, _GuildQueue] = {}
+        self.ready: asyncio.Queue = asyncio.Queue() # guild ids with pending jobs
+        self._seq = itertools.count()
+        self.processed = 0
+        self.merged = 0
+        self.dropped = 0
+        self.workers = [self.bot.loop.create_task(self._work()) for _ in range(workers)]
+
+
+    def put(self, guild_id: int, kind: str, key: Hashable, func: Callable, args: Tuple[Any, ...], merge: Optional[Callable] = None) -> bool:
+        """
+        Queues ``await func(*args)``. If a job with ``key`` is already pending, ``merge(pending_args, args)``
+        replaces its arguments (no merge function means the new job is a duplicate and dropped).
+        Returns whether the job was queued or merged.
+        """
+        q = self.__guilds.get(guild_id, None)
+        if q == None:
+            q = _GuildQueue()
+            self.__guilds[guild_id] = q
+
+        pending = q.jobs.get(key, None)
+        if pending != None:
+            if pending.merge != None: pending.args = pending.merge(pending.args, args)
+            self.merged += 1
+            return True
+
+        priority = PRIORITIES[kind]
+        if len(q.jobs) >= self.max_queued:
+            worst = max(q.jobs.values(), key=lambda x: (x.priority, x.seq))
+            q.dropped += 1
+            self.dropped += 1
+            if worst.priority <= priority: return False
+
+            worst.done = True
+            del q.jobs[worst.key]
+
+        job = _Job(priority, next(self._seq), key, func, args, merge)
+        q.jobs[key] = job
+        heapq.heappush(q.heap, job)
+
+        if q.scheduled == False:
+            q.scheduled = True
+            self.ready.put_nowait(guild_id)
+        return True
+
+
+    async def _work(self) -> None:
+        while True:
+            guild_id = await self.ready.get()
+            q = self.__guilds.get(guild_id, None)
+            if q == None: continue
+
+            job = q.pop()
+            if job != None:
+                try:
+                    await job.func(*job.args)
+                except Exception as ex:
+                    log.warn(f"[ActionQueue] {getattr(job.func, '__name__', job.func)} failed - {ex} (guild: {guild_id})", extra={"loc": f"PID {os.getpid()}"})
+                self.processed += 1
+
+            if len(q.jobs) > 0:
+                self.ready.put_nowait(guild_id) # back of the line, other guilds go first
+            else:
+                del self.__guilds[guild_id]
+                if q.dropped > 0:
+                    log.warn(f"[ActionQueue] Queue was full, dropped {q.dropped} action(s) (guild: {guild_id})", extra={"loc": f"PID {os.getpid()}"})
+
+
+    def __len__(self) -> int:
+        return sum(len(x.jobs) for x in self.__guilds.values())
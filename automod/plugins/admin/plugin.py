@@ -129,6 +129,42 @@ class AdminPlugin(AutoModPluginBlueprint):
                 "\n".join(shards)
             )
         )
+        e.add_field(
+            name="❯ __Caches__",
+            value="**• Invites:** {} cached, {} hits, {} misses\n**• Deletions:** {} queued, {} deleted in {} requests\n**• Permissions:** {} cached, {} hits, {} misses\n**• Counters:** {} pending, {} written in {} bulk writes\n**• XP:** {} cached, {} written in {} bulk writes"\
+            .format(
+                len(self.bot.invites),
+                self.bot.invites.hits,
+                self.bot.invites.misses,
+                len(self.bot.deletions),
+                self.bot.deletions.deleted,
+                self.bot.deletions.requests,
+                len(self.bot.permissions),
+                self.bot.permissions.hits,
+                self.bot.permissions.misses,
+                len(self.bot.counters),
+                self.bot.counters.written,
+                self.bot.counters.flushes,
+                len(self.bot.xp_ledger),
+                self.bot.xp_ledger.written,
+                self.bot.xp_ledger.flushes
+            )
+        )
+        stores = [getattr(self.bot.cache, x) for x in self.bot.config.cache_options]
+        e.add_field(
+            name="❯ __Document Cache__",
+            value="\n".join([
+                "**• {}:** {}/{} cached ({} pinned), {} hits, {} misses, {} evictions".format(
+                    x._type,
+                    len(x.data),
+                    x.max_entries if x.max_entries > 0 else "∞",
+                    len(x.pinned_data),
+                    x.hits,
+                    x.misses,
+                    x.evictions
+                ) for x in stores
+            ]) or "None"
+        )
 
         await ctx.send(embed=e)
 
@@ -188,6 +224,22 @@ class AdminPlugin(AutoModPluginBlueprint):
             "\n".join(msg[0:max(min(20, len(msg)), 1)])
         ))
 
+        rules = sorted(self.bot.metrics.rules.items(), key=lambda i: i[1].total, reverse=True)
+        if len(rules) > 0:
+            msg = [
+                f" {'RULE':<15}| {'SAMPLES':<10}| {'AVG US':<9}| {'P99 US':<9}| HITS",
+                f"{'-' * 16}|{'-' * 11}|{'-' * 10}|{'-' * 10}|{'-' * 8}"
+            ]
+            for k, v in rules:
+                msg.append(
+                    f" {k:<15}| {v.samples:<10}| {round(v.avg() / 1000, 1):<9}| {round(v.quantile(0.99) / 1000, 1):<9}| {v.hits}"
+                )
+            for guild_id, ns in self.bot.metrics.slowest_guilds():
+                msg.append(f" {guild_id} → {round(ns / 1000, 1)} us/msg")
+            await ctx.send("```js\n{}\n```".format(
+                "\n".join(msg)
+            ))
+
     
     @commands.group()
     @commands.is_owner()
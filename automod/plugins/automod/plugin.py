@@ -4,6 +4,8 @@ import discord
 from discord.ext import commands
 
 import re
+import asyncio
+import functools
 from ...__obj__ import TypeHintedToolboxObject as Object
 from urllib.parse import urlparse
 from typing import TypeVar, Literal, Optional, List
@@ -11,34 +13,14 @@ import logging; log = logging.getLogger()
 from typing import Union, Tuple, Dict
 
 from .. import AutoModPluginBlueprint, ShardedBotInstance
-from .._processor import ActionProcessor, LogProcessor, DMProcessor
+from .._processor import ActionProcessor, LogProcessor, DMProcessor, ActionQueue
 from ...types import Embed, E
 from ...views import RoleChannelSelect
 from ...modals import AutomodRuleModal
+from ...utils import parse_filter, parse_regex, sanitize, SpamTracker, FloodDetector, FLOOD_SCOPES, UsageBudgets, BUDGET_WINDOW, CopypastaDetector, COPYPASTA_WINDOW, get_raid_config, RuleTimer, ZALGO_DENSITY, ZALGO_MAX_STACK
 
 
 
-INVITE_RE = re.compile(
-    r"(?:https?://)?(?:www\.)?(?:discord(?:\.| |\[?\(?\"?'?dot'?\"?\)?\]?)?(?:gg|io|me|li)|discord(?:app)?\.com/invite)/+((?:(?!https?)[\w\d-])+)"
-)
-
-
-LINK_RE = re.compile(
-    r"((?:https?://)[a-z0-9]+(?:[-._][a-z0-9]+)*\.[a-z]{2,5}(?::[0-9]{1,5})?(?:/[^ \n<>]*)?)", 
-    re.IGNORECASE
-)
-
-
-MENTION_RE = re.compile(
-    r"<@[!&]?\\d+>"
-)
-
-
-EMOTE_RE = re.compile(
-    r"<(a?):([^: \n]+):([0-9]{15,20})>"
-)
-
-
 ALLOWED_FILE_FORMATS = [
     # plain text/markdown
     "txt",
@@ -64,127 +46,6 @@ ALLOWED_FILE_FORMATS = [
 ]
 
 
-ZALGO = [
-    u'\u030d',
-    u'\u030e',
-    u'\u0304',
-    u'\u0305',
-    u'\u033f',
-    u'\u0311',
-    u'\u0306',
-    u'\u0310',
-    u'\u0352',
-    u'\u0357',
-    u'\u0351',
-    u'\u0307',
-    u'\u0308',
-    u'\u030a',
-    u'\u0342',
-    u'\u0343',
-    u'\u0344',
-    u'\u034a',
-    u'\u034b',
-    u'\u034c',
-    u'\u0303',
-    u'\u0302',
-    u'\u030c',
-    u'\u0350',
-    u'\u0300',
-    u'\u030b',
-    u'\u030f',
-    u'\u0312',
-    u'\u0313',
-    u'\u0314',
-    u'\u033d',
-    u'\u0309',
-    u'\u0363',
-    u'\u0364',
-    u'\u0365',
-    u'\u0366',
-    u'\u0367',
-    u'\u0368',
-    u'\u0369',
-    u'\u036a',
-    u'\u036b',
-    u'\u036c',
-    u'\u036d',
-    u'\u036e',
-    u'\u036f',
-    u'\u033e',
-    u'\u035b',
-    u'\u0346',
-    u'\u031a',
-    u'\u0315',
-    u'\u031b',
-    u'\u0340',
-    u'\u0341',
-    u'\u0358',
-    u'\u0321',
-    u'\u0322',
-    u'\u0327',
-    u'\u0328',
-    u'\u0334',
-    u'\u0335',
-    u'\u0336',
-    u'\u034f',
-    u'\u035c',
-    u'\u035d',
-    u'\u035e',
-    u'\u035f',
-    u'\u0360',
-    u'\u0362',
-    u'\u0338',
-    u'\u0337',
-    u'\u0361',
-    u'\u0489',
-    u'\u0316',
-    u'\u0317',
-    u'\u0318',
-    u'\u0319',
-    u'\u031c',
-    u'\u031d',
-    u'\u031e',
-    u'\u031f',
-    u'\u0320',
-    u'\u0324',
-    u'\u0325',
-    u'\u0326',
-    u'\u0329',
-    u'\u032a',
-    u'\u032b',
-    u'\u032c',
-    u'\u032d',
-    u'\u032e',
-    u'\u032f',
-    u'\u0330',
-    u'\u0331',
-    u'\u0332',
-    u'\u0333',
-    u'\u0339',
-    u'\u033a',
-    u'\u033b',
-    u'\u033c',
-    u'\u0345',
-    u'\u0347',
-    u'\u0348',
-    u'\u0349',
-    u'\u034d',
-    u'\u034e',
-    u'\u0353',
-    u'\u0354',
-    u'\u0355',
-    u'\u0356',
-    u'\u0359',
-    u'\u035a',
-    u'\u0323',
-]
-
-
-ZALGO_RE = re.compile(
-    u"|".join(ZALGO)
-)
-
-
 LOG_DATA = {
     "invites": {
         "rule": "Invite Filter"
@@ -216,6 +77,9 @@ LOG_DATA = {
     "repeat": {
         "rule": "Repetition Filter"  
     },
+    "copypasta": {
+        "rule": "Copypasta Filter"
+    },
     "regex": {
         "rule": "Regex Filter"
     },
@@ -288,6 +152,13 @@ AUTOMOD_RULES = {
         "field_name": "repeat",
         "field_help": "repeat"
     },
+    "copypasta": {
+        "int_field_name": "threshold",
+        "i18n_key": "set_copypasta",
+        "i18n_type": "copypasta filtering",
+        "field_name": "account",
+        "field_help": "accounts"
+    },
     "zalgo": {
         "int_field_name": "warns",
         "i18n_key": "set_zalgo",
@@ -305,6 +176,9 @@ AUTOMOD_RULES = {
 }
 
 
+EDIT_DEBOUNCE = 2 # seconds, further edits by the same author within are checked together afterwards
+
+
 BYPASS_TO_SECONDS = {
     "1 Month": 2678400,
     "3 Months": 8035200,
@@ -313,13 +187,6 @@ BYPASS_TO_SECONDS = {
 }
 
 
-ILLEGAL_CHARS = [
-    "­", # soft hyphen
-    "​", # zero width space
-    "\\"
-]
-
-
 CHANNEL_OR_ROLE_T = TypeVar("CHANNEL_OR_ROLE_T", discord.Role, discord.TextChannel)
 
 
@@ -330,88 +197,45 @@ class AutomodPlugin(AutoModPluginBlueprint):
         self.action_processor = ActionProcessor(bot)
         self.log_processor = LogProcessor(bot)
         self.dm_processor = DMProcessor(bot)
-        self.spam_cache: Dict[int, commands.CooldownMapping] = {}
-        self.recent_messages: Dict[int, Dict[int, List[discord.Message]]] = {}
+        self.action_queue = ActionQueue(bot)
+        self.spam_tracker = SpamTracker()
+        self.flood = FloodDetector(bot)
+        self.budgets = UsageBudgets()
+        self.copypasta = CopypastaDetector()
+        self.pending_edits: Dict[Tuple[int, int], Dict[int, discord.Message]] = {}
 
 
-    def update_recent_messages(self, msg: discord.Message) -> None:
-        if not msg.author.id in self.recent_messages:
-            self.recent_messages[msg.guild.id] = [msg]
-        else:
-            last_ten = self.recent_messages[msg.author.id].get(msg.guild.id, [])
-            if len(last_ten) == 10:
-                last_ten[-1] = msg
-            else:
-                last_ten.append(msg)
-            
-            self.recent_messages[msg.author.id].update({
-                msg.guild.id: last_ten
-            })
-    
+    async def delete_recent_messages(self, guild: discord.Guild, to_delete: List[Tuple[int, int]]) -> None:
+        self.bot.metrics.pause()
+        by_channel: Dict[int, List[int]] = {}
+        for channel_id, msg_id in to_delete:
+            by_channel.setdefault(channel_id, []).append(msg_id)
 
-    def get_recent_messages(self, msg: discord.Message) -> List[Optional[discord.Message]]:
-        if not msg.author.id in self.recent_messages:
-            return []
-        else:
-            return self.recent_messages[msg.author.id].get(msg.guild.id, [])
+        for channel_id, msg_ids in by_channel.items():
+            self.bot.deletions.queue(guild.get_channel_or_thread(channel_id), msg_ids)
 
 
     def can_act(self, guild: discord.Guild, mod: discord.Member, target: Union[discord.Member, discord.User]) -> bool:
         if mod.id == target.id: return False
         if mod.id == guild.owner_id: return True
 
-        mod = guild.get_member(mod.id)
+        if guild.get_member(mod.id) == None: return False
         target = guild.get_member(target.id)
-        if mod == None or target == None: return False
-
-        rid = self.bot.db.configs.get(guild.id, "mod_role")
-        if rid != "" and rid != None:
-            if int(rid) in [x.id for x in target.roles]: return False
-
-        return mod.id != target.id \
-            and target.id != guild.owner.id \
-            and (
-                target.guild_permissions.ban_members == False 
-                or target.guild_permissions.kick_members == False 
-                or target.guild_permissions.manage_messages == False
-            )
+        if target == None: return False
+
+        return not self.bot.permissions.is_immune(guild, target)
     
 
     def can_ignore(self, guild: discord.Guild, channel: discord.TextChannel, target: Union[discord.Member, discord.User]) -> bool:
-        roles, channels = self.get_ignored_roles_channels(guild)
-        if channels == None:
-            self.db.configs.update(guild.id, "ignored_channels_automod", [])
-        else:
-            if channel.id in channels: return True
-
-        if any(x in [i.id for i in target.roles] for x in roles): return True
-        return False
+        return self.bot.permissions.is_ignored(guild, channel, target)
 
 
     def parse_filter(self, words: List[str]) -> Optional[re.Pattern]:
-        normal = []
-        wildcards = []
-
-        for i in words:
-            i = i.replace("*", "", (i.count("*") - 1)) # remove multiple wildcards
-            if i.endswith("*"):
-                wildcards.append(re.escape(i.replace("*", ".+")))
-            else:
-                normal.append(re.escape(i))
-
-        try:
-            return re.compile(r"|".join([*normal, *wildcards]), re.IGNORECASE)
-        except Exception:
-            return None
+        return parse_filter(words)
 
 
     def parse_regex(self, regex: str) -> Optional[re.Pattern]:
-        try:
-            parsed = re.compile(regex, re.IGNORECASE)
-        except Exception:
-            return None
-        else:
-            return parsed
+        return parse_regex(regex)
 
 
     def validate_regex(self, regex: str) -> bool:
@@ -455,9 +279,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
 
 
     def sanitize_content(self, content: str) -> str:
-        for c in ILLEGAL_CHARS:
-            content = content.replace(c, "")
-        return content
+        return sanitize(content)
     
 
     def replace_vars(self, msg: discord.Message, inp: str, rule: str) -> str:
@@ -496,159 +318,224 @@ class AutomodPlugin(AutoModPluginBlueprint):
 
         
     async def delete_msg(self, rule: str, found: str, msg: discord.Message, warns: int, reason: str, pattern_or_filter: Optional[str] = None) -> None:
-        try:
-            await msg.delete()
-        except (
-            discord.NotFound, 
-            discord.Forbidden
-        ):
-            pass
+        self.bot.metrics.hit(rule)
+        self.bot.deletions.queue(msg.channel, [msg.id])
+
+        # everything else is queued, repeated violations of the same rule by a user are merged while they're pending
+        q = self.action_queue
+        q.put(msg.guild.id, "response", ("response", msg.channel.id, rule), self.send_response, (msg, rule))
+        if warns > 0:
+            q.put(
+                msg.guild.id, 
+                "punish", 
+                ("punish", msg.author.id, rule, pattern_or_filter), # other rules keep their own reason & case
+                self.punish, 
+                (msg, rule, found, warns, reason, pattern_or_filter),
+                merge=lambda old, new: (*old[:3], old[3] + new[3], *old[4:])
+            )
         else:
-            self.bot.ignore_for_events.append(msg.id)
-        finally:
-            await self.send_response(msg, rule) 
             data = Object(LOG_DATA[rule])
+            q.put(
+                msg.guild.id,
+                "dm",
+                ("dm", msg.author.id, rule),
+                functools.partial(self.dm_processor.actual_execute, guild_name=msg.guild.name, rule=data.rule, _emote="SWORDS"),
+                (msg, "automod_rule_triggered", msg.author),
+                merge=lambda old, new: old
+            )
+            q.put(
+                msg.guild.id, 
+                "log", 
+                ("log", msg.author.id, rule, pattern_or_filter), 
+                self.log_violation, 
+                (msg, rule, found, reason, pattern_or_filter, 1),
+                merge=lambda old, new: (*old[:5], old[5] + 1)
+            )
 
-            if warns > 0:
-                await self.action_processor.execute(
-                    msg, 
-                    msg.guild.me,
-                    msg.author,
-                    warns, 
-                    reason,
-                    **{
-                        "rule": data.rule if rule not in ["filter", "regex"] else None,
-                        "pattern": f"{pattern_or_filter}",
-                        "found": found,
-                        "channel_id": msg.channel.id,
-                        "content": msg.content,
-                    }
-                )
-            else:
-                self.dm_processor.execute(
-                    msg,
-                    "automod_rule_triggered",
-                    msg.author,
-                    **{
-                        "guild_name": msg.guild.name,
-                        "rule": data.rule,
-                        "_emote": "SWORDS"
-                    }
-                )
-                if rule not in ["filter", "regex"]:
-                    await self.log_processor.execute(
-                        msg.guild,
-                        "automod_rule_triggered",
-                        **{
-                            "rule": data.rule,
-                            "found": found,
-                            "user_id": msg.author.id,
-                            "user": msg.author,
-                            "mod": msg.guild.me,
-                            "mod_id": msg.guild.me.id,
-                            "channel_id": msg.channel.id,
-                            "content": msg.content,
-                            "case": self.action_processor.new_case("automod", msg, msg.guild.me, msg.author, f"{reason}, automated by AutoMod")
-                        }
-                    )
-                else:
-                    await self.log_processor.execute(
-                        msg.guild,
-                        f"{rule}_triggered",
-                        **{
-                            "pattern": f"{pattern_or_filter}",
-                            "found": found,
-                            "user_id": msg.author.id,
-                            "user": msg.author,
-                            "mod": msg.guild.me,
-                            "mod_id": msg.guild.me.id,
-                            "channel_id": msg.channel.id,
-                            "content": msg.content,
-                            "case": self.action_processor.new_case(rule, msg, msg.guild.me, msg.author, f"{reason}, automated by AutoMod")
-                        }
-                    )
+
+    async def punish(self, msg: discord.Message, rule: str, found: str, warns: int, reason: str, pattern_or_filter: Optional[str] = None) -> None:
+        data = Object(LOG_DATA[rule])
+        await self.action_processor.execute(
+            msg, 
+            msg.guild.me,
+            msg.author,
+            warns, 
+            reason,
+            **{
+                "rule": data.rule if rule not in ["filter", "regex"] else None,
+                "pattern": f"{pattern_or_filter}",
+                "found": found,
+                "channel_id": msg.channel.id,
+                "content": msg.content,
+            }
+        )
+
+
+    async def log_violation(self, msg: discord.Message, rule: str, found: str, reason: str, pattern_or_filter: Optional[str] = None, repeats: int = 1) -> None:
+        data = Object(LOG_DATA[rule])
+        if repeats > 1: found = f"{found} (x{repeats})"
+
+        if rule not in ["filter", "regex"]:
+            await self.log_processor.execute(
+                msg.guild,
+                "automod_rule_triggered",
+                **{
+                    "rule": data.rule,
+                    "found": found,
+                    "user_id": msg.author.id,
+                    "user": msg.author,
+                    "mod": msg.guild.me,
+                    "mod_id": msg.guild.me.id,
+                    "channel_id": msg.channel.id,
+                    "content": msg.content,
+                    "case": await self.action_processor.new_case("automod", msg, msg.guild.me, msg.author, f"{reason}, automated by AutoMod")
+                }
+            )
+        else:
+            await self.log_processor.execute(
+                msg.guild,
+                f"{rule}_triggered",
+                **{
+                    "pattern": f"{pattern_or_filter}",
+                    "found": found,
+                    "user_id": msg.author.id,
+                    "user": msg.author,
+                    "mod": msg.guild.me,
+                    "mod_id": msg.guild.me.id,
+                    "channel_id": msg.channel.id,
+                    "content": msg.content,
+                    "case": await self.action_processor.new_case(rule, msg, msg.guild.me, msg.author, f"{reason}, automated by AutoMod")
+                }
+            )
+
+
+    async def log_regex_disabled(self, guild: discord.Guild, name: str) -> None:
+        e = Embed(
+            None,
+            color=0xffdc5c,
+            description=self.locale.t(guild, "log_regex_disabled", _emote="WARN", name=name)
+        )
+        await self.log_processor.execute(guild, "regex_disabled", **{
+            "_embed": e
+        })
 
 
     async def execute_punishment(self, rule: str, found: str, msg: discord.Message, warns: int, reason: str, pattern_or_filter: Optional[str] = None) -> None:
         pass
 
 
-    async def enforce_rules(self, msg: discord.Message) -> None:
-        content = self.sanitize_content(msg.content)
+    async def enforce_rules(self, msg: discord.Message, edit: bool = False) -> None:
+        timer = self.bot.metrics.timer(msg.guild.id)
+        try:
+            await self._enforce_rules(msg, timer, edit)
+        finally:
+            self.bot.metrics.done(timer)
 
-        config = Object(self.db.configs.get_doc(msg.guild.id))
-        rules = config.automod
-        filters = config.filters
-        regexes = config.regexes
-        antispam = config.antispam
 
-        if antispam.enabled == True:
-            if not self.can_ignore(msg.guild, msg.channel, msg.author):
-                if not msg.guild.id in self.spam_cache:
-                    self.spam_cache.update({
-                        msg.guild.id: commands.CooldownMapping.from_cooldown(
-                            antispam.rate,
-                            float(antispam.per),
-                            commands.BucketType.user
-                        )
-                    })
-                
-                mapping = self.spam_cache[msg.guild.id]
-                now = msg.created_at.timestamp()
+    async def enforce_edit(self, msg: discord.Message) -> None:
+        """
+        Checks edited messages. The first edit is checked right away, further edits by the same author within 
+        ``EDIT_DEBOUNCE`` seconds are collected and only their latest version is checked once the window closes.
+        """
+        key = (msg.guild.id, msg.author.id)
+        if key in self.pending_edits:
+            self.pending_edits[key][msg.id] = msg
+            return
+
+        self.pending_edits[key] = {}
+        try:
+            batch = [msg]
+            while len(batch) > 0:
+                for m in batch: await self.enforce_rules(m, edit=True)
+                await asyncio.sleep(EDIT_DEBOUNCE)
+
+                batch = list(self.pending_edits[key].values())
+                self.pending_edits[key] = {}
+        finally:
+            self.pending_edits.pop(key, None)
 
-                users = mapping.get_bucket(msg)
-                if users.update_rate_limit(now):
-                    to_delete = self.get_recent_messages(msg)
+
+    async def _enforce_rules(self, msg: discord.Message, timer: Optional[RuleTimer], edit: bool = False) -> None:
+        if timer != None: timer.stage("features")
+        feats = self.bot.message_features.get(msg)
+        content = feats.clean
+
+        plan = self.bot.rule_plans.get(msg.guild.id)
+        if plan == None: return
+
+        rules = plan.rules
+        antispam = plan.antispam
+
+        # edits aren't new messages, only the rules that look at the content are checked again
+        if timer != None: timer.stage("antispam")
+        if antispam.enabled == True and edit == False:
+            if not self.can_ignore(msg.guild, msg.channel, msg.author):
+                to_delete = self.spam_tracker.hit(
+                    msg.guild.id,
+                    msg.author.id,
+                    msg.channel.id,
+                    msg.id,
+                    msg.created_at.timestamp(),
+                    antispam.rate,
+                    float(antispam.per)
+                )
+                if to_delete != None:
                     if len(to_delete) > 0:
-                        try:
-                            await msg.channel.delete_messages(to_delete)
-                        except Exception:
-                            pass
+                        await self.delete_recent_messages(msg.guild, to_delete)
 
                     return await self.delete_msg(
                         "antispam",
-                        f"**``{users.rate}/{round(users.per, 0)}``**",
+                        f"**``{antispam.rate}/{round(float(antispam.per), 0)}``**",
                         msg, 
                         antispam.warns, 
                         "Spam detected"
                     )
-                else:
-                    self.update_recent_messages(msg)
 
 
-        if len(filters) > 0:
-            for name in filters:
-                f = filters[name]
-                if msg.channel.id in f["channels"] or len(f["channels"]) < 1:
-                    parsed = self.parse_filter(f["words"])
-                    if parsed != None:
-                        found = parsed.findall(content)
-                        if found:
-                            return await self.delete_msg(
-                                "filter",
-                                ", ".join([f"**``{x}``**" for x in found]),
-                                msg, 
-                                int(f["warns"]), 
-                                "Blacklisted spam",
-                                name
-                            )
+        if timer != None: timer.stage("flood")
+        if edit == False and any(antispam.get(x, None) for x in FLOOD_SCOPES) and not self.can_ignore(msg.guild, msg.channel, msg.author):
+            if self.flood.check(msg, antispam) == "delete":
+                self.bot.metrics.hit("flood")
+                self.bot.deletions.queue(msg.channel, [msg.id])
+                return
+
+        if timer != None: timer.stage("filter")
+        hits = plan.matcher.search(content)
+        if feats.normalized != feats.lower:
+            for indx, found in plan.matcher.search(feats.normalized).items():
+                if not indx in hits: hits[indx] = found
+        if hits:
+            for indx, (name, channels, warns) in enumerate(plan.filters):
+                if indx in hits and (msg.channel.id in channels or len(channels) < 1):
+                    return await self.delete_msg(
+                        "filter",
+                        ", ".join([f"**``{found}``**" for _, found in hits[indx]]),
+                        msg, 
+                        warns, 
+                        "Blacklisted spam",
+                        name
+                    )
         
-        if len(regexes) > 0:
-            for name, data in regexes.items():
-                if msg.channel.id in data["channels"] or len(data["channels"]) < 1:
-                    parsed = self.parse_regex(data["regex"])
-                    if parsed != None:
-                        found = parsed.findall(content)
-                        if found:
-                            return await self.delete_msg(
-                                "regex",
-                                ", ".join([f"**``{x}``**" for x in found]),
-                                msg, 
-                                int(data["warns"]), 
-                                "Blacklisted spam",
-                                name
-                            )
+        if timer != None: timer.stage("regex")
+        # only against what the user wrote, the normalized view rewrites digits, lookalikes & spacing
+        match, disabled = await self.bot.regex_sandbox.findall(
+            msg.guild.id,
+            [x for x in plan.regexes if msg.channel.id in x[2] or len(x[2]) < 1],
+            content
+        )
+        for name in disabled: await self.log_regex_disabled(msg.guild, name)
+        if match != None:
+            name, found, warns = match
+            return await self.delete_msg(
+                "regex",
+                ", ".join([f"**``{x}``**" for x in found]),
+                msg, 
+                warns, 
+                "Blacklisted spam",
+                name
+            )
         
+        if timer != None: timer.stage("permissions")
         if len(rules) < 1: return
         if self.can_ignore(
             msg.guild, 
@@ -656,39 +543,31 @@ class AutomodPlugin(AutoModPluginBlueprint):
             msg.author
         ): return
 
+        # totals of the last BUDGET_WINDOW seconds, so limits can't be dodged by splitting them over messages
+        if timer != None: timer.stage("budgets")
+        totals = None
+        if edit == False and any(hasattr(rules, x) for x in ["mentions", "emotes", "lines", "files"]):
+            totals = self.budgets.add(
+                msg.guild.id, 
+                msg.author.id, 
+                msg.created_at.timestamp(), 
+                (feats.mentions, feats.emotes, feats.attachments, feats.lines - 1)
+            )
+
+        if timer != None: timer.stage("invites")
         if hasattr(rules, "invites"):
-            found = INVITE_RE.findall(content)
+            found = feats.invites
             if found:
                 for inv in found:
                     try:
-                        invite: discord.Invite = await self.bot.fetch_invite(inv)
-                    except discord.NotFound:
-                        return await self.delete_msg(
-                            "invites",
-                            f"**``{inv}``**",
-                            msg, 
-                            rules.invites.warns, 
-                            self.get_automod_reason(
-                                rules.invites, 
-                                "Sending Discord invite link or equivalent redirect"
-                            )
-                        )
-                    if invite.guild == None:
-                        return await self.delete_msg(
-                            "invites",
-                            f"**``{inv}``**",
-                            msg, 
-                            rules.invites.warns, 
-                            self.get_automod_reason(
-                                rules.invites, 
-                                "Sending Discord invite link or equivalent redirect"
-                            )
-                        )
+                        guild_id = await self.bot.invites.resolve(inv)
+                    except discord.HTTPException:
+                        continue # rate limited or discord is having issues, don't punish for that
                     else:
-                        if invite.guild == None \
+                        if guild_id == None \
                             or (
-                                not invite.guild.id in config.allowed_invites \
-                                and invite.guild.id != msg.guild.id
+                                not guild_id in plan.allowed_invites \
+                                and guild_id != msg.guild.id
                             ):
                                 return await self.delete_msg(
                                     "invites",
@@ -701,15 +580,15 @@ class AutomodPlugin(AutoModPluginBlueprint):
                                     )
                                 )
         
+        if timer != None: timer.stage("links")
         if hasattr(rules, "links"):
-            found = LINK_RE.findall(content)
+            found = feats.hosts
             if found:
-                for link in found:
-                    url = urlparse(link)
-                    if url.hostname in config.black_listed_links:
+                for host in found:
+                    if host in plan.black_listed_links:
                         return await self.delete_msg(
                             "links_blacklist", 
-                            f"**``{url.hostname}``**",
+                            f"**``{host}``**",
                             msg, 
                             rules.links.warns, 
                             self.get_automod_reason(
@@ -718,10 +597,10 @@ class AutomodPlugin(AutoModPluginBlueprint):
                             )
                         )
                     else:
-                        if not url.hostname in config.white_listed_links:
+                        if not host in plan.white_listed_links:
                             return await self.delete_msg(
                                 "links", 
-                                f"**``{url.hostname}``**",
+                                f"**``{host}``**",
                                 msg, 
                                 rules.links.warns, 
                                 self.get_automod_reason(
@@ -730,7 +609,8 @@ class AutomodPlugin(AutoModPluginBlueprint):
                                 )
                             )
 
-        if hasattr(rules, "files"):
+        if timer != None: timer.stage("files")
+        if hasattr(rules, "files") and edit == False:
             if len(msg.attachments) > 0:
                 try:
                     forbidden = [
@@ -750,13 +630,31 @@ class AutomodPlugin(AutoModPluginBlueprint):
                             "Posting forbidden attachment type"
                         )
                     )
+                
+                # files has no threshold, so there only is a budget if one was set
+                budget = rules.files.get("budget", None)
+                if totals != None and budget != None and totals[2] > int(budget):
+                    return await self.delete_msg(
+                        "files", 
+                        f"**``{totals[2]} in {BUDGET_WINDOW}s``**", 
+                        msg, 
+                        rules.files.warns, 
+                        self.get_automod_reason(
+                            rules.files, 
+                            "Posting too many attachments"
+                        )
+                    )
 
+        if timer != None: timer.stage("zalgo")
         if hasattr(rules, "zalgo"):
-            found = ZALGO_RE.search(content)
-            if found:
+            found = feats.zalgo
+            if found > 0 and (
+                feats.zalgo_density >= float(rules.zalgo.get("density", ZALGO_DENSITY)) or 
+                feats.zalgo_stack > ZALGO_MAX_STACK
+            ):
                 return await self.delete_msg(
                     "zalgo", 
-                    f"``{found.group()}``", 
+                    f"**``{found}``**", 
                     msg, 
                     rules.zalgo.warns, 
                     self.get_automod_reason(
@@ -765,8 +663,9 @@ class AutomodPlugin(AutoModPluginBlueprint):
                     )
                 )
 
+        if timer != None: timer.stage("mentions")
         if hasattr(rules, "mentions"):
-            found = len(MENTION_RE.findall(content))
+            found = feats.mentions
             if found > rules.mentions.threshold:
                 return await self.delete_msg(
                     "mentions", 
@@ -778,9 +677,23 @@ class AutomodPlugin(AutoModPluginBlueprint):
                         "Excessive use of mentions"
                     )
                 )
+            elif totals != None and feats.mentions > 0:
+                budget = int(rules.mentions.get("budget", rules.mentions.threshold * 3))
+                if totals[0] > budget:
+                    return await self.delete_msg(
+                        "mentions", 
+                        f"**``{totals[0]} in {BUDGET_WINDOW}s``**", 
+                        msg, 
+                        0 if (totals[0] - budget) == 1 else 1, 
+                        self.get_automod_reason(
+                            rules.mentions, 
+                            "Excessive use of mentions"
+                        )
+                    )
 
+        if timer != None: timer.stage("lines")
         if hasattr(rules, "lines"):
-            found = len(content.split("\n"))
+            found = feats.lines
             if found > rules.lines.threshold:
                 return await self.delete_msg(
                     "lines", 
@@ -792,9 +705,24 @@ class AutomodPlugin(AutoModPluginBlueprint):
                         "Message too long"
                     )
                 )
+            elif totals != None and feats.lines > 1:
+                budget = int(rules.lines.get("budget", rules.lines.threshold * 3))
+                if totals[3] > budget:
+                    return await self.delete_msg(
+                        "lines", 
+                        f"**``{totals[3]} in {BUDGET_WINDOW}s``**", 
+                        msg, 
+                        0 if (totals[3] - budget) == 1 else 1, 
+                        self.get_automod_reason(
+                            rules.lines, 
+                            "Message too long"
+                        )
+                    )
             
+        if timer != None: timer.stage("length")
         if hasattr(rules, "length"):
-            if len(content) > rules.length.threshold:
+            found = feats.length
+            if found > rules.length.threshold:
                 return await self.delete_msg(
                     "length", 
                     f"**``{found}``**", 
@@ -806,8 +734,9 @@ class AutomodPlugin(AutoModPluginBlueprint):
                     )
                 )
 
+        if timer != None: timer.stage("emotes")
         if hasattr(rules, "emotes"):
-            found = len(EMOTE_RE.findall(content))
+            found = feats.emotes
             if found > rules.emotes.threshold:
                 return await self.delete_msg(
                     "emotes", 
@@ -819,13 +748,23 @@ class AutomodPlugin(AutoModPluginBlueprint):
                         "Excessive use of emotes"
                     )
                 )
+            elif totals != None and feats.emotes > 0:
+                budget = int(rules.emotes.get("budget", rules.emotes.threshold * 3))
+                if totals[1] > budget:
+                    return await self.delete_msg(
+                        "emotes", 
+                        f"**``{totals[1]} in {BUDGET_WINDOW}s``**", 
+                        msg, 
+                        0 if (totals[1] - budget) == 1 else 1, 
+                        self.get_automod_reason(
+                            rules.emotes, 
+                            "Excessive use of emotes"
+                        )
+                    )
 
+        if timer != None: timer.stage("repeat")
         if hasattr(rules, "repeat"):
-            found = {}
-            for word in content.split(" "):
-                found.update({
-                    word.lower(): found.get(word.lower(), 0) + 1
-                })
+            found = feats.word_counts
             if len(found.keys()) < 12:
                 for k, v in found.items():
                     if v > rules.repeat.threshold:
@@ -840,13 +779,40 @@ class AutomodPlugin(AutoModPluginBlueprint):
                             )
                         )
         
+        if timer != None: timer.stage("copypasta")
+        if hasattr(rules, "copypasta") and edit == False:
+            seen = self.copypasta.check(
+                msg.guild.id,
+                msg.author.id,
+                msg.channel.id,
+                content,
+                feats.words,
+                msg.created_at.timestamp(),
+                float(rules.copypasta.get("window", COPYPASTA_WINDOW))
+            )
+            if seen != None:
+                authors, channels = seen
+                found = max(authors, channels)
+                if found > rules.copypasta.threshold:
+                    return await self.delete_msg(
+                        "copypasta", 
+                        f"**``{authors} users in {channels} channels``**", 
+                        msg, 
+                        0 if (found - rules.copypasta.threshold) == 1 else 1, 
+                        self.get_automod_reason(
+                            rules.copypasta, 
+                            "Copypasta spam"
+                        )
+                    )
+
+        if timer != None: timer.stage("caps")
         if hasattr(rules, "caps"):
-            if len(content) > 10:
-                perc_caps = round(((len([x for x in content if x.isupper()]) / len(content)) * 100))
+            if feats.length > 10:
+                perc_caps = round(feats.caps_ratio * 100)
                 if perc_caps >= 75:
                     return await self.delete_msg(
                         "caps", 
-                        f"**``{perc_caps}% in {len(content)} chars``**", 
+                        f"**``{perc_caps}% in {feats.length} chars``**", 
                         msg, 
                         rules.caps.warns, 
                         self.get_automod_reason(
@@ -866,12 +832,17 @@ class AutomodPlugin(AutoModPluginBlueprint):
 
 
     @AutoModPluginBlueprint.listener()
-    async def on_message_edit(self, _, msg: discord.Message) -> None:
+    async def on_message_edit(self, before: discord.Message, msg: discord.Message) -> None:
         if msg.guild == None: return
+
+        # embed-only edits (e.g. resolved link previews) don't change anything the rules look at
+        prev = self.bot.message_features.peek(msg.id)
+        if (prev.content if prev != None else before.content) == msg.content: return
+
         if not msg.guild.chunked: await self.bot.chunk_guild(msg.guild)
         if not self.can_act(msg.guild, msg.guild.me, msg.author): return
 
-        await self.enforce_rules(msg)
+        await self.enforce_edit(msg)
 
 
     @AutoModPluginBlueprint.listener()
@@ -922,6 +893,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
             "ignored_roles_automod": roles,
             "ignored_channels_automod": channels
         })
+        self.bot.rule_plans.invalidate(i.guild.id)
         if parts[0] != "automod_add": added = removed
 
         e = Embed(
@@ -995,6 +967,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
             "Length filter", 
             "Emotes filter", 
             "Repetition filter", 
+            "Copypasta filter", 
             "Zalgo filter", 
             "Caps filter"
         ],
@@ -1015,6 +988,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
             "length filter": "length",
             "emotes filter": "emotes", 
             "repetition filter": "repeat", 
+            "copypasta filter": "copypasta", 
             "zalgo filter": "zalgo", 
             "caps filter": "caps"
         }.get(rule.lower())
@@ -1029,9 +1003,37 @@ class AutomodPlugin(AutoModPluginBlueprint):
             except Exception:
                 return await i.response.send_message(embed=E(self.locale.t(i.guild, "num_req", _emote="NO", arg="amount"), 0), ephemeral=True)
 
-            if rule in ["mentions", "lines", "emotes", "repeat"]:
-                if amount < 5: return await i.response.send_message(embed=E(self.locale.t(i.guild, "min_am_amount", _emote="NO", field=rule.replace("s", "")), 0), ephemeral=True)
-                if amount > 100: return await i.response.send_message(embed=E(self.locale.t(i.guild, "max_am_amount", _emote="NO", field=rule.replace("s", "")), 0), ephemeral=True)
+            extra = {}
+            if rule == "zalgo":
+                try:
+                    density, = self.bot.extract_args(i, "density")
+                except IndexError:
+                    density = None # field wasn't rendered
+                try:
+                    density = float(density) if density not in [None, ""] else ZALGO_DENSITY
+                except Exception:
+                    return await i.response.send_message(embed=E(self.locale.t(i.guild, "num_req", _emote="NO", arg="density"), 0), ephemeral=True)
+                if density < 0.1 or density > 10: return await i.response.send_message(embed=E(self.locale.t(i.guild, "invalid_density", _emote="NO"), 0), ephemeral=True)
+                extra["density"] = density
+
+            if rule in ["mentions", "lines", "emotes", "files"]:
+                try:
+                    budget, = self.bot.extract_args(i, "budget")
+                except IndexError:
+                    budget = None # field wasn't rendered
+                if budget not in [None, ""]:
+                    try:
+                        budget = int(budget)
+                    except Exception:
+                        return await i.response.send_message(embed=E(self.locale.t(i.guild, "num_req", _emote="NO", arg="budget"), 0), ephemeral=True)
+                    # files has no threshold, the others have to allow at least one full message
+                    lowest = 1 if rule == "files" else amount
+                    if budget < lowest or budget > 500: return await i.response.send_message(embed=E(self.locale.t(i.guild, "invalid_budget", _emote="NO", min=lowest, max=500), 0), ephemeral=True)
+                    extra["budget"] = budget
+
+            if rule in ["mentions", "lines", "emotes", "repeat", "copypasta"]:
+                if amount < 5: return await i.response.send_message(embed=E(self.locale.t(i.guild, "min_am_amount", _emote="NO", field=data.field_name), 0), ephemeral=True)
+                if amount > 100: return await i.response.send_message(embed=E(self.locale.t(i.guild, "max_am_amount", _emote="NO", field=data.field_name), 0), ephemeral=True)
             else:
                 if rule == "length":
                     if amount < 20: return await i.response.send_message(embed=E(self.locale.t(i.guild, "min_chars", _emote="NO"), 0), ephemeral=True)
@@ -1044,13 +1046,15 @@ class AutomodPlugin(AutoModPluginBlueprint):
                 rule: {
                     data.int_field_name: int(amount),
                     "response": response if response != "" else None,
-                    "reason": reason if reason != "" else None
+                    "reason": reason if reason != "" else None,
+                    **extra
                 }
             })
             self.db.configs.update(i.guild.id, "automod", current)
+            self.bot.rule_plans.invalidate(i.guild.id)
 
             text = ""
-            if not rule in ["mentions", "lines", "length", "emotes", "repeat"] and amount == 0:
+            if not rule in ["mentions", "lines", "length", "emotes", "repeat", "copypasta"] and amount == 0:
                 if rule == "links":
                     text = self.locale.t(i.guild, f"{data.i18n_key}_zero", _emote="YES", cmd=f"</links add:{self.bot.internal_cmd_store.get('links')}>")
                 elif rule == "invites":
@@ -1069,11 +1073,13 @@ class AutomodPlugin(AutoModPluginBlueprint):
         modal = AutomodRuleModal(
             self.bot, 
             f"Configure {rule.title()} Rule", 
-            "threshold" if rule in ["mentions", "lines", "emotes", "repeat", "length"] else "warns",
+            "threshold" if rule in ["mentions", "lines", "emotes", "repeat", "copypasta", "length"] else "warns",
             current.get(rule, {}).get(data.int_field_name, None),
             current.get(rule, {}).get("response", None),
             current.get(rule, {}).get("reason", None),
-            callback
+            callback,
+            density=current.get(rule, {}).get("density", ZALGO_DENSITY) if rule == "zalgo" else None,
+            budget=str(current.get(rule, {}).get("budget", "")) if rule in ["mentions", "lines", "emotes", "files"] else None
         )
         await ctx.response.send_modal(modal)
 
@@ -1097,6 +1103,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
             "Length filter", 
             "Emotes filter", 
             "Repetition filter", 
+            "Copypasta filter", 
             "Zalgo filter", 
             "Caps filter"
         ],
@@ -1117,6 +1124,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
             "length filter": "length", 
             "emotes filter": "emotes", 
             "repetition filter": "repeat", 
+            "copypasta filter": "copypasta", 
             "zalgo filter": "zalgo", 
             "caps filter": "caps"
         }.get(rule.lower())
@@ -1127,6 +1135,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
             await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "alr_automod_off", _emote="NO", _type=data.i18n_type.title()), 0))
         else:
             self.db.configs.update(ctx.guild.id, "automod", {k: v for k, v in current.items() if k != rule})
+            self.bot.rule_plans.invalidate(ctx.guild.id)
             await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "automod_off", _emote="YES", _type=data.i18n_type.title()), 1))
 
 
@@ -1176,6 +1185,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
         
         allowed.append(str(guild_id))
         self.db.configs.update(ctx.guild.id, "allowed_invites", allowed)
+        self.bot.rule_plans.invalidate(ctx.guild.id)
 
         await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "allowed_inv", _emote="YES"), 1))
 
@@ -1199,6 +1209,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
         
         allowed.remove(str(guild_id))
         self.db.configs.update(ctx.guild.id, "allowed_invites", allowed)
+        self.bot.rule_plans.invalidate(ctx.guild.id)
 
         await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "unallowed_inv", _emote="YES"), 1))
 
@@ -1266,6 +1277,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
             
             links.append(url)
             self.db.configs.update(ctx.guild.id, "black_listed_links", links)
+            self.bot.rule_plans.invalidate(ctx.guild.id)
 
             await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "allowed_link", _emote="YES"), 1))
         else:
@@ -1274,6 +1286,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
             
             links.append(url)
             self.db.configs.update(ctx.guild.id, "white_listed_links", links)
+            self.bot.rule_plans.invalidate(ctx.guild.id)
 
             await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "allowed_link2", _emote="YES"), 1))
 
@@ -1300,6 +1313,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
             
             links.remove(url)
             self.db.configs.update(ctx.guild.id, "black_listed_links", links)
+            self.bot.rule_plans.invalidate(ctx.guild.id)
 
             await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "unallowed_link", _emote="YES"), 1))
         else:
@@ -1308,6 +1322,7 @@ class AutomodPlugin(AutoModPluginBlueprint):
             
             links.remove(url)
             self.db.configs.update(ctx.guild.id, "white_listed_links", links)
+            self.bot.rule_plans.invalidate(ctx.guild.id)
 
             await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "unallowed_link2", _emote="YES"), 1))
 
@@ -1348,15 +1363,8 @@ class AutomodPlugin(AutoModPluginBlueprint):
             "warns": warns
         })
 
-        am_plugin = self.bot.get_plugin("AutomodPlugin")
-        am_plugin.spam_cache.update({
-            ctx.guild.id: commands.CooldownMapping.from_cooldown(
-                rate,
-                float(per),
-                commands.BucketType.user
-            )
-        })
         self.db.configs.update(ctx.guild.id, "antispam", config)
+        self.bot.rule_plans.invalidate(ctx.guild.id)
         await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "enabled_antispam", _emote="YES", rate=rate, per=per, warns=warns), 1))
 
 
@@ -1382,9 +1390,148 @@ class AutomodPlugin(AutoModPluginBlueprint):
             "enabled": False
         })
         self.db.configs.update(ctx.guild.id, "antispam", config)
+        self.bot.rule_plans.invalidate(ctx.guild.id)
         await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "disabled_antispam", _emote="YES"), 1))
 
 
+    @antispam_command.command(
+        name="flood",
+        description="🌊 Configure the message rate limit for whole channels or the server"
+    )
+    @discord.app_commands.describe(
+        scope="Whether the limit applies per channel or to the whole server",
+        rate="Allowed amount of messages from all users combined (0 to disable)",
+        per="Timeframe the amount of messages is allowed to be sent in",
+        action="What to do while a flood is going on"
+    )
+    @discord.app_commands.default_permissions(manage_guild=True)
+    async def antispam_flood(
+        self, 
+        ctx: discord.Interaction, 
+        scope: Literal["Channel", "Server"],
+        rate: discord.app_commands.Range[int, 0, 500], 
+        per: discord.app_commands.Range[int, 3, 60], 
+        action: Literal["Slowmode", "Delete"]
+    ) -> None:
+        """
+        antispam_flood_help
+        examples:
+        -antispam flood Channel 30 10 Slowmode
+        -antispam flood Server 100 10 Delete
+        -antispam flood Channel 0 10 Slowmode
+        """
+        key = "channel" if scope == "Channel" else "guild"
+        config = self.db.configs.get(ctx.guild.id, "antispam")
+        config.update({
+            key: {
+                **config.get(key, {}),
+                "rate": rate,
+                "per": per,
+                "action": action.lower()
+            }
+        })
+
+        self.db.configs.update(ctx.guild.id, "antispam", config)
+        self.bot.rule_plans.invalidate(ctx.guild.id)
+        if rate == 0:
+            await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "disabled_flood", _emote="YES", scope=scope.lower()), 1))
+        else:
+            await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "enabled_flood", _emote="YES", scope=scope.lower(), rate=rate, per=per, action=action.lower()), 1))
+
+
+    antiraid_command = discord.app_commands.Group(
+        name="antiraid",
+        description="🚨 Configure the raid detection",
+        default_permissions=discord.Permissions(manage_guild=True)
+    )
+    @antiraid_command.command(
+        name="enable",
+        description="🚨 Enable/edit the raid detection"
+    )
+    @discord.app_commands.describe(
+        joins="Amount of joins that starts a lockdown",
+        per="Timeframe the joins have to happen in (seconds)",
+        action="What happens to members joining during a lockdown",
+        account_age="Only take action on accounts younger than this (days, 0 for everyone)",
+        suppress_welcome="Whether welcome messages are skipped during a lockdown"
+    )
+    @discord.app_commands.default_permissions(manage_guild=True)
+    async def antiraid_enable(
+        self, 
+        ctx: discord.Interaction, 
+        joins: discord.app_commands.Range[int, 3, 500], 
+        per: discord.app_commands.Range[int, 3, 300], 
+        action: Literal["none", "kick", "ban"],
+        account_age: discord.app_commands.Range[int, 0, 365] = 0,
+        suppress_welcome: bool = False
+    ) -> None:
+        """
+        antiraid_help
+        examples:
+        -antiraid enable 10 10 kick
+        -antiraid enable 20 30 ban 7
+        """
+        config = get_raid_config(self.db.configs.get(ctx.guild.id, "raid_config"))
+        config.update({
+            "enabled": True,
+            "joins": joins,
+            "per": per,
+            "action": action,
+            "account_age": account_age,
+            "suppress_welcome": suppress_welcome
+        })
+
+        self.db.configs.update(ctx.guild.id, "raid_config", config)
+        await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "enabled_antiraid", _emote="YES", joins=joins, per=per, action=action), 1))
+
+
+    @antiraid_command.command(
+        name="disable",
+        description="🚨 Disable the raid detection"
+    )
+    @discord.app_commands.default_permissions(manage_guild=True)
+    async def antiraid_disable(
+        self, 
+        ctx: discord.Interaction
+    ) -> None:
+        """
+        antiraid_help
+        examples:
+        -antiraid disable
+        """
+        config = get_raid_config(self.db.configs.get(ctx.guild.id, "raid_config"))
+        if config["enabled"] == False:
+            return await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "antiraid_alr_disabled", _emote="NO"), 0), ephemeral=True)
+
+        config.update({
+            "enabled": False
+        })
+        self.db.configs.update(ctx.guild.id, "raid_config", config)
+        self.bot.raids.end(ctx.guild)
+        await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "disabled_antiraid", _emote="YES"), 1))
+
+
+    @antiraid_command.command(
+        name="end",
+        description="🚨 End the current raid lockdown"
+    )
+    @discord.app_commands.default_permissions(manage_guild=True)
+    async def antiraid_end(
+        self, 
+        ctx: discord.Interaction
+    ) -> None:
+        """
+        antiraid_help
+        examples:
+        -antiraid end
+        """
+        summary = self.bot.raids.end(ctx.guild)
+        if summary == None:
+            return await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "no_lockdown", _emote="NO"), 0), ephemeral=True)
+
+        await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "ended_lockdown", _emote="YES", joined=summary["joined"], actioned=summary["actioned"]), 1))
+
+
     ignore_automod = discord.app_commands.Group(
         name="ignore-automod",
         description="🔀 Manage ignored roles & channels for the automoderator",
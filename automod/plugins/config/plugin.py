@@ -12,6 +12,7 @@ from .. import AutoModPluginBlueprint, ShardedBotInstance
 from ...types import Embed, Duration, E
 from ...views import SetupView, RoleChannelSelect, RoleSelect, ConfigView
 from ...modals import DefaultReasonModal, WelcomeMessageModal
+from ...utils import get_raid_config
 
 
 
@@ -293,6 +294,10 @@ class ConfigPlugin(AutoModPluginBlueprint):
     @AutoModPluginBlueprint.listener()
     async def on_member_join(self, user: discord.Member) -> None:
         if user.guild == None: return
+        # asks the detector itself, the internal plugin's listener for this join might not have run yet
+        raid_config = self.db.configs.get(user.guild.id, "raid_config")
+        locked = self.bot.raids.in_lockdown(user.guild.id) if user.bot else self.bot.raids.on_join(user, raid_config)
+        if locked and get_raid_config(raid_config)["suppress_welcome"] == True: return
 
         config = self.db.configs.get(user.guild.id, "welcome")
         if config["enabled"] == True:
@@ -374,13 +379,14 @@ class ConfigPlugin(AutoModPluginBlueprint):
             e.dash_field(dash_length),
             {
                 "name": f"Automoderator",
-                "value": "**• Mentions Filter:** {} \n**• Length Filter:** {} \n**• Line Filter:** {} \n**• Emotes Filter:** {} \n**• Repetition Filter:** {} \n**• Links Filter:** {} \n**• Invites Filter:** {} \n**• Attachment Filter:** {} \n**• Zalgo Filter:** {} \n**• Caps Filter:** {} \n**• Spam Filter:** {}"\
+                "value": "**• Mentions Filter:** {} \n**• Length Filter:** {} \n**• Line Filter:** {} \n**• Emotes Filter:** {} \n**• Repetition Filter:** {} \n**• Copypasta Filter:** {} \n**• Links Filter:** {} \n**• Invites Filter:** {} \n**• Attachment Filter:** {} \n**• Zalgo Filter:** {} \n**• Caps Filter:** {} \n**• Spam Filter:** {}"\
                 .format(
                     no if not hasattr(rules, "mentions") else f"{rules.mentions.threshold} Mentions",
                     no if not hasattr(rules, "length") else f"{rules.length.threshold} Characters",
                     no if not hasattr(rules, "lines") else f"{rules.lines.threshold} Line Splits",
                     no if not hasattr(rules, "emotes") else f"{rules.emotes.threshold} Emotes",
                     no if not hasattr(rules, "repeat") else f"{rules.repeat.threshold} Repetitions",
+                    no if not hasattr(rules, "copypasta") else f"{rules.copypasta.threshold} Accounts",
                     no if not hasattr(rules, "links") else f"{rules.links.warns} Warn{'' if rules.links.warns == 1 else 's'}" if rules.links.warns > 0 else "Only delete",
                     no if not hasattr(rules, "invites") else f"{rules.invites.warns} Warn{'' if rules.invites.warns == 1 else 's'}" if rules.invites.warns > 0 else "Only delete",
                     no if not hasattr(rules, "files") else f"{rules.files.warns} Warn{'' if rules.files.warns == 1 else 's'}" if rules.files.warns > 0 else "Only delete",
@@ -12,6 +12,7 @@ import io
 from .. import AutoModPluginBlueprint, ShardedBotInstance
 from ...types import Embed, E
 from ...modals import FilterCreateModal, RegexCreateModal, FilterEditModal, RegexEditModal
+from ...utils import is_catastrophic
 
 
 
@@ -114,6 +115,7 @@ class FilterPlugin(AutoModPluginBlueprint):
                 "channels": [] if channels == None else self.parse_channels(channels)
             }
             self.db.configs.update(i.guild.id, "filters", filters)
+            self.bot.rule_plans.invalidate(i.guild.id)
             await i.response.send_message(embed=E(self.locale.t(i.guild, "added_filter", _emote="YES"), 1))
 
         modal = FilterCreateModal(self.bot, "Create Filter", callback)
@@ -143,6 +145,7 @@ class FilterPlugin(AutoModPluginBlueprint):
 
         del filters[name]
         self.db.configs.update(ctx.guild.id, "filters", filters)
+        self.bot.rule_plans.invalidate(ctx.guild.id)
 
         await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "removed_filter", _emote="YES"), 1))
 
@@ -184,6 +187,7 @@ class FilterPlugin(AutoModPluginBlueprint):
                 "channels": [] if channels == None else self.parse_channels(channels)
             }
             self.db.configs.update(i.guild.id, "filters", filters)
+            self.bot.rule_plans.invalidate(i.guild.id)
 
             await i.response.send_message(embed=E(self.locale.t(i.guild, "edited_filter", _emote="YES"), 1))
         
@@ -261,7 +265,7 @@ class FilterPlugin(AutoModPluginBlueprint):
             channels = "All channels" if len(data["channels"]) < 1 else ", ".join([f"#{ctx.guild.get_channel(int(x))}" for x in data["channels"]])
 
             e.add_field(
-                name=f"__{name}",
+                name=f"__{name}" if data.get("disabled", False) == False else f"__{name} (disabled)",
                 value=f"**• Action:** {action} \n**• Channels:** {channels} \n**• Pattern:** \n```\n{data['regex']}\n```",
                 inline=True
             )
@@ -301,6 +305,7 @@ class FilterPlugin(AutoModPluginBlueprint):
             if warns > 100: return await i.response.send_message(embed=E(self.locale.t(i.guild, "max_warns", _emote="NO"), 0), ephemeral=True)
 
             if self.validate_regex(regex) == False: return await i.response.send_message(embed=E(self.locale.t(i.guild, "invalid_regex", _emote="NO"), 0), ephemeral=True)
+            if is_catastrophic(regex): return await i.response.send_message(embed=E(self.locale.t(i.guild, "unsafe_regex", _emote="NO"), 0), ephemeral=True)
 
             regexes[name] = {
                 "warns": warns,
@@ -308,6 +313,7 @@ class FilterPlugin(AutoModPluginBlueprint):
                 "channels": [] if channels == None else self.parse_channels(channels)
             }
             self.db.configs.update(i.guild.id, "regexes", regexes)
+            self.bot.rule_plans.invalidate(i.guild.id)
 
             await i.response.send_message(embed=E(self.locale.t(i.guild, "added_regex", _emote="YES"), 1))
         
@@ -336,6 +342,7 @@ class FilterPlugin(AutoModPluginBlueprint):
 
         del regexes[name]
         self.db.configs.update(ctx.guild.id, "regexes", regexes)
+        self.bot.rule_plans.invalidate(ctx.guild.id)
 
         await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "removed_regex", _emote="YES"), 1))
 
@@ -372,6 +379,7 @@ class FilterPlugin(AutoModPluginBlueprint):
             if warns > 100: return await i.response.send_message(embed=E(self.locale.t(i.guild, "max_warns", _emote="NO"), 0), ephemeral=True)
 
             if self.validate_regex(regex) == False: return await i.response.send_message(embed=E(self.locale.t(i.guild, "invalid_regex", _emote="NO"), 0), ephemeral=True)
+            if is_catastrophic(regex): return await i.response.send_message(embed=E(self.locale.t(i.guild, "unsafe_regex", _emote="NO"), 0), ephemeral=True)
 
             regexes[name] = {
                 "warns": warns,
@@ -379,6 +387,7 @@ class FilterPlugin(AutoModPluginBlueprint):
                 "channels": [] if channels == None else self.parse_channels(channels)
             }
             self.db.configs.update(i.guild.id, "regexes", regexes)
+            self.bot.rule_plans.invalidate(i.guild.id)
 
             await i.response.send_message(embed=E(self.locale.t(i.guild, "edited_regex", _emote="YES"), 1))
 
@@ -327,6 +327,7 @@ class InternalPlugin(AutoModPluginBlueprint):
         except Exception as ex:
             log.warn(f"[Events] Failed to chunk members for guild {guild.id} upon joining - {ex}", extra={"loc": f"Shard {guild.shard_id}"})
         finally:
+            self.bot.cache.pin("configs", guild.id)
             if not self.db.configs.exists(guild.id):
                 self.db.configs.insert(GuildConfig(guild, self.config.default_prefix))
             
@@ -365,9 +366,11 @@ class InternalPlugin(AutoModPluginBlueprint):
     async def on_guild_remove(self, guild: discord.Guild) -> None:
         if guild == None: return
         log.info(f"[Events] Removed from guild: {guild.name} ({guild.id})", extra={"loc": f"Shard {guild.shard_id}"})
+        self.bot.cache.unpin("configs", guild.id)
         if self.db.configs.exists(guild.id):
             self.db.cases.multi_delete({"guild": f"{guild.id}"})
             self.db.configs.delete(guild.id)
+            self.bot.rule_plans.invalidate(guild.id)
 
     
     @AutoModPluginBlueprint.listener()
@@ -377,6 +380,14 @@ class InternalPlugin(AutoModPluginBlueprint):
         self.bot.message_cache.insert(msg.guild, msg)
 
 
+    @AutoModPluginBlueprint.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
+        if payload.guild_id == None: return
+        for _id in payload.message_ids:
+            self.bot.message_cache.delete(payload.guild_id, _id)
+            if _id in self.bot.ignore_for_events: self.bot.ignore_for_events.remove(_id)
+
+
     @AutoModPluginBlueprint.listener()
     async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
         if payload.guild_id == None: return
@@ -513,7 +524,10 @@ class InternalPlugin(AutoModPluginBlueprint):
                 "_embed": embed
             })
         else:
+            locked = self.bot.raids.on_join(user, self.db.configs.get(user.guild.id, "raid_config"))
+
             self.bot.dispatch("join_role", user)
+            if locked: return # the raid log covers joins during a lockdown
             e = Embed(
                 None,
                 color=0x43b582,
@@ -532,6 +546,7 @@ class InternalPlugin(AutoModPluginBlueprint):
 
     @AutoModPluginBlueprint.listener()
     async def on_member_remove(self, user: discord.Member) -> None:
+        self.bot.permissions.invalidate_member(user.guild.id, user.id)
         await asyncio.sleep(0.3)
         if user.id in self.bot.ignore_for_events:
             return self.bot.ignore_for_events.remove(user.id)
@@ -576,6 +591,7 @@ class InternalPlugin(AutoModPluginBlueprint):
 
     @AutoModPluginBlueprint.listener()
     async def on_guild_role_delete(self, role: discord.Role) -> None:
+        self.bot.permissions.invalidate_guild(role.guild.id)
         embed = await self.server_log_embed(
             "role_deleted",
             role.guild,
@@ -590,6 +606,7 @@ class InternalPlugin(AutoModPluginBlueprint):
 
     @AutoModPluginBlueprint.listener()
     async def on_guild_role_update(self, b: discord.Role, a: discord.Role) -> None:
+        if b.permissions != a.permissions: self.bot.permissions.invalidate_guild(a.guild.id)
         roles, _ = self.get_ignored_roles_channels(a.guild)
         if a.id in roles: return
 
@@ -864,6 +881,7 @@ class InternalPlugin(AutoModPluginBlueprint):
 
     @AutoModPluginBlueprint.listener()
     async def on_member_update(self, b: discord.Member, a: discord.Member) -> None:
+        self.bot.permissions.invalidate_member(a.guild.id, a.id)
         if not a.guild.chunked: await self.bot.chunk_guild(a.guild)
 
         roles, _ = self.get_ignored_roles_channels(a.guild)
@@ -1036,6 +1054,81 @@ class InternalPlugin(AutoModPluginBlueprint):
         })
 
 
+    @AutoModPluginBlueprint.listener()
+    async def on_raid_start(self, guild: discord.Guild, joins: int, per: float, action: str) -> None:
+        e = Embed(
+            None,
+            color=0xf04a47,
+            description=self.locale.t(guild, "log_raid_start", _emote="WARN", joins=joins, per=round(per), action=action)
+        )
+        await self.log_processor.execute(guild, "raid", **{
+            "_embed": e
+        })
+
+
+    @AutoModPluginBlueprint.listener()
+    async def on_raid_end(self, guild: discord.Guild, summary: Dict[str, Union[int, str, Dict[str, int]]]) -> None:
+        e = Embed(
+            None,
+            color=0x43b582,
+            description=self.locale.t(
+                guild, 
+                "log_raid_end", 
+                _emote="YES", 
+                duration=summary["duration"], 
+                joined=summary["joined"], 
+                actioned=summary["actioned"], 
+                failed=summary["failed"], 
+                action=summary["action"],
+                ages="\n".join([f"> ``{k}`` → {v}" for k, v in summary["ages"].items()]) or "> -"
+            )
+        )
+        await self.log_processor.execute(guild, "raid", **{
+            "_embed": e
+        })
+
+
+    @AutoModPluginBlueprint.listener()
+    async def on_flood_start(self, guild: discord.Guild, channel: discord.abc.GuildChannel, scope: str, cfg: Dict[str, Union[int, str]]) -> None:
+        e = Embed(
+            None,
+            color=0xffdc5c,
+            description=self.locale.t(
+                guild, 
+                "log_flood_start", 
+                _emote="WARN", 
+                where=channel.mention if scope == "channel" else "the server",
+                rate=cfg["rate"], 
+                per=cfg["per"], 
+                action=cfg["action"]
+            )
+        )
+        await self.log_processor.execute(guild, "flood", **{
+            "_embed": e
+        })
+
+
+    @AutoModPluginBlueprint.listener()
+    async def on_flood_end(self, guild: discord.Guild, channel: discord.abc.GuildChannel, scope: str, summary: Dict[str, Union[int, str]]) -> None:
+        e = Embed(
+            None,
+            color=0x43b582,
+            description=self.locale.t(
+                guild, 
+                "log_flood_end", 
+                _emote="YES", 
+                where=channel.mention if scope == "channel" else "the server",
+                duration=summary["duration"], 
+                messages=summary["messages"], 
+                channels=summary["channels"],
+                action=summary["action"]
+            )
+        )
+        await self.log_processor.execute(guild, "flood", **{
+            "_embed": e
+        })
+
+
     @AutoModPluginBlueprint.listener()
     async def on_join_role(self, user: discord.Member) -> None:
         if user.guild == None: return
@@ -3,13 +3,14 @@
 import discord
 from discord.ext import commands
 
-from ...__obj__ import TypeHintedToolboxObject as Object
+from ...__obj__ import TypeHintedToolboxObject as Object, ConfigView
 from random import randint
 from typing import OrderedDict, List, Union, Literal
 
 from .. import AutoModPluginBlueprint, ShardedBotInstance
 from ...schemas import UserLevel
 from ...types import Embed, E
+from ...utils import XPEntry
 
 
 
@@ -24,39 +25,34 @@ class LevelPlugin(AutoModPluginBlueprint):
         self._cooldowns = []
 
 
-    def exists(self, config: Object, guild: discord.Guild, user: Union[discord.Member, discord.User], insert: bool = True) -> bool:
+    async def exists(self, config: Union[Object, ConfigView], guild: discord.Guild, user: Union[discord.Member, discord.User], insert: bool = True) -> bool:
         if not str(user.id) in config.users:
             if insert == True:
-                config.users.append(str(user.id))
-                self.db.configs.update(
+                cur = self.db.configs.get(guild.id, "lvl_sys")
+                await self.db.configs.update_async(
                     guild.id, 
                     "lvl_sys", 
                     {
-                        "enabled": config.enabled,
-                        "notif_mode": config.notif_mode,
-                        "users": config.users,
-                        "rewards": config.rewards,
-                        "reward_mode": config.reward_mode
+                        **cur,
+                        "users": [*cur.get("users", []), str(user.id)]
                     }
                 )
-                self.db.level.insert(UserLevel(guild, user))
+                await self.db.level.insert_async(UserLevel(guild, user))
             return False
         else:
             return True
 
 
-    def get_user_data(self, guild: discord.Guild, user: Union[discord.Member, discord.User]) -> Object:
-        return Object(self.db.level.get_doc(f"{guild.id}-{user.id}"))
+    async def get_user_data(self, guild: discord.Guild, user: Union[discord.Member, discord.User]) -> XPEntry:
+        return await self.bot.xp_ledger.get(f"{guild.id}-{user.id}")
 
 
     def update_user_data(self, guild: discord.Guild, user: Union[discord.Member,discord.User], xp: int, lvl: int) -> None:
-        self.db.level.multi_update(f"{guild.id}-{user.id}", {
-            "xp": xp,
-            "lvl": lvl
-        })
+        self.bot.xp_ledger.set(f"{guild.id}-{user.id}", xp, lvl) # written in batches
 
 
     def delete_entry(self, entry: Object) -> None:
+        self.bot.xp_ledger.drop(entry.id)
         self.db.level.delete(entry.id)
         cfg = self.db.configs.get(entry.id.split("-")[0], "lvl_sys")
         if cfg != None:
@@ -133,7 +129,7 @@ class LevelPlugin(AutoModPluginBlueprint):
         )
 
 
-    async def add_reward(self, guild: discord.Guild, user: discord.Member, level: int, config: Object) -> None:
+    async def add_reward(self, guild: discord.Guild, user: discord.Member, level: int, config: Union[Object, ConfigView]) -> None:
         if not hasattr(config, "rewards"):
             cur = self.db.configs.get(guild.id, "lvl_sys")
             for k, v in {"rewards": {}, "reward_mode": "stack"}.items():
@@ -185,9 +181,12 @@ class LevelPlugin(AutoModPluginBlueprint):
         if not await self.is_eligible_message(msg): return
         if msg.author.bot == True: return # safety
         
-        config = Object(self.db.configs.get(msg.guild.id, "lvl_sys"))
+        view = self.db.configs.get_view(msg.guild.id)
+        if view == None: return
+
+        config = view.lvl_sys
         if config.enabled == False: return
-        if not self.exists(
+        if not await self.exists(
             config, 
             msg.guild, 
             msg.author
@@ -197,12 +196,12 @@ class LevelPlugin(AutoModPluginBlueprint):
         if pid in self._processing: return
         else: self._processing.append(pid)
 
-        data = self.get_user_data(
+        data = await self.get_user_data(
             msg.guild, 
             msg.author
         )
 
-        if len(msg.content.split(" ")) < 5:
+        if len(self.bot.message_features.get(msg).words) < 5:
             xp = randint(1, 5)
         else:
             xp = randint(5, 10)
@@ -317,7 +316,7 @@ class LevelPlugin(AutoModPluginBlueprint):
         cmd = f"</lvlsys:{self.bot.internal_cmd_store.get('lvlsys')}>"
         if config.enabled == False: return await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "lvl_sys_disabled", _emote="NO", cmd=cmd), 0), ephemeral=True)
 
-        if self.exists(config, ctx.guild, user):
+        if await self.exists(config, ctx.guild, user):
             self.update_user_data(ctx.guild, user, 1, 0)
         await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "reset_user", _emote="YES"), 1))
 
@@ -475,14 +474,14 @@ class LevelPlugin(AutoModPluginBlueprint):
         cmd = f"</lvlsys:{self.bot.internal_cmd_store.get('lvlsys')}>"
         if config.enabled == False: return await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "lvl_sys_disabled", _emote="NO", cmd=cmd), 0), ephemeral=True)
 
-        if not self.exists(
+        if not await self.exists(
             config, 
             ctx.guild, 
             user,
             insert=False
         ): return await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "not_ranked", _emote="NO"), 0), ephemeral=True)
 
-        data = self.get_user_data(
+        data = await self.get_user_data(
             ctx.guild, 
             user
         )
@@ -505,6 +504,7 @@ class LevelPlugin(AutoModPluginBlueprint):
             url=user.display_avatar
         )
         
+        await self.bot.xp_ledger.flush()
         data = sorted(list(self.db.level.find({"guild": f"{ctx.guild.id}"})), key=lambda e: e["xp"], reverse=True)
         e.set_footer(
             text="Your rank: #{}".format(
@@ -533,6 +533,7 @@ class LevelPlugin(AutoModPluginBlueprint):
 
         await ctx.response.defer(thinking=True)
 
+        await self.bot.xp_ledger.flush()
         users = self.user_set([Object(x) for x in self.db.level.find({"guild": f"{ctx.guild.id}"})][:25])
         data = sorted(set(users), key=lambda e: e.xp, reverse=True)
 
@@ -199,7 +199,7 @@ class ModerationPlugin(WarnPlugin):
                 "mod_id": ctx.user.id,
                 "reason": reason,
                 "channel_id": ctx.channel.id,
-                "case": self.action_processor.new_case(action, ctx, ctx.user, user, reason)
+                "case": await self.action_processor.new_case(action, ctx, ctx.user, user, reason)
             })
             await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, ACTIONS[action]["log"], _emote="YES", user=user, reason=reason), 1))
 
@@ -265,7 +265,7 @@ class ModerationPlugin(WarnPlugin):
                     "mod_id": ctx.user.id,
                     "reason": reason,
                     "channel_id": ctx.channel.id,
-                    "case": self.action_processor.new_case("unban", ctx, ctx.user, user, reason)
+                    "case": await self.action_processor.new_case("unban", ctx, ctx.user, user, reason)
                 })
 
                 await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "unbanned", _emote="YES", user=user, reason=reason), 1))
@@ -398,7 +398,7 @@ class ModerationPlugin(WarnPlugin):
                             "until": f"<t:{round(until.timestamp())}>",
                             "reason": reason,
                             "channel_id": ctx.channel.id,
-                            "case": self.action_processor.new_case("tempban extended", ctx, ctx.user, user, reason, until=until)
+                            "case": await self.action_processor.new_case("tempban extended", ctx, ctx.user, user, reason, until=until)
                         })
                         return
 
@@ -462,7 +462,7 @@ class ModerationPlugin(WarnPlugin):
                                 "user_id": user.id,
                                 "until": f"<t:{round(until.timestamp())}>",
                                 "channel_id": ctx.channel.id,
-                                "case": self.action_processor.new_case("tempban", ctx, ctx.user, user, reason, until=until),
+                                "case": await self.action_processor.new_case("tempban", ctx, ctx.user, user, reason, until=until),
                                 "reason": reason
                             }) 
 
@@ -566,7 +566,7 @@ class ModerationPlugin(WarnPlugin):
                         "reason": reason,
                         "until": f"<t:{round(until.timestamp())}>",
                         "channel_id": ctx.channel.id,
-                        "case": self.action_processor.new_case("mute extended", ctx, ctx.user, user, reason, until=until)
+                        "case": await self.action_processor.new_case("mute extended", ctx, ctx.user, user, reason, until=until)
                     })
                     self.bot.handle_timeout(True, ctx.guild, user, until.isoformat())
                     return
@@ -632,7 +632,7 @@ class ModerationPlugin(WarnPlugin):
                             "reason": reason,
                             "until": f"<t:{round(until.timestamp())}>",
                             "channel_id": ctx.channel.id,
-                            "case": self.action_processor.new_case("mute", ctx, ctx.user, user, reason, until=until)
+                            "case": await self.action_processor.new_case("mute", ctx, ctx.user, user, reason, until=until)
                         }) 
 
                         await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "muted", _emote="YES", user=user, until=f"<t:{round(until.timestamp())}>", reason=reason), 1))
@@ -674,7 +674,7 @@ class ModerationPlugin(WarnPlugin):
                 "user": user,
                 "user_id": user.id,
                 "channel_id": ctx.channel.id,
-                "case": self.action_processor.new_case("unmute", ctx, ctx.user, user, "Manual unmute")
+                "case": await self.action_processor.new_case("unmute", ctx, ctx.user, user, "Manual unmute")
             }) 
 
             await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "unmuted", _emote="YES", user=user), 1))
@@ -24,17 +24,17 @@ class AutoResponderPlugin(AutoModPluginBlueprint):
         super().__init__(bot)
         self._r = {}
         self._position_funcs = {
-            "startswith": lambda msg, triggers: (
-                msg.split(" ")[0].lower() in [_.lower() for _ in triggers]
+            "startswith": lambda feats, triggers: (
+                len(feats.words) > 0 and feats.words[0] in [_.lower() for _ in triggers]
             ),
-            "endswith": lambda msg, triggers: (
-                msg.split(" ")[-1].lower() in [_.lower() for _ in triggers]
+            "endswith": lambda feats, triggers: (
+                len(feats.words) > 0 and feats.words[-1] in [_.lower() for _ in triggers]
             ),
-            "contains": lambda msg, triggers: (
-                any(trigger.lower() in msg.lower() for trigger in triggers)
+            "contains": lambda feats, triggers: (
+                any(trigger.lower() in feats.lower or trigger.lower() in feats.normalized for trigger in triggers)
             ),
-            "regex": lambda msg, regex: (
-                re.search(re.compile(regex, re.IGNORECASE), msg)
+            "regex": lambda feats, regex: (
+                re.search(re.compile(regex, re.IGNORECASE), feats.content)
             )
         }
         self.bot.loop.create_task(self.cache_responders())
@@ -119,11 +119,7 @@ class AutoResponderPlugin(AutoModPluginBlueprint):
     def update_uses(self, _id: str) -> None:
         self.bot.used_customs += 1
         self.bot.update_custom_stats()
-        cur = self.db.responders.get(_id, "uses")
-        if cur == None:
-            self.db.responders.update(_id, "uses", 1)
-        else:
-            self.db.responders.update(_id, "uses", cur+1)
+        self.bot.counters.inc("responders", _id, "uses")
 
 
     def validate_name(self, name: str) -> bool:
@@ -404,13 +400,14 @@ class AutoResponderPlugin(AutoModPluginBlueprint):
         if not msg.guild.chunked:
             await msg.guild.chunk(cache=True)
         
+        feats = self.bot.message_features.get(msg)
         for name, obj in self.get_responders(msg.guild).items():
             if obj.get("ignore_mods", True) == True:
                 if self.is_mod(msg.author): continue
             if obj.get("disabled", False) == True: 
                 continue
             
-            if (self._position_funcs[obj["position"]])(msg.content, obj["trigger"]) == True:
+            if (self._position_funcs[obj["position"]])(feats, obj["trigger"]) == True:
                 content = str(obj["content"])
                 
                 for k, v in {
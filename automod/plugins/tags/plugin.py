@@ -168,11 +168,7 @@ class TagsPlugin(AutoResponderPlugin):
     def update_uses(self, _id: str) -> None:
         self.bot.used_customs += 1
         self.bot.update_custom_stats()
-        cur = self.db.tags.get(_id, "uses")
-        if cur == None:
-            self.db.tags.update(_id, "uses", 1)
-        else:
-            self.db.tags.update(_id, "uses", cur+1)
+        self.bot.counters.inc("tags", _id, "uses")
 
 
     def validate_name(self, name: str) -> bool:
@@ -387,6 +383,7 @@ class TagsPlugin(AutoResponderPlugin):
                 await ctx.response.send_message(embed=E(self.locale.t(ctx.guild, "tag_doesnt_exists", _emote="NO"), 0), ephemeral=True)
             else:
                 data = Object(self.db.tags.get_doc(f"{ctx.guild.id}-{name}"))
+                uses = data.uses + self.bot.counters.pending("tags", f"{ctx.guild.id}-{name}", "uses")
                 y = self.bot.emotes.get("YES")
                 n = self.bot.emotes.get("NO")
 
@@ -413,7 +410,7 @@ class TagsPlugin(AutoResponderPlugin):
                     e.blank_field(True, 6),
                     {
                         "name": "Uses",
-                        "value": f"{data.uses}",
+                        "value": f"{uses}",
                         "inline": True
                     },
                     {
@@ -427,7 +427,7 @@ class UtilityPlugin(AutoModPluginBlueprint):
         if not hasattr(msg.channel, "slowmode_delay"): return
 
         _id = f"{msg.guild.id}-{msg.channel.id}"
-        if not self.db.slowmodes.exists(_id): 
+        if not await self.db.slowmodes.exists_async(_id): 
             return
         else:
             data = Object(self.db.slowmodes.get_doc(_id))
@@ -441,22 +441,16 @@ class UtilityPlugin(AutoModPluginBlueprint):
                 needs_update = True
             else:
                 if data.users[f"{msg.author.id}"]["next_allowed_chat"] > datetime.datetime.utcnow():
-                    try:
-                        await msg.delete()
-                    except Exception:
-                        pass
-                    else:
-                        self.bot.ignore_for_events.append(msg.id)
-                    finally:
-                        data.users.update({
-                            f"{msg.author.id}": {
-                                "next_allowed_chat": datetime.datetime.utcnow() + datetime.timedelta(seconds=int(data.time))
-                            }
-                        })
-                        needs_update = True
+                    self.bot.deletions.queue(msg.channel, [msg.id])
+                    data.users.update({
+                        f"{msg.author.id}": {
+                            "next_allowed_chat": datetime.datetime.utcnow() + datetime.timedelta(seconds=int(data.time))
+                        }
+                    })
+                    needs_update = True
 
             if needs_update == True:
-                self.db.slowmodes.update(_id, "users", data.users)
+                await self.db.slowmodes.update_async(_id, "users", data.users)
 
     
     @AutoModPluginBlueprint.listener(name="on_message")
@@ -465,6 +459,7 @@ class UtilityPlugin(AutoModPluginBlueprint):
         guild_highlights = self.get_highlights_from_msg(msg)
 
         if len(guild_highlights) < 1: return
+        feats = self.bot.message_features.get(msg)
         for uid, phrases in guild_highlights.items():
             user: Optional[discord.Member] = msg.guild.get_member(int(uid))
             if (user != None \
@@ -473,7 +468,7 @@ class UtilityPlugin(AutoModPluginBlueprint):
                 and str(msg.author.id) != str(self.bot.user.id) \
             ):
                 for phrase in phrases:
-                    if phrase in msg.content.lower():
+                    if phrase in feats.lower or phrase in feats.normalized:
                         e = Embed(
                             None,
                             title=f"Highlight in {msg.guild.name}",
@@ -61,7 +61,7 @@ def GuildConfig(guild: discord.Guild, prefix: str) -> Dict[str, Union[str, int,
             "warns": 0,
         },
         "raid_config": {
-            "enabled": True
+            "enabled": False
         },
         
         "reaction_roles": {},
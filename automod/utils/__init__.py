@@ -1,4 +1,21 @@
 from .emotes import Emotes
 from .i18n import Translator
 from .log import LogQueue
-from .cache import MessageCache
\ No newline at end of file
+from .cache import MessageCache
+from .rules import RulePlanCache, RulePlan, parse_filter, parse_regex
+from .matcher import FilterMatcher
+from .domains import DomainIndex
+from .sandbox import RegexSandbox, is_catastrophic
+from .features import MessageFeatureCache, MessageFeatures, sanitize, ZALGO_DENSITY, ZALGO_MAX_STACK
+from .normalize import normalize
+from .invites import InviteResolver
+from .spam import SpamTracker
+from .budgets import UsageBudgets, BUDGET_WINDOW
+from .flood import FloodDetector, TokenBuckets, get_flood_config, FLOOD_SCOPES
+from .copypasta import CopypastaDetector, COPYPASTA_WINDOW
+from .raid import RaidDetector, get_raid_config
+from .deletion import DeletionBatcher
+from .permissions import PermissionCache
+from .counters import CounterAggregator
+from .xp import XPLedger, XPEntry
+from .metrics import RuleMetrics, RuleTimer
\ No newline at end of file
@@ -0,0 +1,79 @@
+# type: ignore
+
+from array import array
+from collections import OrderedDict
+from typing import Tuple
+
+
+
+BUDGET_WINDOW = 60 # seconds
+RESOLUTION = 12 # buckets per window
+BUDGET_KINDS = ("mentions", "emotes", "attachments", "newlines")
+MAX_USERS = 50000
+EVICT_PER_CALL = 8
+
+_WIDTH = BUDGET_WINDOW / RESOLUTION
+_KINDS = len(BUDGET_KINDS)
+
+
+class _UserBudget:
+    __slots__ = ("counts", "stamps", "last")
+
+    def __init__(self) -> None:
+        self.counts = array("I", [0] * (RESOLUTION * _KINDS))
+        self.stamps = array("q", [-1] * RESOLUTION)
+        self.last = 0.0
+
+
+class UsageBudgets:
+    """
+    Per ``(guild, user)`` totals of mentions, emotes, attachments and newlines over the last ``BUDGET_WINDOW``
+    seconds, kept in a small ring of time buckets. Idle users are evicted and the amount of users is capped.
+    """
+    def __init__(self) -> None:
+        self.__store: OrderedDict[Tuple[int, int], _UserBudget] = OrderedDict()
+
+
+    def _evict(self, now: float) -> None:
+        for _ in range(EVICT_PER_CALL):
+            if len(self.__store) < 1: break
+            key, budget = next(iter(self.__store.items()))
+            if now - budget.last < BUDGET_WINDOW and len(self.__store) <= MAX_USERS: break
+            del self.__store[key]
+
+
+    def add(self, guild_id: int, user_id: int, now: float, amounts: Tuple[int, int, int, int]) -> Tuple[int, ...]:
+        """Records the amounts of a message (in ``BUDGET_KINDS`` order) and returns the totals within the window"""
+        self._evict(now)
+
+        key = (guild_id, user_id)
+        budget = self.__store.get(key, None)
+        if budget == None:
+            budget = _UserBudget()
+            self.__store[key] = budget
+        else:
+            self.__store.move_to_end(key)
+        budget.last = now
+
+        counts, stamps = budget.counts, budget.stamps
+        idx = int(now // _WIDTH)
+        slot = idx % RESOLUTION
+        base = slot * _KINDS
+        if stamps[slot] != idx:
+            stamps[slot] = idx
+            for k in range(_KINDS): counts[base + k] = 0
+        for k, v in enumerate(amounts): counts[base + k] += v
+
+        totals = [0] * _KINDS
+        for b, stamp in enumerate(stamps):
+            if idx - stamp < RESOLUTION:
+                for k in range(_KINDS): totals[k] += counts[b * _KINDS + k]
+        return tuple(totals)
+
+
+    def reset(self, guild_id: int, user_id: int) -> None:
+        self.__store.pop((guild_id, user_id), None)
+
+
+    def __len__(self) -> int:
+        return len(self.__store)
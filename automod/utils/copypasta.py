@@ -0,0 +1,151 @@
+# type: ignore
+
+from collections import deque, Counter, OrderedDict
+from hashlib import blake2b
+from typing import Optional, Dict, List, Tuple
+
+
+
+SHINGLE_SIZE = 2 # words per shingle
+MAX_SHINGLES = 128
+MIN_LENGTH = 30 # shorter messages ("gm", "lol") are way too common to be fingerprinted
+MAX_DISTANCE = 12 # differing bits that still count as the same content, unrelated messages are ~30 apart
+BANDS = 8 # 8x8 bits, fingerprints within 7 bits always share a band, within MAX_DISTANCE most of the time
+MAX_ENTRIES_PER_GUILD = 2000 # also bounds the clusters, and with that the band index
+EVICT_PER_CALL = 8 # idle guilds dropped per message at most
+COPYPASTA_WINDOW = 60 # seconds, default for the rule
+
+
+def _hash64(s: str) -> int:
+    return int.from_bytes(blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(words: List[str]) -> int:
+    if len(words) < SHINGLE_SIZE:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+    # count the set bits per position column-wise, that keeps the python level loop at 64 iterations
+    rows = [format(_hash64(sh), "064b") for sh in shingles[:MAX_SHINGLES]]
+    half = len(rows) / 2
+
+    fp = 0
+    for col in map("".join, zip(*rows)):
+        fp = (fp << 1) | (col.count("1") > half)
+    return fp
+
+
+def _bands(fp: int) -> List[Tuple[int, int]]:
+    width = 64 // BANDS
+    mask = (1 << width) - 1
+    return [(b, (fp >> (b * width)) & mask) for b in range(BANDS)]
+
+
+class _Cluster:
+    __slots__ = ("fp", "authors", "channels", "size")
+
+    def __init__(self, fp: int) -> None:
+        self.fp = fp
+        self.authors = Counter()
+        self.channels = Counter()
+        self.size = 0
+
+
+class _GuildWindow:
+    def __init__(self) -> None:
+        self.entries = deque() # (time, cluster_id, author_id, channel_id), oldest first
+        self.clusters: Dict[int, _Cluster] = {}
+        self.index: Dict[Tuple[int, int], List[int]] = {}
+        self.next_id = 0
+        self.window = float(COPYPASTA_WINDOW)
+
+
+    def _expire(self, cutoff: float) -> None:
+        while self.entries and (self.entries[0][0] < cutoff or len(self.entries) > MAX_ENTRIES_PER_GUILD):
+            _, cid, author, channel = self.entries.popleft()
+            cluster = self.clusters[cid]
+            cluster.size -= 1
+            cluster.authors[author] -= 1
+            if cluster.authors[author] < 1: del cluster.authors[author]
+            cluster.channels[channel] -= 1
+            if cluster.channels[channel] < 1: del cluster.channels[channel]
+
+            if cluster.size < 1:
+                del self.clusters[cid]
+                for band in _bands(cluster.fp):
+                    ids = self.index.get(band, None)
+                    if ids != None and cid in ids:
+                        ids.remove(cid)
+                        if len(ids) < 1: del self.index[band]
+
+
+    def _find(self, fp: int) -> Optional[int]:
+        for band in _bands(fp):
+            for cid in self.index.get(band, ()):
+                if bin(self.clusters[cid].fp ^ fp).count("1") <= MAX_DISTANCE:
+                    return cid
+        return None
+
+
+    def add(self, fp: int, author_id: int, channel_id: int, now: float, window: float) -> _Cluster:
+        self.window = window
+        self._expire(now - window)
+
+        cid = self._find(fp)
+        if cid == None:
+            cid = self.next_id
+            self.next_id += 1
+            self.clusters[cid] = _Cluster(fp)
+            for band in _bands(fp):
+                # clusters only leave the index once all their messages expired, so later copies still find them
+                self.index.setdefault(band, []).append(cid)
+
+        cluster = self.clusters[cid]
+        cluster.size += 1
+        cluster.authors[author_id] += 1
+        cluster.channels[channel_id] += 1
+        self.entries.append((now, cid, author_id, channel_id))
+        return cluster
+
+
+class CopypastaDetector:
+    """
+    Keeps simhash fingerprints of recent messages per guild. Near-identical messages are grouped together,
+    so the amount of distinct authors and channels for some content is known without scanning the window.
+    Guilds whose messages all left the window are dropped.
+    """
+    def __init__(self) -> None:
+        self.__store: OrderedDict[int, _GuildWindow] = OrderedDict() # least recently active first
+
+
+    def _evict(self, now: float) -> None:
+        for _ in range(EVICT_PER_CALL):
+            if len(self.__store) < 1: break
+            guild_id, guild = next(iter(self.__store.items()))
+            if guild.entries and now - guild.entries[-1][0] <= guild.window: break
+            del self.__store[guild_id]
+
+
+    def check(self, guild_id: int, author_id: int, channel_id: int, content: str, words: List[str], now: float, window: float) -> Optional[Tuple[int, int]]:
+        """Records the message and returns ``(authors, channels)`` that posted the same content within ``window`` seconds"""
+        if len(content) < MIN_LENGTH: return None
+        self._evict(now)
+
+        guild = self.__store.get(guild_id, None)
+        if guild == None:
+            guild = _GuildWindow()
+            self.__store[guild_id] = guild
+        else:
+            self.__store.move_to_end(guild_id)
+
+        cluster = guild.add(simhash(words), author_id, channel_id, now, window)
+        return len(cluster.authors), len(cluster.channels)
+
+
+    def reset(self, guild_id: int) -> None:
+        self.__store.pop(guild_id, None)
+
+
+    def __len__(self) -> int:
+        return sum(len(x.entries) for x in self.__store.values())
@@ -0,0 +1,98 @@
+# type: ignore
+
+import asyncio
+from pymongo import UpdateOne
+from typing import Optional, Dict, List, Tuple
+import os
+import logging; log = logging.getLogger(__name__)
+
+
+
+FLUSH_INTERVAL = 30 # seconds
+
+
+class CounterAggregator:
+    """
+    Write-behind counters for usage statistics. Increments are summed per ``(collection, id, field)`` and written
+    every ``FLUSH_INTERVAL`` seconds with one unordered ``$inc`` bulk write per collection, instead of a read and
+    a write per increment. Reads add ``pending()`` to the stored value, everything left is flushed on shutdown.
+    """
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.__pending: Dict[Tuple[str, str, str], List[int]] = {} # -> [amount, upsert]
+        self.__flushing: Dict[Tuple[str, str, str], int] = {} # being written right now, still counts for reads
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.written = 0
+
+
+    def inc(self, collection: str, _id: str, field: str, amount: int = 1, upsert: bool = False) -> None:
+        """Adds ``amount`` to the field, ``upsert`` creates the document if it doesn't exist by then"""
+        key = (collection, f"{_id}", field)
+        entry = self.__pending.get(key, None)
+        if entry == None:
+            self.__pending[key] = [amount, upsert]
+        else:
+            entry[0] += amount
+            entry[1] = entry[1] or upsert
+
+        if self._task == None or self._task.done():
+            self._task = self.bot.loop.create_task(self._flush_loop())
+
+
+    def pending(self, collection: str, _id: str, field: str) -> int:
+        """Increments that haven't been written yet"""
+        key = (collection, f"{_id}", field)
+        entry = self.__pending.get(key, None)
+        return (entry[0] if entry != None else 0) + self.__flushing.get(key, 0)
+
+
+    async def _flush_loop(self) -> None:
+        while len(self.__pending) > 0:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            await self.flush()
+
+
+    async def flush(self) -> None:
+        """Writes all pending increments right away"""
+        pending = self.__pending
+        self.__pending = {}
+
+        by_collection: Dict[str, List[Tuple[str, str, int, bool]]] = {}
+        for (collection, _id, field), (amount, upsert) in pending.items():
+            by_collection.setdefault(collection, []).append((_id, field, amount, upsert))
+            self.__flushing[(collection, _id, field)] = self.__flushing.get((collection, _id, field), 0) + amount
+
+        for collection, entries in by_collection.items():
+            col = getattr(self.bot.db, collection)
+            self.flushes += 1
+            try:
+                await self.bot.db.io.run(
+                    collection,
+                    col.bulk_write,
+                    [UpdateOne({"id": _id}, {"$inc": {field: amount}}, upsert=upsert) for _id, field, amount, upsert in entries],
+                    ordered=False
+                )
+            except Exception as ex:
+                self._done(collection, entries)
+                log.warn(f"[Counters] Failed to write {len(entries)} counter(s) to {collection} - {ex}", extra={"loc": f"PID {os.getpid()}"})
+                for _id, field, amount, upsert in entries: self.inc(collection, _id, field, amount, upsert) # retried with the next flush
+            else:
+                self._done(collection, entries)
+                self.written += len(entries)
+                for _id, field, amount, _ in entries:
+                    if col.cached:
+                        doc = getattr(self.bot.cache, collection).peek(_id) # evicted ones are read again anyway
+                        if doc != None: doc[field] = (doc.get(field, None) or 0) + amount
+                    col._bump(_id, [field])
+
+
+    def _done(self, collection: str, entries: List[Tuple[str, str, int, bool]]) -> None:
+        for _id, field, amount, _ in entries:
+            key = (collection, _id, field)
+            left = self.__flushing.pop(key, 0) - amount
+            if left != 0: self.__flushing[key] = left
+
+
+    def __len__(self) -> int:
+        return len(self.__pending)
@@ -0,0 +1,97 @@
+# type: ignore
+
+import discord
+
+import asyncio
+import time
+from typing import Optional, Dict, List, Tuple, Any
+import os
+import logging; log = logging.getLogger(__name__)
+
+
+
+FLUSH_INTERVAL = 0.3 # seconds ids are collected per channel before deleting them
+CHUNK_SIZE = 100 # most messages one bulk delete accepts
+MAX_BULK_AGE = 14 * 86400 - 60 # bulk deletes reject messages older than 14 days, keep some margin
+
+
+class DeletionBatcher:
+    """
+    Collects messages that should be deleted (automod, antispam, slowmode) per channel and deletes them
+    every ``FLUSH_INTERVAL`` seconds with one ``delete_messages`` call per ``CHUNK_SIZE`` messages, instead of
+    one request per message. Only messages too old for bulk deletes are deleted one by one.
+    """
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.__pending: Dict[int, Tuple[Any, List[int]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.deleted = 0
+        self.requests = 0
+
+
+    def queue(self, channel: discord.abc.Messageable, msg_ids: List[int]) -> None:
+        if channel == None or len(msg_ids) < 1: return
+
+        entry = self.__pending.get(channel.id, None)
+        if entry == None:
+            entry = (channel, [])
+            self.__pending[channel.id] = entry
+
+        for _id in msg_ids:
+            if _id in entry[1]: continue
+            entry[1].append(_id)
+            self.bot.ignore_for_events.append(_id) # no message log for deletions done by automod
+
+        if self._task == None or self._task.done():
+            self._task = self.bot.loop.create_task(self._flush_loop())
+
+
+    async def _flush_loop(self) -> None:
+        while len(self.__pending) > 0:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            pending = self.__pending
+            self.__pending = {}
+            await asyncio.gather(*[self._flush(channel, ids) for channel, ids in pending.values()])
+
+
+    async def flush(self) -> None:
+        """Deletes everything that's queued right away"""
+        pending = self.__pending
+        self.__pending = {}
+        await asyncio.gather(*[self._flush(channel, ids) for channel, ids in pending.values()])
+
+
+    async def _flush(self, channel: discord.abc.Messageable, ids: List[int]) -> None:
+        cutoff = time.time() - MAX_BULK_AGE
+        recent = [x for x in ids if discord.utils.snowflake_time(x).timestamp() > cutoff]
+        old = [x for x in ids if not x in recent]
+
+        for i in range(0, len(recent), CHUNK_SIZE):
+            chunk = recent[i:i + CHUNK_SIZE]
+            self.requests += 1
+            try:
+                await channel.delete_messages([discord.Object(id=x) for x in chunk])
+            except discord.HTTPException as ex:
+                if not isinstance(ex, discord.NotFound):
+                    log.warn(f"[Deletions] Failed to delete {len(chunk)} message(s) - {ex} (channel: {channel.id})", extra={"loc": f"PID {os.getpid()}"})
+                self._unignore(chunk)
+            else:
+                self.deleted += len(chunk)
+
+        for _id in old:
+            self.requests += 1
+            try:
+                await channel.get_partial_message(_id).delete()
+            except discord.HTTPException:
+                self._unignore([_id])
+            else:
+                self.deleted += 1
+
+
+    def _unignore(self, ids: List[int]) -> None:
+        for _id in ids:
+            if _id in self.bot.ignore_for_events: self.bot.ignore_for_events.remove(_id)
+
+
+    def __len__(self) -> int:
+        return sum(len(x[1]) for x in self.__pending.values())
@@ -0,0 +1,52 @@
+# type: ignore
+
+from urllib.parse import urlparse
+from typing import Optional, List, Iterable
+
+
+
+def normalize_host(entry: str) -> Optional[str]:
+    """Turns a list entry (``evil.com``, ``https://www.evil.com/x``, ``*.evil.com``) into a bare hostname"""
+    entry = str(entry).strip().lower()
+    if "://" in entry:
+        entry = urlparse(entry).hostname or ""
+    entry = entry.split("/")[0].split(":")[0].strip(".")
+
+    if entry.startswith("*."): entry = entry[2:]
+    if entry.startswith("www."): entry = entry[4:]
+    return entry if entry != "" else None
+
+
+class DomainIndex:
+    """
+    Hashed suffix set over the hosts of a link list. A host matches if it or any of its parent domains is
+    in the list (``cdn.evil.com`` matches ``evil.com``), a lookup costs one set check per label.
+    """
+    __slots__ = ("_hosts",)
+
+    def __init__(self, entries: Optional[Iterable[str]]) -> None:
+        self._hosts = frozenset(x for x in map(normalize_host, entries or []) if x != None)
+
+
+    def match(self, host: Optional[str]) -> Optional[str]:
+        """Returns the list entry ``host`` falls under, if any"""
+        if host == None or len(self._hosts) < 1: return None
+
+        host = host.lower().rstrip(".")
+        while True:
+            if host in self._hosts: return host
+            dot = host.find(".")
+            if dot < 0: return None
+            host = host[dot + 1:]
+
+
+    def __contains__(self, host: Optional[str]) -> bool:
+        return self.match(host) != None
+
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+
+    def hosts(self) -> List[str]:
+        return sorted(self._hosts)
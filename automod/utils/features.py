@@ -0,0 +1,147 @@
+# type: ignore
+
+import re
+from collections import OrderedDict, Counter
+from urllib.parse import urlparse
+from typing import Optional, List
+
+from .normalize import normalize, COMBINING_RANGES
+
+
+
+INVITE_RE = re.compile(
+    r"(?:https?://)?(?:www\.)?(?:discord(?:\.| |\[?\(?\"?'?dot'?\"?\)?\]?)?(?:gg|io|me|li)|discord(?:app)?\.com/invite)/+((?:(?!https?)[\w\d-])+)"
+)
+
+
+LINK_RE = re.compile(
+    r"((?:https?://)[a-z0-9]+(?:[-._][a-z0-9]+)*\.[a-z]{2,5}(?::[0-9]{1,5})?(?:/[^ \n<>]*)?)", 
+    re.IGNORECASE
+)
+
+
+MENTION_RE = re.compile(
+    r"<@[!&]?\d+>"
+)
+
+
+EMOTE_RE = re.compile(
+    r"<(a?):([^: \n]+):([0-9]{15,20})>"
+)
+
+
+# All token types in one alternation, so the content only has to be scanned once
+TOKEN_RE = re.compile(
+    r"(?P<invite>" + INVITE_RE.pattern.replace("((?:(?!https?)", "(?P<code>(?:(?!https?)", 1) + r")"
+    r"|(?P<link>" + LINK_RE.pattern[1:-1] + r")"
+    r"|(?P<mention>" + MENTION_RE.pattern + r")"
+    r"|(?P<emote>" + EMOTE_RE.pattern + r")",
+    re.IGNORECASE
+)
+
+
+ZALGO_DENSITY = 0.8 # marks per base character, default for the rule
+ZALGO_MAX_STACK = 4 # marks on a single character, accented text never gets close
+
+
+_ZALGO_TABLE = {c: None for start, end in COMBINING_RANGES for c in range(start, end + 1)}
+
+
+ZALGO_RE = re.compile(
+    "[" + "".join(f"{chr(start)}-{chr(end)}" for start, end in COMBINING_RANGES) + "]+"
+)
+
+
+ILLEGAL_CHARS = [
+    "­", # soft hyphen
+    "​", # zero width space
+    "\\"
+]
+
+
+_ILLEGAL_TABLE = str.maketrans("", "", "".join(ILLEGAL_CHARS))
+
+
+def sanitize(content: str) -> str:
+    return content.translate(_ILLEGAL_TABLE)
+
+
+class MessageFeatures:
+    """
+    Everything the message listeners look at, extracted once per message (and per edit). ``normalized`` is the
+    lowercase content with lookalikes, leetspeak and separated letters undone (see ``normalize()``), computed
+    on first use
+    """
+    def __init__(self, content: str, attachments: int = 0) -> None:
+        self.content = content
+        self.clean = sanitize(content)
+        self.lower = self.clean.lower()
+        self._normalized: Optional[str] = None
+        self.words = self.lower.split()
+        self.word_counts = Counter(self.words)
+        self.attachments = attachments
+
+        self.links: List[str] = []
+        self.invites: List[str] = []
+        self.mentions = 0
+        self.emotes = 0
+        for m in TOKEN_RE.finditer(self.clean):
+            kind = m.lastgroup
+            if kind == "invite" or kind == "code":
+                self.invites.append(m.group("code"))
+                if m.group().lower().startswith("http"): self.links.append(m.group())
+            elif kind == "link":
+                self.links.append(m.group())
+                self.invites.extend(INVITE_RE.findall(m.group())) # e.g. redirects to an invite
+            elif kind == "mention":
+                self.mentions += 1
+            else:
+                self.emotes += 1
+        self.hosts = [urlparse(x).hostname for x in self.links]
+
+        self.length = len(self.clean)
+        self.lines = self.clean.count("\n") + 1
+        self.caps = sum(map(str.isupper, self.clean))
+        self.caps_ratio = (self.caps / self.length) if self.length > 0 else 0.0
+
+        self.zalgo = self.length - len(self.clean.translate(_ZALGO_TABLE))
+        self.zalgo_density = 0.0
+        self.zalgo_stack = 0
+        if self.zalgo > 0:
+            base = self.length - self.zalgo - sum(map(str.isspace, self.clean))
+            self.zalgo_density = self.zalgo / max(base, 1)
+            self.zalgo_stack = max(len(x) for x in ZALGO_RE.findall(self.clean))
+
+
+    @property
+    def normalized(self) -> str:
+        if self._normalized == None: self._normalized = normalize(self.clean)
+        return self._normalized
+
+
+class MessageFeatureCache:
+    def __init__(self) -> None:
+        self.__store = OrderedDict()
+        self._MAX_CACHE_SIZE = 10000
+
+
+    def get(self, msg) -> MessageFeatures:
+        """Features of the current message content, computed on first use"""
+        f = self.__store.get(msg.id, None)
+        if f == None or f.content != msg.content:
+            f = MessageFeatures(msg.content, len(msg.attachments))
+            self.__store[msg.id] = f
+            if len(self.__store) > self._MAX_CACHE_SIZE: self.__store.popitem(last=False)
+        return f
+
+
+    def peek(self, msg_id: int) -> Optional[MessageFeatures]:
+        return self.__store.get(msg_id, None)
+
+
+    def delete(self, msg_id: int) -> None:
+        self.__store.pop(msg_id, None)
+
+
+    def __len__(self) -> int:
+        return len(self.__store)
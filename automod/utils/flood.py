@@ -0,0 +1,206 @@
+# type: ignore
+
+import discord
+
+import asyncio
+import time
+from array import array
+from typing import Optional, Dict, List, Tuple, Any
+import os
+import logging; log = logging.getLogger(__name__)
+
+
+
+FLOOD_DEFAULTS = {
+    "rate": 0, # messages ...
+    "per": 10, # ... per seconds in a channel/the whole server, 0 disables it
+    "action": "slowmode", # slowmode or delete
+    "slowmode": 10, # seconds, slowmode set while the flood lasts
+    "duration": 60 # seconds below the rate until the flood is over
+}
+FLOOD_SCOPES = ["channel", "guild"]
+MAX_KEYS = 50000
+SWEEP_EVERY = 4096 # calls
+IDLE_TIMEOUT = 600
+
+
+def get_flood_config(antispam: Optional[Dict[str, Any]], scope: str) -> Optional[Dict[str, Any]]:
+    cfg = antispam.get(scope, None) if antispam != None else None
+    if not cfg: return None
+
+    cfg = {**FLOOD_DEFAULTS, **cfg}
+    return cfg if int(cfg["rate"]) > 0 else None
+
+
+class TokenBuckets:
+    """
+    Token buckets for a lot of keys in one flat ``array('d')``, three doubles per key:
+    tokens left, time of the last refill and the time the current flood ends (0 if there is none)
+    """
+    __slots__ = ("data", "slots", "free", "calls")
+    FIELDS = 3
+
+    def __init__(self) -> None:
+        self.data = array("d")
+        self.slots: Dict[int, int] = {}
+        self.free: List[int] = []
+        self.calls = 0
+
+
+    def _index(self, key: int, capacity: float, now: float) -> int:
+        slot = self.slots.get(key, None)
+        if slot == None:
+            if len(self.free) > 0:
+                slot = self.free.pop()
+                i = slot * self.FIELDS
+                self.data[i], self.data[i + 1], self.data[i + 2] = capacity, now, 0.0
+            else:
+                slot = len(self.data) // self.FIELDS
+                self.data.extend((capacity, now, 0.0))
+            self.slots[key] = slot
+        return slot * self.FIELDS
+
+
+    def take(self, key: int, capacity: float, per: float, now: float) -> bool:
+        """Takes a token, returns ``False`` if the bucket was empty"""
+        self.calls += 1
+        if self.calls % SWEEP_EVERY == 0 or len(self.slots) > MAX_KEYS: self.sweep(now)
+
+        d = self.data
+        i = self._index(key, capacity, now)
+        tokens = min(capacity, d[i] + (now - d[i + 1]) * (capacity / per))
+        d[i + 1] = now
+        if tokens >= 1:
+            d[i] = tokens - 1
+            return True
+        else:
+            d[i] = tokens
+            return False
+
+
+    def flood_until(self, key: int) -> float:
+        slot = self.slots.get(key, None)
+        return self.data[slot * self.FIELDS + 2] if slot != None else 0.0
+
+
+    def set_flood_until(self, key: int, until: float) -> None:
+        slot = self.slots.get(key, None)
+        if slot != None: self.data[slot * self.FIELDS + 2] = until
+
+
+    def sweep(self, now: float) -> None:
+        d = self.data
+        for key, slot in list(self.slots.items()):
+            i = slot * self.FIELDS
+            if now - d[i + 1] > IDLE_TIMEOUT and d[i + 2] < now:
+                del self.slots[key]
+                self.free.append(slot)
+
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+
+class _Flood:
+    __slots__ = ("guild", "channel", "scope", "cfg", "started", "messages", "slowed")
+
+    def __init__(self, guild: discord.Guild, channel: discord.abc.GuildChannel, scope: str, cfg: Dict[str, Any], now: float) -> None:
+        self.guild = guild
+        self.channel = channel
+        self.scope = scope
+        self.cfg = cfg
+        self.started = now
+        self.messages = 0
+        self.slowed: Dict[int, Tuple[Any, int]] = {} # channel id -> (channel, previous slowmode)
+
+
+class FloodDetector:
+    """
+    Message rate limits for whole channels and servers (``antispam.channel`` / ``antispam.guild``), catching floods
+    spread over many accounts. The action (raising the slowmode or deleting messages) and the log happen once
+    per flood, slowmodes are restored once it's over.
+    """
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.buckets = {x: TokenBuckets() for x in FLOOD_SCOPES}
+        self.__floods: Dict[Tuple[str, int], _Flood] = {}
+
+
+    def check(self, msg: discord.Message, antispam: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Records the message, returns the action (``slowmode``/``delete``) if it's part of a flood"""
+        now = msg.created_at.timestamp()
+        action = None
+        for scope in FLOOD_SCOPES:
+            cfg = get_flood_config(antispam, scope)
+            if cfg == None: continue
+
+            key = msg.channel.id if scope == "channel" else msg.guild.id
+            buckets = self.buckets[scope]
+            ok = buckets.take(key, float(cfg["rate"]), float(cfg["per"]), now)
+
+            flood = self.__floods.get((scope, key), None)
+            if ok == False:
+                buckets.set_flood_until(key, now + float(cfg["duration"]))
+                if flood == None: flood = self._start(msg, scope, key, cfg, now)
+
+            if flood != None and buckets.flood_until(key) > now:
+                flood.messages += 1
+                if flood.cfg["action"] == "slowmode": 
+                    self._slow(flood, msg.channel)
+                    action = action or "slowmode"
+                else:
+                    action = "delete"
+        return action
+
+
+    def _start(self, msg: discord.Message, scope: str, key: int, cfg: Dict[str, Any], now: float) -> _Flood:
+        flood = _Flood(msg.guild, msg.channel, scope, cfg, now)
+        self.__floods[(scope, key)] = flood
+
+        log.warn(f"[AntiSpam] {scope.title()} flood detected ({cfg['rate']}/{cfg['per']}s) (guild: {msg.guild.id})", extra={"loc": f"PID {os.getpid()}"})
+        self.bot.dispatch("flood_start", msg.guild, msg.channel, scope, cfg)
+        self.bot.loop.create_task(self._end_later(scope, key))
+        return flood
+
+
+    def _slow(self, flood: _Flood, channel: discord.abc.GuildChannel) -> None:
+        if channel.id in flood.slowed or not hasattr(channel, "slowmode_delay"): return
+
+        delay = int(flood.cfg["slowmode"])
+        flood.slowed[channel.id] = (channel, channel.slowmode_delay)
+        if channel.slowmode_delay < delay:
+            self.bot.loop.create_task(self._set_slowmode(channel, delay))
+
+
+    async def _set_slowmode(self, channel: discord.abc.GuildChannel, delay: int, reason: str = "Flood detected") -> None:
+        try:
+            await channel.edit(slowmode_delay=delay, reason=reason)
+        except discord.HTTPException as ex:
+            log.warn(f"[AntiSpam] Failed to set the slowmode - {ex} (channel: {channel.id})", extra={"loc": f"PID {os.getpid()}"})
+
+
+    async def _end_later(self, scope: str, key: int) -> None:
+        buckets = self.buckets[scope]
+        while True:
+            left = buckets.flood_until(key) - time.time()
+            if left <= 0: break
+            await asyncio.sleep(left)
+
+        flood = self.__floods.pop((scope, key), None)
+        if flood == None: return
+
+        delay = int(flood.cfg["slowmode"])
+        for channel, previous in flood.slowed.values():
+            if previous < delay and channel.slowmode_delay == delay:
+                await self._set_slowmode(channel, previous, "Flood ended")
+
+        self.bot.dispatch("flood_end", flood.guild, flood.channel, scope, {
+            "duration": round(time.time() - flood.started),
+            "messages": flood.messages,
+            "channels": len(flood.slowed),
+            "action": flood.cfg["action"]
+        })
+
+
+    def __len__(self) -> int:
+        return len(self.__floods)
@@ -0,0 +1,88 @@
+# type: ignore
+
+import discord
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
+
+
+
+class InviteResolver:
+    """
+    Shared ``invite code -> guild id`` lookup. Results (including unknown invites) are kept in a bounded LRU with
+    a TTL, and concurrent lookups of the same code wait for a single ``fetch_invite`` call.
+    """
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.__store: OrderedDict[str, Tuple[Optional[int], float]] = OrderedDict()
+        self.__pending: Dict[str, asyncio.Future] = {}
+        self._MAX_CACHE_SIZE = 10000
+        self._TTL = 3600
+        self._NEGATIVE_TTL = 300
+        self.hits = 0
+        self.misses = 0
+
+
+    def _get_cached(self, code: str) -> Tuple[bool, Optional[int]]:
+        entry = self.__store.get(code, None)
+        if entry == None: return False, None
+
+        guild_id, expires = entry
+        if expires < time.monotonic():
+            del self.__store[code]
+            return False, None
+
+        self.__store.move_to_end(code)
+        return True, guild_id
+
+
+    def _insert(self, code: str, guild_id: Optional[int]) -> None:
+        ttl = self._TTL if guild_id != None else self._NEGATIVE_TTL
+        self.__store[code] = (guild_id, time.monotonic() + ttl)
+        self.__store.move_to_end(code)
+        if len(self.__store) > self._MAX_CACHE_SIZE: self.__store.popitem(last=False)
+
+
+    async def _fetch(self, code: str) -> Optional[int]:
+        try:
+            invite: discord.Invite = await self.bot.fetch_invite(code, with_counts=False)
+        except discord.NotFound:
+            guild_id = None
+        else:
+            guild_id = invite.guild.id if invite.guild != None else None
+
+        self._insert(code, guild_id)
+        return guild_id
+
+
+    async def resolve(self, code: str) -> Optional[int]:
+        """
+        Returns the id of the guild the invite points to, or ``None`` if the invite doesn't exist (or has no guild).
+        Other HTTP errors aren't cached and are raised to every waiting caller.
+        """
+        cached, guild_id = self._get_cached(code)
+        if cached == True:
+            self.hits += 1
+            return guild_id
+
+        self.misses += 1
+        fut = self.__pending.get(code, None)
+        if fut == None:
+            fut = asyncio.ensure_future(self._fetch(code))
+            self.__pending[code] = fut
+            fut.add_done_callback(lambda _: self.__pending.pop(code, None))
+        return await asyncio.shield(fut)
+
+
+    def invalidate(self, code: str) -> None:
+        self.__store.pop(code, None)
+
+
+    def flush(self) -> None:
+        self.__store.clear()
+
+
+    def __len__(self) -> int:
+        return len(self.__store)
@@ -0,0 +1,101 @@
+from collections import deque
+from typing import Dict, List, Tuple
+
+
+
+class FilterMatcher:
+    """
+    Aho-Corasick automaton over the words of all filters of a guild.
+
+    ``search()`` scans the content once and costs time proportional to its length (plus the number of hits),
+    no matter how many words the filters contain. Words are matched case-insensitive as substrings, a trailing
+    ``*`` turns a word into a prefix that has to be followed by at least one more non-whitespace character.
+    Repeated stars collapse into the last one, so a star inside a word (e.g. ``f*ck``) is matched literally.
+    """
+    def __init__(self, filters: List[List[str]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[Tuple[int, str, int, bool], ...]] = [()]
+        self.size = 0
+
+        for indx, words in enumerate(filters):
+            for word in words:
+                word = word.strip()
+                word = word.replace("*", "", word.count("*") - 1) # remove multiple wildcards
+                wildcard = word.endswith("*")
+                if wildcard: word = word[:-1]
+                word = word.lower()
+                if word == "": continue
+
+                self._add(word, (indx, word, len(word), wildcard))
+        self._build()
+
+
+    def _add(self, word: str, out: Tuple[int, str, int, bool]) -> None:
+        state = 0
+        for c in word:
+            nxt = self._goto[state].get(c, None)
+            if nxt == None:
+                nxt = len(self._goto)
+                self._goto[state][c] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+
+        if not out in self._out[state]:
+            self._out[state] = (*self._out[state], out)
+            self.size += 1
+
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, nxt in self._goto[state].items():
+                queue.append(nxt)
+
+                f = self._fail[state]
+                while f and not c in self._goto[f]:
+                    f = self._fail[f]
+                f = self._goto[f].get(c, 0)
+
+                self._fail[nxt] = f if f != nxt else 0
+                self._out[nxt] = (*self._out[nxt], *self._out[self._fail[nxt]])
+
+
+    def search(self, content: str) -> Dict[int, List[Tuple[str, str]]]:
+        """Returns ``{filter_index: [(word, found), ...]}`` for every filter that has at least one hit"""
+        if self.size < 1: return {}
+
+        text = content.lower()
+        if len(text) != len(content): content = text # some characters change length when lowered
+        goto, fail, out = self._goto, self._fail, self._out
+
+        hits = {}
+        state = 0
+        for i, c in enumerate(text):
+            while state and not c in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+
+            if out[state]:
+                for indx, word, length, wildcard in out[state]:
+                    start = i - length + 1
+                    if wildcard:
+                        end = i + 1
+                        while end < len(text) and not text[end].isspace():
+                            end += 1
+                        if end == i + 1: continue
+                    else:
+                        end = i + 1
+
+                    found = content[start:end]
+                    entries = hits.setdefault(indx, [])
+                    if not (word, found) in entries:
+                        entries.append((word, found))
+        return hits
+
+
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,169 @@
+# type: ignore
+
+from prometheus_client import CollectorRegistry
+from prometheus_client.core import HistogramMetricFamily, CounterMetricFamily
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple
+
+
+
+# upper bounds in nanoseconds, the last bucket catches everything above
+BUCKETS = [1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000, 50_000_000, 100_000_000]
+MAX_GUILDS = 1000
+
+_current: ContextVar[Optional["RuleTimer"]] = ContextVar("automod_rule_timer", default=None)
+
+
+class RuleStats:
+    __slots__ = ("counts", "total", "samples", "hits")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0 # ns
+        self.samples = 0
+        self.hits = 0
+
+
+    def observe(self, ns: int) -> None:
+        self.counts[bisect_left(BUCKETS, ns)] += 1
+        self.total += ns
+        self.samples += 1
+
+
+    def avg(self) -> float:
+        return (self.total / self.samples) if self.samples > 0 else 0.0
+
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket the quantile falls into (ns)"""
+        if self.samples < 1: return 0.0
+        rank = q * self.samples
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank: return float(BUCKETS[i]) if i < len(BUCKETS) else float("inf")
+        return float("inf")
+
+
+class RuleTimer:
+    """Times consecutive stages of one ``enforce_rules`` call, every ``stage()`` closes the previous one"""
+    __slots__ = ("metrics", "guild_id", "name", "start")
+
+    def __init__(self, metrics: "RuleMetrics", guild_id: int) -> None:
+        self.metrics = metrics
+        self.guild_id = guild_id
+        self.name = None
+        self.start = 0
+
+
+    def stage(self, name: Optional[str]) -> None:
+        now = time.perf_counter_ns()
+        if self.name != None: self.metrics._observe(self.name, self.guild_id, now - self.start)
+        self.name = name
+        self.start = now
+
+
+    def stop(self) -> None:
+        self.stage(None)
+
+
+class RuleMetrics:
+    """
+    Per-rule latency histograms and hit counters for the automod pipeline. Only every ``sample_every``-th
+    message is timed, hits are always counted. Optionally keeps totals per guild as well.
+    """
+    def __init__(self, sample_every: int = 10, per_guild: bool = False) -> None:
+        self.sample_every = max(int(sample_every), 1)
+        self.per_guild = per_guild
+        self.rules: Dict[str, RuleStats] = {}
+        self.guilds: OrderedDict[int, Dict[str, Tuple[int, int]]] = OrderedDict() # guild -> rule -> (samples, total ns)
+        self._tick = 0
+
+        self.registry = CollectorRegistry()
+        self.registry.register(self)
+
+
+    def timer(self, guild_id: int) -> Optional[RuleTimer]:
+        self._tick += 1
+        if self._tick % self.sample_every != 0: return None
+
+        t = RuleTimer(self, guild_id)
+        _current.set(t)
+        return t
+
+
+    def done(self, timer: Optional[RuleTimer]) -> None:
+        if timer == None: return
+        timer.stop()
+        _current.set(None)
+
+
+    def pause(self) -> None:
+        """Closes the running stage of the current message, so actions taken (API calls) aren't timed"""
+        t = _current.get()
+        if t != None: t.stage(None)
+
+
+    def hit(self, rule: str) -> None:
+        self.pause()
+        stats = self.rules.get(rule, None)
+        if stats == None:
+            stats = RuleStats()
+            self.rules[rule] = stats
+        stats.hits += 1
+
+
+    def _observe(self, rule: str, guild_id: int, ns: int) -> None:
+        stats = self.rules.get(rule, None)
+        if stats == None:
+            stats = RuleStats()
+            self.rules[rule] = stats
+        stats.observe(ns)
+
+        if self.per_guild == True:
+            g = self.guilds.get(guild_id, None)
+            if g == None:
+                g = {}
+                self.guilds[guild_id] = g
+                if len(self.guilds) > MAX_GUILDS: self.guilds.popitem(last=False)
+            else:
+                self.guilds.move_to_end(guild_id)
+            samples, total = g.get(rule, (0, 0))
+            g[rule] = (samples + 1, total + ns)
+
+
+    def slowest_guilds(self, amount: int = 5) -> List[Tuple[int, float]]:
+        """Guilds with the highest average time per sampled message (ns)"""
+        out = []
+        for guild_id, rules in self.guilds.items():
+            samples = max(x[0] for x in rules.values())
+            out.append((guild_id, sum(x[1] for x in rules.values()) / max(samples, 1)))
+        return sorted(out, key=lambda x: x[1], reverse=True)[:amount]
+
+
+    def collect(self):
+        # called by prometheus on scrape, nothing is exported per message
+        duration = HistogramMetricFamily(
+            "automod_rule_duration_seconds",
+            "Time spent per automod rule (sampled)",
+            labels=["rule"]
+        )
+        hits = CounterMetricFamily(
+            "automod_rule_hits",
+            "Messages actioned per automod rule",
+            labels=["rule"]
+        )
+        for rule, stats in list(self.rules.items()):
+            buckets = []
+            cumulative = 0
+            for i, c in enumerate(stats.counts):
+                cumulative += c
+                buckets.append((str(BUCKETS[i] / 1e9) if i < len(BUCKETS) else "+Inf", cumulative))
+            duration.add_metric([rule], buckets, stats.total / 1e9)
+            hits.add_metric([rule], stats.hits)
+        yield duration
+        yield hits
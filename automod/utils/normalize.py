@@ -0,0 +1,89 @@
+# type: ignore
+
+import re
+import unicodedata
+from typing import Dict
+
+
+
+# Lookalikes NFKD leaves alone (it already folds fullwidth, math alphanumerics, ligatures & accents)
+CONFUSABLES = {
+    # cyrillic
+    "а": "a", "в": "b", "е": "e", "ё": "e", "з": "3", "і": "i", "ї": "i", "ј": "j", "к": "k", "м": "m",
+    "н": "h", "о": "o", "п": "n", "р": "p", "с": "c", "т": "t", "у": "y", "х": "x", "ѕ": "s", "ԁ": "d",
+    "ԛ": "q", "ԝ": "w", "һ": "h", "ь": "b", "ӏ": "l",
+    # greek
+    "α": "a", "β": "b", "γ": "y", "ε": "e", "η": "n", "ι": "i", "κ": "k", "ν": "v", "ο": "o", "ρ": "p",
+    "τ": "t", "υ": "u", "χ": "x", "ω": "w", "ς": "s",
+    # others
+    "ı": "i", "ȷ": "j", "ł": "l", "ø": "o", "đ": "d", "ħ": "h", "ß": "ss", "æ": "ae", "œ": "oe",
+    "ɑ": "a", "ɡ": "g", "ɩ": "i", "ɪ": "i", "ʏ": "y", "ᴀ": "a", "ʙ": "b", "ᴄ": "c", "ᴅ": "d", "ᴇ": "e",
+    "ɢ": "g", "ʜ": "h", "ᴊ": "j", "ᴋ": "k", "ʟ": "l", "ᴍ": "m", "ɴ": "n", "ᴏ": "o", "ᴘ": "p", "ʀ": "r",
+    "ᴛ": "t", "ᴜ": "u", "ᴠ": "v", "ᴡ": "w", "ᴢ": "z"
+}
+
+
+# Applied after the confusables, so "з" ends up as "e" as well
+LEET = {
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g",
+    "@": "a", "$": "s", "!": "i", "€": "e", "£": "l"
+}
+
+
+INVISIBLE_CHARS = [
+    "­", # soft hyphen
+    "͏", # combining grapheme joiner
+    "᠎", # mongolian vowel separator
+    "​", # zero width space
+    "‌", # zero width non-joiner
+    "‍", # zero width joiner
+    "⁠", # word joiner
+    "﻿" # zero width no-break space
+]
+
+
+# Unicode combining mark blocks, left over from NFKD or stacked on purpose
+COMBINING_RANGES = [
+    (0x0300, 0x036F),
+    (0x0483, 0x0489),
+    (0x1AB0, 0x1AFF),
+    (0x1DC0, 0x1DFF),
+    (0x20D0, 0x20FF),
+    (0xFE20, 0xFE2F)
+]
+
+
+def _build_table() -> Dict[int, str]:
+    table = {c: None for start, end in COMBINING_RANGES for c in range(start, end + 1)}
+    table.update({ord(x): None for x in INVISIBLE_CHARS})
+    for k, v in CONFUSABLES.items():
+        table[ord(k)] = "".join(LEET.get(x, x) for x in v)
+    table.update({ord(k): v for k, v in LEET.items()})
+    return table
+
+
+_NORMALIZE_TABLE = _build_table()
+
+
+# Three or more single characters with separators in between, e.g. "b.a.d" or "b a d" -> "bad"
+SEPARATED_RE = re.compile(
+    r"(?<![^\W_])[^\W_](?:[ \t.,\-_*~|/\\+'\"]+[^\W_](?![^\W_])){2,}"
+)
+
+
+_SEPARATOR_TABLE = str.maketrans("", "", " \t.,-_*~|/\\+'\"")
+
+
+def _collapse(m: re.Match) -> str:
+    return m.group().translate(_SEPARATOR_TABLE)
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercase view of ``text`` that filters can be matched against: compatibility forms, accents and lookalike
+    letters are folded to ASCII, leetspeak is undone and separators between single letters are dropped
+    """
+    text = text.lower()
+    if not text.isascii(): text = unicodedata.normalize("NFKD", text)
+    text = text.translate(_NORMALIZE_TABLE)
+    return SEPARATED_RE.sub(_collapse, text)
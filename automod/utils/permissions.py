@@ -0,0 +1,128 @@
+# type: ignore
+
+import discord
+
+from collections import OrderedDict
+from typing import Optional, Dict, FrozenSet, Tuple, Any
+
+
+
+MAX_MEMBERS = 100000
+MAX_CHANNELS_PER_MEMBER = 64
+
+
+class _MemberPerms:
+    __slots__ = ("generation", "roles", "immune", "ignored_by_role", "channels")
+
+    def __init__(self, generation: int, roles: FrozenSet[int], immune: bool, ignored_by_role: bool) -> None:
+        self.generation = generation
+        self.roles = roles
+        self.immune = immune
+        self.ignored_by_role = ignored_by_role
+        self.channels: Dict[int, bool] = {}
+
+
+class _GuildState:
+    __slots__ = ("generation", "version", "key")
+
+    def __init__(self) -> None:
+        self.generation = 0
+        self.version = -1
+        self.key: Optional[Tuple[Any, ...]] = None
+
+
+class PermissionCache:
+    """
+    Caches the automod decisions for a member (``(guild, member)``): their role ids, whether automod may act on
+    them at all and whether they're ignored in a channel. Members are invalidated by member/role events,
+    a whole guild once the mod role or the automod ignore lists change.
+    """
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.__members: OrderedDict[Tuple[int, int], _MemberPerms] = OrderedDict()
+        self.__guilds: Dict[int, _GuildState] = {}
+        self.hits = 0
+        self.misses = 0
+
+
+    def _guild(self, guild_id: int) -> Tuple[_GuildState, Any]:
+        state = self.__guilds.get(guild_id, None)
+        if state == None:
+            state = _GuildState()
+            self.__guilds[guild_id] = state
+
+        plan = self.bot.rule_plans.get(guild_id)
+        version = self.bot.db.configs.version(guild_id)
+        if state.version != version:
+            # most config writes (cases etc.) don't touch anything that's relevant here
+            state.version = version
+            key = (
+                self.bot.db.configs.get(guild_id, "mod_role"),
+                plan.ignored_roles if plan != None else None,
+                plan.ignored_channels if plan != None else None
+            )
+            if key != state.key:
+                state.key = key
+                state.generation += 1
+        return state, plan
+
+
+    def get(self, guild: discord.Guild, member: discord.Member) -> _MemberPerms:
+        state, plan = self._guild(guild.id)
+
+        key = (guild.id, member.id)
+        entry = self.__members.get(key, None)
+        if entry != None and entry.generation == state.generation:
+            self.__members.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        roles = frozenset(x.id for x in getattr(member, "roles", []))
+
+        mod_role = state.key[0]
+        if member.id == guild.owner_id:
+            immune = True
+        elif mod_role != "" and mod_role != None and int(mod_role) in roles:
+            immune = True
+        else:
+            perms = member.guild_permissions
+            immune = perms.ban_members == True and perms.kick_members == True and perms.manage_messages == True
+
+        ignored_by_role = plan != None and not roles.isdisjoint(plan.ignored_roles)
+
+        entry = _MemberPerms(state.generation, roles, immune, ignored_by_role)
+        self.__members[key] = entry
+        self.__members.move_to_end(key)
+        if len(self.__members) > MAX_MEMBERS: self.__members.popitem(last=False)
+        return entry
+
+
+    def is_immune(self, guild: discord.Guild, member: discord.Member) -> bool:
+        """Whether automod can't act on the member (owner, mod role or moderation permissions)"""
+        return self.get(guild, member).immune
+
+
+    def is_ignored(self, guild: discord.Guild, channel: discord.abc.GuildChannel, member: discord.Member) -> bool:
+        """Whether automod rules are ignored for the member in the channel (ignored roles/channels)"""
+        entry = self.get(guild, member)
+        ignored = entry.channels.get(channel.id, None)
+        if ignored == None:
+            plan = self.bot.rule_plans.get(guild.id)
+            ignored = entry.ignored_by_role or (plan != None and channel.id in plan.ignored_channels)
+            if len(entry.channels) >= MAX_CHANNELS_PER_MEMBER: entry.channels.clear()
+            entry.channels[channel.id] = ignored
+        return ignored
+
+
+    def invalidate_member(self, guild_id: int, member_id: int) -> None:
+        self.__members.pop((guild_id, member_id), None)
+
+
+    def invalidate_guild(self, guild_id: int) -> None:
+        state = self.__guilds.get(guild_id, None)
+        if state != None: state.generation += 1
+
+
+    def __len__(self) -> int:
+        return len(self.__members)
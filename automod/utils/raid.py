@@ -0,0 +1,290 @@
+# type: ignore
+
+import discord
+
+import asyncio
+import time
+from collections import deque, OrderedDict
+from typing import Optional, Dict, List, Tuple, Any
+import os
+import logging; log = logging.getLogger(__name__)
+
+
+
+RAID_DEFAULTS = {
+    "enabled": False, # opt-in through /antiraid enable
+    "joins": 10, # joins ...
+    "per": 10, # ... per seconds that start a lockdown
+    "action": "none", # none, kick or ban
+    "account_age": 0, # only act on accounts younger than this (days), 0 acts on everyone
+    "cooldown": 120, # seconds below the join threshold until the lockdown ends
+    "suppress_welcome": False # no welcome messages for members joining during a lockdown
+}
+RESOLUTION = 10 # buckets per join window
+MAX_RECENT = 100 # recent joins kept for acting on the ones that triggered the lockdown
+MAX_SEEN = 1000 # joins whose result is remembered for the other join listeners
+BULK_BAN_SIZE = 200
+KICK_INTERVAL = 0.25 # seconds between kicks, bans are sent in bulk
+WATCH_INTERVAL = 5
+AGE_BUCKETS = [
+    (3600, "< 1 hour"),
+    (86400, "< 1 day"),
+    (604800, "< 1 week"),
+    (2592000, "< 1 month"),
+    (31536000, "< 1 year"),
+    (None, "older")
+]
+
+
+def get_raid_config(cfg: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {**RAID_DEFAULTS, **(cfg or {})}
+
+
+def _age_bucket(age: float) -> int:
+    for i, (limit, _) in enumerate(AGE_BUCKETS):
+        if limit == None or age < limit: return i
+    return len(AGE_BUCKETS) - 1
+
+
+class JoinCounter:
+    """Sliding window join counter with a fixed amount of time buckets"""
+    __slots__ = ("width", "counts", "stamps")
+
+    def __init__(self, per: float) -> None:
+        self.width = max(per / RESOLUTION, 0.1)
+        self.counts = [0] * RESOLUTION
+        self.stamps = [-1] * RESOLUTION
+
+
+    def add(self, now: float) -> int:
+        idx = int(now // self.width)
+        slot = idx % RESOLUTION
+        if self.stamps[slot] != idx:
+            self.stamps[slot] = idx
+            self.counts[slot] = 0
+        self.counts[slot] += 1
+        return self.count(now)
+
+
+    def count(self, now: float) -> int:
+        idx = int(now // self.width)
+        return sum(c for c, s in zip(self.counts, self.stamps) if idx - s < RESOLUTION)
+
+
+class RaidState:
+    __slots__ = ("counter", "per", "recent", "lockdown", "started", "last_trigger", "action", "joined", "actioned", "failed", "ages")
+
+    def __init__(self, per: float) -> None:
+        self.counter = JoinCounter(per)
+        self.per = per
+        self.recent = deque(maxlen=MAX_RECENT) # (time, user_id, account age)
+        self.lockdown = False
+        self._reset()
+
+
+    def _reset(self) -> None:
+        self.started = 0.0
+        self.last_trigger = 0.0
+        self.action = "none"
+        self.joined = 0
+        self.actioned = 0
+        self.failed = 0
+        self.ages = [0] * len(AGE_BUCKETS)
+
+
+    def summary(self, now: float) -> Dict[str, Any]:
+        return {
+            "duration": round(now - self.started),
+            "joined": self.joined,
+            "actioned": self.actioned,
+            "failed": self.failed,
+            "action": self.action,
+            "ages": {label: n for (_, label), n in zip(AGE_BUCKETS, self.ages) if n > 0}
+        }
+
+
+class RaidDetector:
+    """
+    Tracks the join rate of every guild (``raid_config``). Once a guild goes over the threshold it's put into
+    lockdown, new joins are kicked/banned through a shared queue and one summary is dispatched
+    (``on_raid_start``/``on_raid_end``) instead of a log per member. Every listener of a join can ask ``on_join()``
+    directly, the join is only counted once and all of them get the same answer, no matter which one runs first.
+    """
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.__store: Dict[int, RaidState] = {}
+        self.__seen: OrderedDict[Tuple[int, int, Any], bool] = OrderedDict()
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._watcher: Optional[asyncio.Task] = None
+
+
+    def get(self, guild_id: int) -> Optional[RaidState]:
+        return self.__store.get(guild_id, None)
+
+
+    def in_lockdown(self, guild_id: int) -> bool:
+        state = self.__store.get(guild_id, None)
+        return state != None and state.lockdown == True
+
+
+    def on_join(self, member: discord.Member, cfg: Dict[str, Any]) -> bool:
+        """Records the join, returns whether the guild is in lockdown (the per-join log should be skipped then)"""
+        key = (member.guild.id, member.id, member.joined_at)
+        locked = self.__seen.get(key, None)
+        if locked == None:
+            locked = self._join(member, get_raid_config(cfg))
+            self.__seen[key] = locked
+            if len(self.__seen) > MAX_SEEN: self.__seen.popitem(last=False)
+        return locked
+
+
+    def _join(self, member: discord.Member, cfg: Dict[str, Any]) -> bool:
+        if cfg["enabled"] == False: return self.in_lockdown(member.guild.id)
+
+        now = time.monotonic()
+        age = max(time.time() - member.created_at.timestamp(), 0)
+
+        state = self.__store.get(member.guild.id, None)
+        if state == None or state.per != float(cfg["per"]):
+            state = RaidState(float(cfg["per"]))
+            self.__store[member.guild.id] = state
+
+        joins = state.counter.add(now)
+        state.recent.append((now, member.id, age))
+
+        if joins >= int(cfg["joins"]):
+            state.last_trigger = now
+            if state.lockdown == False:
+                self._start(member.guild, state, cfg, now, joins)
+                return True
+
+        if state.lockdown == True:
+            self._record(member.guild, state, cfg, member.id, age)
+            return True
+        return False
+
+
+    def _start(self, guild: discord.Guild, state: RaidState, cfg: Dict[str, Any], now: float, joins: int) -> None:
+        state.lockdown = True
+        state._reset()
+        state.started = now
+        state.last_trigger = now
+        state.action = cfg["action"]
+
+        # the joins that triggered the lockdown are part of the raid too
+        for t, user_id, age in state.recent:
+            if now - t <= state.per: self._record(guild, state, cfg, user_id, age)
+
+        log.warn(f"[AntiRaid] Lockdown started ({joins} joins in {state.per}s) (guild: {guild.id})", extra={"loc": f"PID {os.getpid()}"})
+        self.bot.dispatch("raid_start", guild, joins, state.per, state.action)
+        self._ensure_tasks()
+
+
+    def _record(self, guild: discord.Guild, state: RaidState, cfg: Dict[str, Any], user_id: int, age: float) -> None:
+        state.joined += 1
+        state.ages[_age_bucket(age)] += 1
+
+        max_age = int(cfg["account_age"]) * 86400
+        if state.action in ["kick", "ban"] and (max_age <= 0 or age < max_age):
+            self.queue.put_nowait((guild.id, user_id, state.action))
+
+
+    def end(self, guild: discord.Guild) -> Optional[Dict[str, Any]]:
+        state = self.__store.get(guild.id, None)
+        if state == None or state.lockdown == False: return None
+
+        state.lockdown = False
+        summary = state.summary(time.monotonic())
+        log.warn(f"[AntiRaid] Lockdown ended after {summary['duration']}s, {summary['joined']} joins (guild: {guild.id})", extra={"loc": f"PID {os.getpid()}"})
+        self.bot.dispatch("raid_end", guild, summary)
+        return summary
+
+
+    def _ensure_tasks(self) -> None:
+        if self._worker == None or self._worker.done():
+            self._worker = self.bot.loop.create_task(self._work())
+        if self._watcher == None or self._watcher.done():
+            self._watcher = self.bot.loop.create_task(self._watch())
+
+
+    async def _watch(self) -> None:
+        while any(x.lockdown for x in self.__store.values()):
+            await asyncio.sleep(WATCH_INTERVAL)
+            now = time.monotonic()
+            for guild_id, state in list(self.__store.items()):
+                if state.lockdown == False: continue
+
+                cfg = get_raid_config(self.bot.db.configs.get(guild_id, "raid_config"))
+                if now - state.last_trigger >= float(cfg["cooldown"]):
+                    guild = self.bot.get_guild(guild_id)
+                    if guild == None:
+                        state.lockdown = False
+                    else:
+                        self.end(guild)
+
+
+    def _take_batch(self, first: Tuple[int, int, str]) -> List[Tuple[int, int, str]]:
+        batch = [first]
+        if first[2] != "ban": return batch
+
+        deferred = []
+        while len(batch) < BULK_BAN_SIZE and not self.queue.empty():
+            item = self.queue.get_nowait()
+            if item[0] == first[0] and item[2] == "ban":
+                batch.append(item)
+            else:
+                deferred.append(item)
+        for item in deferred: self.queue.put_nowait(item)
+        return batch
+
+
+    async def _work(self) -> None:
+        while True:
+            batch = self._take_batch(await self.queue.get())
+            guild_id, _, action = batch[0]
+            guild = self.bot.get_guild(guild_id)
+            state = self.__store.get(guild_id, None)
+            if guild == None or state == None: continue
+
+            ids = [x[1] for x in batch]
+            for _id in ids:
+                self.bot.ignore_for_events.append(_id)
+                if action == "ban": self.bot.ignore_for_events.append(_id) # member_remove & member_ban
+
+            try:
+                if action == "ban":
+                    done = await self._ban(guild, ids)
+                else:
+                    await guild.kick(discord.Object(id=ids[0]), reason="Raid detected")
+                    done = ids
+                    await asyncio.sleep(KICK_INTERVAL)
+            except Exception as ex:
+                log.warn(f"[AntiRaid] Failed to {action} {len(ids)} user(s) - {ex} (guild: {guild_id})", extra={"loc": f"PID {os.getpid()}"})
+                done = []
+
+            state.actioned += len(done)
+            state.failed += len(ids) - len(done)
+            for _id in [x for x in ids if not x in done]:
+                while _id in self.bot.ignore_for_events: self.bot.ignore_for_events.remove(_id)
+
+
+    async def _ban(self, guild: discord.Guild, ids: List[int]) -> List[int]:
+        users = [discord.Object(id=x) for x in ids]
+        if hasattr(guild, "bulk_ban"):
+            res = await guild.bulk_ban(users, reason="Raid detected", delete_message_seconds=3600)
+            return [x.id for x in res.banned]
+        else:
+            done = []
+            for u in users:
+                try:
+                    await guild.ban(u, reason="Raid detected", delete_message_days=1)
+                except discord.HTTPException:
+                    pass
+                else:
+                    done.append(u.id)
+            return done
+
+
+    def __len__(self) -> int:
+        return len([x for x in self.__store.values() if x.lockdown == True])
@@ -0,0 +1,122 @@
+# type: ignore
+
+import re
+from typing import Union, Optional, Dict, List, Tuple, FrozenSet, Any
+
+from ..__obj__ import ConfigView, ListView
+from .matcher import FilterMatcher
+from .sandbox import compile_regex
+from .domains import DomainIndex
+
+
+
+def parse_filter(words: List[str]) -> Optional[re.Pattern]:
+    normal = []
+    wildcards = []
+
+    for i in words:
+        if i == "": continue # an empty branch would match every message
+        i = i.replace("*", "", (i.count("*") - 1)) # remove multiple wildcards
+        if i.endswith("*"):
+            wildcards.append(re.escape(i.replace("*", ".+")))
+        else:
+            normal.append(re.escape(i))
+
+    if len(normal) + len(wildcards) < 1: return None
+    try:
+        return re.compile(r"|".join([*normal, *wildcards]), re.IGNORECASE)
+    except Exception:
+        return None
+
+
+def parse_regex(regex: str) -> Optional[re.Pattern]:
+    try:
+        parsed = re.compile(regex, re.IGNORECASE)
+    except Exception:
+        return None
+    else:
+        return parsed
+
+
+PLAN_SOURCES = ["filters", "regexes", "black_listed_links", "white_listed_links"] # config keys with compiled parts
+
+
+def _to_ids(inp: Optional[List[Union[str, int]]]) -> FrozenSet[int]:
+    return frozenset(int(x) for x in (inp or []) if str(x).strip().isdigit())
+
+
+def _source(config: ConfigView, key: str) -> Any:
+    value = config.get(key, None)
+    return value.raw() if isinstance(value, (ConfigView, ListView)) else value
+
+
+class RulePlan:
+    """
+    Everything ``enforce_rules`` needs from a guild config, compiled once per config change. The expensive parts
+    (filter automaton, regexes, link indexes) are taken over from ``previous`` if the version of their config key
+    (see ``MongoCollection.key_version()``) didn't change, so unrelated config writes (e.g. case counters) don't
+    rebuild or even compare them.
+    """
+    def __init__(self, config: ConfigView, version: int = 0, previous: Optional["RulePlan"] = None, key_versions: Optional[Dict[str, int]] = None) -> None:
+        self.version = version
+        self.rules = config.automod
+        self.antispam = config.antispam
+        self.key_versions = key_versions or {}
+
+        def unchanged(key: str) -> bool:
+            return previous != None and key in self.key_versions and previous.key_versions.get(key, None) == self.key_versions[key]
+
+        if unchanged("filters"):
+            self.filters, self.matcher = previous.filters, previous.matcher
+        else:
+            # (name, channels, warns), indexed the same way as the matcher results
+            self.filters: List[Tuple[str, FrozenSet[int], int]] = []
+            words = []
+            for name, f in (_source(config, "filters") or {}).items():
+                self.filters.append((name, _to_ids(f["channels"]), int(f["warns"])))
+                words.append(f["words"])
+            self.matcher = FilterMatcher(words)
+
+        if unchanged("regexes"):
+            self.regexes = previous.regexes
+        else:
+            # compiled for the sandbox, see RegexSandbox
+            self.regexes: List[Tuple[str, Any, FrozenSet[int], int]] = []
+            for name, data in (_source(config, "regexes") or {}).items():
+                if data.get("disabled", False) == True: continue
+                parsed = compile_regex(data["regex"])
+                if parsed != None:
+                    self.regexes.append((name, parsed, _to_ids(data["channels"]), int(data["warns"])))
+
+        self.black_listed_links = previous.black_listed_links if unchanged("black_listed_links") else DomainIndex(_source(config, "black_listed_links"))
+        self.white_listed_links = previous.white_listed_links if unchanged("white_listed_links") else DomainIndex(_source(config, "white_listed_links"))
+
+        self.allowed_invites = _to_ids(config.get("allowed_invites"))
+        self.ignored_roles = _to_ids(config.get("ignored_roles_automod"))
+        self.ignored_channels = _to_ids(config.get("ignored_channels_automod"))
+
+
+class RulePlanCache:
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self._plans: Dict[int, RulePlan] = {}
+
+
+    def get(self, guild_id: int) -> Optional[RulePlan]:
+        version = self.bot.db.configs.version(guild_id)
+        plan = self._plans.get(int(guild_id), None)
+        if plan == None or plan.version != version:
+            view = self.bot.db.configs.get_view(guild_id)
+            if view == None: return None
+
+            plan = RulePlan(view, version, plan, {k: self.bot.db.configs.key_version(guild_id, k) for k in PLAN_SOURCES})
+            self._plans[int(guild_id)] = plan
+        return plan
+
+
+    def invalidate(self, guild_id: int) -> None:
+        self._plans.pop(int(guild_id), None)
+
+
+    def __len__(self) -> int:
+        return len(self._plans)
@@ -0,0 +1,181 @@
+# type: ignore
+
+import regex
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple, FrozenSet
+import os
+import logging; log = logging.getLogger(__name__)
+
+try:
+    from re import _parser as sre_parse # python 3.11+
+except ImportError:
+    import sre_parse
+
+
+
+REGEX_TIMEOUT = 0.1 # seconds a single pattern may spend on one message
+MAX_STRIKES = 3 # timeouts until a pattern gets disabled
+STRIKE_WINDOW = 3600 # seconds, strikes older than this are forgotten
+MAX_WORKERS = 4
+UNBOUNDED = 50 # repeats with a higher upper bound count as unbounded
+
+_REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+
+
+def compile_regex(pattern: str) -> Optional[regex.Pattern]:
+    try:
+        return regex.compile(pattern, regex.IGNORECASE | regex.VERSION0)
+    except Exception:
+        return None
+
+
+def _first_chars(sub: sre_parse.SubPattern) -> Optional[FrozenSet[str]]:
+    """Characters a match of ``sub`` can start with, ``None`` if that isn't known (cheaply)"""
+    for op, av in sub:
+        if op is sre_parse.LITERAL:
+            return frozenset([chr(av).lower()])
+        elif op is sre_parse.IN and all(x[0] is sre_parse.LITERAL for x in av):
+            return frozenset(chr(x[1]).lower() for x in av)
+        elif op is sre_parse.SUBPATTERN and sre_parse.SubPattern(sub.state, av[-1]).getwidth()[0] > 0:
+            return _first_chars(av[-1])
+        elif op in _REPEATS and av[0] > 0:
+            return _first_chars(av[-1])
+        return None
+    return None
+
+
+def _ambiguous_branch(sub: sre_parse.SubPattern) -> bool:
+    """
+    Whether a branch in ``sub`` can match the same text in more than one way. ``sre_parse`` factors common
+    prefixes out of alternatives, so ``(a|aa)`` becomes ``a(?:|a)``: nullable alternatives count, as well as
+    ones that can start with the same character.
+    """
+    for op, av in sub:
+        if op is sre_parse.BRANCH:
+            branches = [sre_parse.SubPattern(sub.state, x) for x in av[1]]
+            if any(x.getwidth()[0] == 0 for x in branches): return True
+
+            firsts = [_first_chars(x) for x in branches]
+            for i, x in enumerate(firsts):
+                for y in firsts[i + 1:]:
+                    if x == None or y == None or not x.isdisjoint(y): return True
+            if any(_ambiguous_branch(x) for x in branches): return True
+        elif op is sre_parse.SUBPATTERN:
+            if _ambiguous_branch(sre_parse.SubPattern(sub.state, av[-1])): return True
+    return False
+
+
+def _is_ambiguous(body: sre_parse.SubPattern) -> bool:
+    items = list(body)
+    while len(items) == 1 and items[0][0] is sre_parse.SUBPATTERN:
+        items = list(items[0][1][-1])
+
+    # (a|aa)+, (foo|foobar)*, (a|)+ -> an iteration can match the same text through different alternatives
+    if _ambiguous_branch(sre_parse.SubPattern(body.state, items)): return True
+
+    repeats = [x for x in items if x[0] in _REPEATS and x[1][1] > 1]
+    if len(repeats) < 1: return False
+
+    # (a+)+, (\w+\s?)*, (a*b*)* -> every iteration can be split in many ways
+    others = [x for x in items if not x in repeats]
+    return all(sre_parse.SubPattern(body.state, [x]).getwidth()[0] == 0 for x in others)
+
+
+def _has_nested_repeat(sub: sre_parse.SubPattern) -> bool:
+    for op, av in sub:
+        if op in _REPEATS:
+            _, hi, body = av
+            if hi > UNBOUNDED and _is_ambiguous(body): return True
+            if _has_nested_repeat(body): return True
+        elif op is sre_parse.SUBPATTERN:
+            if _has_nested_repeat(av[-1]): return True
+        elif op is sre_parse.BRANCH:
+            if any(_has_nested_repeat(b) for b in av[1]): return True
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if _has_nested_repeat(av[1]): return True
+    return False
+
+
+def is_catastrophic(pattern: str) -> bool:
+    """Static check for constructs with exponential backtracking, like nested or overlapping quantifiers"""
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return False # invalid patterns are rejected elsewhere
+    else:
+        return _has_nested_repeat(parsed)
+
+
+class RegexSandbox:
+    """Runs user supplied regexes in worker threads with a time budget per pattern"""
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="regex-sandbox")
+        self.strikes: Dict[Tuple[int, str], Tuple[int, float]] = {} # -> (count, time of the first strike)
+
+
+    def _findall(self, patterns: List[Tuple[str, regex.Pattern, FrozenSet[int], int]], contents: Tuple[str, ...]) -> Tuple[Optional[Tuple[str, List[str], int]], List[str]]:
+        timed_out = []
+        for name, parsed, _, warns in patterns:
+            for content in contents:
+                try:
+                    # concurrent releases the GIL, so the event loop keeps running while matching
+                    found = parsed.findall(content, concurrent=True, timeout=REGEX_TIMEOUT)
+                except TimeoutError:
+                    timed_out.append(name)
+                    break
+                else:
+                    if found: return (name, found, warns), timed_out
+        return None, timed_out
+
+
+    async def findall(self, guild_id: int, patterns: List[Tuple[str, regex.Pattern, FrozenSet[int], int]], *contents: str) -> Tuple[Optional[Tuple[str, List[str], int]], List[str]]:
+        """
+        Returns the first matching ``(name, found, warns)`` and the names of patterns that got disabled.
+        Every pattern is tried against all ``contents`` in one go.
+        """
+        if len(patterns) < 1: return None, []
+
+        match, timed_out = await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            self._findall,
+            patterns,
+            contents
+        )
+
+        disabled = []
+        if len(timed_out) > 0: self._expire()
+        for name in timed_out:
+            key = (guild_id, name)
+            count, since = self.strikes.get(key, (0, time.monotonic()))
+            count += 1
+            self.strikes[key] = (count, since)
+            log.warn(
+                f"[Automod] Regex {name} timed out ({count}/{MAX_STRIKES}) (guild: {guild_id})",
+                extra={"loc": f"PID {os.getpid()}"}
+            )
+
+            if count >= MAX_STRIKES:
+                self.strikes.pop(key)
+                if self.disable(guild_id, name): disabled.append(name)
+        return match, disabled
+
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (_, since) in self.strikes.items() if now - since > STRIKE_WINDOW]:
+            del self.strikes[key]
+
+
+    def disable(self, guild_id: int, name: str) -> bool:
+        regexes = self.bot.db.configs.get(guild_id, "regexes")
+        if regexes == None or not name in regexes: return False
+
+        regexes[name]["disabled"] = True
+        self.bot.db.configs.update(guild_id, "regexes", regexes)
+        self.bot.rule_plans.invalidate(guild_id)
+
+        log.warn(f"[Automod] Disabled regex {name} after {MAX_STRIKES} timeouts within {STRIKE_WINDOW // 60} minutes (guild: {guild_id})", extra={"loc": f"PID {os.getpid()}"})
+        return True
@@ -0,0 +1,79 @@
+# type: ignore
+
+from collections import OrderedDict, deque
+from typing import Optional, List, Tuple
+
+
+
+RING_SIZE = 24 # > the highest allowed antispam rate (21)
+IDLE_TIMEOUT = 300 # seconds without messages until a user is dropped
+MAX_USERS = 50000
+EVICT_PER_CALL = 8
+
+
+class _UserWindow:
+    __slots__ = ("times", "pending", "last")
+
+    def __init__(self) -> None:
+        self.times = deque(maxlen=RING_SIZE)
+        self.pending = deque(maxlen=RING_SIZE) # (time, channel_id, message_id) of messages that weren't deleted yet
+        self.last = 0.0
+
+
+class SpamTracker:
+    """
+    Sliding window message counter per ``(guild, user)``. Only timestamps and ids of the last ``RING_SIZE``
+    messages are kept, idle users are evicted and the amount of tracked users is capped.
+    """
+    def __init__(self) -> None:
+        self.__store: OrderedDict[Tuple[int, int], _UserWindow] = OrderedDict()
+
+
+    def _evict(self, now: float) -> None:
+        # entries are ordered by last activity, so only the front has to be checked
+        for _ in range(EVICT_PER_CALL):
+            if len(self.__store) < 1: break
+            key, window = next(iter(self.__store.items()))
+            if now - window.last < IDLE_TIMEOUT and len(self.__store) <= MAX_USERS: break
+            del self.__store[key]
+
+
+    def hit(self, guild_id: int, user_id: int, channel_id: int, msg_id: int, now: float, rate: int, per: float) -> Optional[List[Tuple[int, int]]]:
+        """
+        Records a message. Returns ``None`` if the user is within ``rate`` messages per ``per`` seconds,
+        otherwise the ``(channel_id, message_id)`` of their earlier messages in the window that should be deleted as well
+        """
+        self._evict(now)
+
+        key = (guild_id, user_id)
+        window = self.__store.get(key, None)
+        if window == None:
+            window = _UserWindow()
+            self.__store[key] = window
+        else:
+            self.__store.move_to_end(key)
+
+        window.last = now
+        window.times.append(now)
+
+        start = now - per
+        in_window = 0
+        for t in reversed(window.times):
+            if t <= start: break
+            in_window += 1
+
+        if in_window > rate:
+            to_delete = [(c, m) for t, c, m in window.pending if t > start]
+            window.pending.clear()
+            return to_delete
+        else:
+            window.pending.append((now, channel_id, msg_id))
+            return None
+
+
+    def reset(self, guild_id: int, user_id: int) -> None:
+        self.__store.pop((guild_id, user_id), None)
+
+
+    def __len__(self) -> int:
+        return len(self.__store)
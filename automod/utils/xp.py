@@ -0,0 +1,121 @@
+# type: ignore
+
+import asyncio
+from collections import OrderedDict
+from pymongo import UpdateOne
+from typing import Optional, Set
+import os
+import logging; log = logging.getLogger(__name__)
+
+
+
+FLUSH_INTERVAL = 15 # seconds, at most this much XP is lost if the process dies
+MAX_ENTRIES = 100000
+EVICT_PER_CALL = 8
+
+
+class XPEntry:
+    __slots__ = ("xp", "lvl")
+
+    def __init__(self, xp: int, lvl: int) -> None:
+        self.xp = xp
+        self.lvl = lvl
+
+
+class XPLedger:
+    """
+    In-memory XP & levels of users (by level document id, ``guild-user``). Gains are applied here right away, so
+    level ups don't wait for the database, and changed entries are written every ``FLUSH_INTERVAL`` seconds with
+    one unordered bulk write. Only entries that have been written can be evicted. Everything that's left is
+    flushed on shutdown, anything reading the ``level`` collection directly should ``flush()`` first.
+    """
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.__entries: OrderedDict[str, XPEntry] = OrderedDict()
+        self.__dirty: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.written = 0
+
+
+    async def get(self, _id: str) -> Optional[XPEntry]:
+        entry = self.__entries.get(_id, None)
+        if entry != None:
+            self.__entries.move_to_end(_id)
+            return entry
+
+        doc = await self.bot.db.level.get_doc_async(_id)
+        if doc == None: return None
+
+        entry = self.__entries.get(_id, None) # might have been loaded/set while waiting
+        if entry == None:
+            entry = XPEntry(doc["xp"], doc["lvl"])
+            self.__entries[_id] = entry
+            self._evict()
+        return entry
+
+
+    def set(self, _id: str, xp: int, lvl: int) -> None:
+        entry = self.__entries.get(_id, None)
+        if entry == None:
+            self.__entries[_id] = XPEntry(xp, lvl)
+            self._evict()
+        else:
+            entry.xp, entry.lvl = xp, lvl
+            self.__entries.move_to_end(_id)
+        self.__dirty.add(_id)
+
+        if self._task == None or self._task.done():
+            self._task = self.bot.loop.create_task(self._flush_loop())
+
+
+    def drop(self, _id: str) -> None:
+        """Forgets the entry without writing it, e.g. because the document gets deleted"""
+        self.__entries.pop(_id, None)
+        self.__dirty.discard(_id)
+
+
+    def _evict(self) -> None:
+        if len(self.__entries) <= MAX_ENTRIES: return
+        for _id in list(self.__entries)[:EVICT_PER_CALL]:
+            if not _id in self.__dirty: del self.__entries[_id]
+
+
+    async def _flush_loop(self) -> None:
+        while len(self.__dirty) > 0:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            await self.flush()
+
+
+    async def flush(self) -> None:
+        """Writes all changed entries right away"""
+        dirty = self.__dirty
+        self.__dirty = set()
+
+        ops = []
+        for _id in dirty:
+            entry = self.__entries.get(_id, None)
+            if entry != None: ops.append(UpdateOne({"id": _id}, {"$set": {"xp": entry.xp, "lvl": entry.lvl}}))
+        if len(ops) < 1: return
+
+        col = self.bot.db.level
+        self.flushes += 1
+        try:
+            await self.bot.db.io.run("level", col.bulk_write, ops, ordered=False)
+        except Exception as ex:
+            log.warn(f"[Level] Failed to write XP of {len(ops)} user(s) - {ex}", extra={"loc": f"PID {os.getpid()}"})
+            self.__dirty |= {x for x in dirty if x in self.__entries} # retried with the next flush
+        else:
+            self.written += len(ops)
+            for _id in dirty:
+                entry = self.__entries.get(_id, None)
+                if entry == None: continue
+                if col.cached:
+                    cache = getattr(self.bot.cache, "level")
+                    cache.update(_id, "xp", entry.xp)
+                    cache.update(_id, "lvl", entry.lvl)
+                col._bump(_id, ["xp", "lvl"])
+
+
+    def __len__(self) -> int:
+        return len(self.__entries)
@@ -0,0 +1,527 @@
+"""
+Replays synthetic message corpora through AutomodPlugin.enforce_rules (and delete_msg) without a Discord
+connection. Guilds, members, channels and messages are lightweight fakes, configs live in memory and every
+Discord HTTP call is a no-op.
+
+Reports messages/sec, p50/p99 latency and memory allocated per message for every scenario (rule config x corpus)
+and writes the results to JSON (a scratch file by default), so regressions show up between commits. The committed
+baseline is only rewritten by passing it as ``--out``.
+
+Usage (from the repo root, needs the packages from requirements.txt):
+    python bench/automod_replay.py [--messages 2000] [--out RESULTS.json] [--baseline bench/automod_baseline.json]
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import discord
+
+
+REPO = Path(__file__).resolve().parent.parent
+GUILD_ID = 100000000000000001
+BOT_ID = 100000000000000002
+REGRESSION_THRESHOLD = 0.10 # 10% slower than the baseline gets flagged
+
+
+def load_automod():
+    # automod/__init__.py reads automod/config.json relative to the cwd, use the example one if there is none
+    if not (REPO / "automod" / "config.json").exists():
+        workdir = Path(tempfile.mkdtemp(prefix="automod-bench-"))
+        (workdir / "automod").mkdir()
+        shutil.copy(REPO / "automod" / "config.json.example", workdir / "automod" / "config.json")
+        os.symlink(REPO / "i18n", workdir / "i18n")
+        os.chdir(workdir)
+    else:
+        os.chdir(REPO)
+    sys.path.insert(0, str(REPO))
+
+    import automod.plugins.automod.plugin as plugin
+    import automod.utils as utils
+    from automod.__obj__ import TypeHintedToolboxObject as Object, ConfigView
+    from automod.schemas import GuildConfig
+    return plugin, utils, Object, ConfigView, GuildConfig
+
+
+# --- fakes -------------------------------------------------------------------------------------------------------
+
+
+class FakeAsset:
+    url = "https://cdn.discordapp.com/embed/avatars/0.png"
+
+    def __str__(self) -> str:
+        return self.url
+
+
+class FakeRole:
+    def __init__(self, _id: int) -> None:
+        self.id = _id
+
+
+class FakeMember:
+    def __init__(self, _id: int, guild: "FakeGuild", bot: bool = False) -> None:
+        self.id = _id
+        self.guild = guild
+        self.name = f"user{_id % 100000}"
+        self.discriminator = "0001"
+        self.display_name = self.name
+        self.mention = f"<@{_id}>"
+        self.display_avatar = FakeAsset()
+        self.avatar = None
+        self.bot = bot
+        self.roles = [FakeRole(guild.id)]
+        self.guild_permissions = discord.Permissions.none()
+        self.created_at = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=400)
+
+    async def send(self, *args, **kwargs) -> None:
+        pass
+
+
+class FakeChannel:
+    def __init__(self, _id: int, guild: "FakeGuild") -> None:
+        self.id = _id
+        self.guild = guild
+        self.name = f"channel-{_id % 1000}"
+        self.mention = f"<#{_id}>"
+        self.sent = 0
+
+    async def send(self, *args, **kwargs) -> None:
+        self.sent += 1
+
+    async def delete_messages(self, msgs, **kwargs) -> None:
+        self.guild.deleted.update(x.id for x in msgs)
+
+    def get_partial_message(self, _id: int) -> "FakeMessage":
+        return FakeMessage(_id, "", self.guild, self, self.guild.me, None)
+
+
+class FakeGuild:
+    def __init__(self, _id: int, members: int, channels: int) -> None:
+        self.id = _id
+        self.name = "Benchmark Guild"
+        self.chunked = True
+        self.deleted = set()
+        self.owner_id = BOT_ID + 1
+        self.me = FakeMember(BOT_ID, self, bot=True)
+        self.channels = [FakeChannel(_id + 1000 + i, self) for i in range(channels)]
+        self.members = [FakeMember(_id + 100000 + i, self) for i in range(members)]
+        self._channels = {x.id: x for x in self.channels}
+        self._members = {x.id: x for x in self.members}
+
+    def get_member(self, _id: int) -> Optional[FakeMember]:
+        return self._members.get(_id, None)
+
+    def get_channel(self, _id: int) -> Optional[FakeChannel]:
+        return self._channels.get(_id, None)
+
+    get_channel_or_thread = get_channel
+
+
+class FakeMessage:
+    __slots__ = ("id", "content", "guild", "channel", "author", "attachments", "created_at", "deleted")
+
+    def __init__(self, _id: int, content: str, guild: FakeGuild, channel: FakeChannel, author: FakeMember, created_at: datetime.datetime) -> None:
+        self.id = _id
+        self.content = content
+        self.guild = guild
+        self.channel = channel
+        self.author = author
+        self.attachments = []
+        self.created_at = created_at
+        self.deleted = False
+
+    async def delete(self) -> None:
+        self.deleted = True
+        self.guild.deleted.add(self.id)
+
+
+class FakeInvite:
+    def __init__(self, guild_id: int) -> None:
+        self.guild = FakeRole(guild_id) # only .id is used
+
+
+class InMemoryCollection:
+    """Same interface as automod.mongo.MongoCollection, backed by a dict"""
+    def __init__(self, ConfigView) -> None:
+        self._ConfigView = ConfigView
+        self.data: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._key_versions: Dict[Tuple[str, str], int] = {}
+        self._resets: Dict[str, int] = {}
+        self._views: Dict[str, Tuple[int, Any]] = {}
+
+    def _bump(self, _id, keys: Optional[List[str]] = None) -> None:
+        version = self._versions.get(str(_id), 0) + 1
+        self._versions[str(_id)] = version
+        if keys == None:
+            self._resets[str(_id)] = version
+        else:
+            for k in keys: self._key_versions[(str(_id), k)] = version
+        self._views.pop(str(_id), None)
+
+    def version(self, _id) -> int:
+        return self._versions.get(str(_id), 0)
+
+    def key_version(self, _id, key: str) -> int:
+        return max(self._key_versions.get((str(_id), key), 0), self._resets.get(str(_id), 0))
+
+    def get(self, _id, key: str) -> Any:
+        doc = self.data.get(str(_id), None)
+        return doc.get(key, None) if doc != None else None
+
+    def get_doc(self, _id) -> Optional[Dict[str, Any]]:
+        return self.data.get(str(_id), None)
+
+    def get_view(self, _id):
+        doc = self.get_doc(_id)
+        if doc == None: return None
+        entry = self._views.get(str(_id), None)
+        if entry == None:
+            entry = (self.version(_id), self._ConfigView(dict(doc)))
+            self._views[str(_id)] = entry
+        return entry[1]
+
+    def exists(self, _id) -> bool:
+        return str(_id) in self.data
+
+    def insert(self, schema: Dict[str, Any]) -> None:
+        self.data[str(schema["id"])] = schema
+        self._bump(schema["id"])
+
+    def update(self, _id, key: str, value: Any) -> None:
+        if str(_id) in self.data: self.data[str(_id)][key] = value
+        self._bump(_id, [key])
+
+    def multi_update(self, _id, updates: Dict[str, Any]) -> None:
+        for k, v in updates.items(): self.update(_id, k, v)
+
+    def delete(self, _id) -> None:
+        self.data.pop(str(_id), None)
+        self._bump(_id)
+
+    def find(self, _filter: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [x for x in self.data.values() if all(x.get(k) == v for k, v in _filter.items())]
+
+    # the async methods of MongoCollection, there's no I/O to wait for here
+
+    async def get_async(self, _id, key: str) -> Any:
+        return self.get(_id, key)
+
+    async def get_doc_async(self, _id) -> Optional[Dict[str, Any]]:
+        return self.get_doc(_id)
+
+    async def exists_async(self, _id) -> bool:
+        return self.exists(_id)
+
+    async def insert_async(self, schema: Dict[str, Any]) -> None:
+        self.insert(schema)
+
+    async def update_async(self, _id, key: str, value: Any) -> None:
+        self.update(_id, key, value)
+
+    async def multi_update_async(self, _id, updates: Dict[str, Any]) -> None:
+        self.multi_update(_id, updates)
+
+    async def inc_async(self, _id, key: str, amount: int = 1) -> None:
+        self.update(_id, key, (self.get(_id, key) or 0) + amount)
+
+    async def delete_async(self, _id) -> None:
+        self.delete(_id)
+
+
+class FakeDB:
+    def __init__(self, ConfigView) -> None:
+        for name in ["configs", "tags", "cases", "warns", "mutes", "level", "slowmodes", "tbans", "responders", "highlights", "stats"]:
+            setattr(self, name, InMemoryCollection(ConfigView))
+
+
+class FakeEmotes:
+    def get(self, key: str) -> str:
+        return f":{key.lower()}:"
+
+
+class FakeLocale:
+    def t(self, guild, key: str, _emote: str = None, **kwargs) -> str:
+        return key
+
+    def get(self, key: str, lang: str = "en_US", **kwargs) -> str:
+        return key
+
+
+class FakeBot:
+    def __init__(self, utils, Object, ConfigView, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.config = Object(json.load(open("automod/config.json", "r", encoding="utf8")))
+        self.user = FakeMember(BOT_ID, FakeGuild(0, 0, 0), bot=True)
+        self.db = FakeDB(ConfigView)
+        self.emotes = FakeEmotes()
+        self.locale = FakeLocale()
+        self.ignore_for_events: List[int] = []
+        self.auto_processing: List[str] = []
+        self.log_queue: Dict[int, Dict[str, List[Dict[str, Any]]]] = {}
+        self.invite_guilds: Dict[str, int] = {}
+        self.http_calls = 0
+
+        self.rule_plans = utils.RulePlanCache(self)
+        self.regex_sandbox = utils.RegexSandbox(self)
+        self.message_features = utils.MessageFeatureCache()
+        self.invites = utils.InviteResolver(self)
+        self.deletions = utils.DeletionBatcher(self)
+        self.permissions = utils.PermissionCache(self)
+        self.metrics = utils.RuleMetrics(1, False)
+
+    async def fetch_invite(self, code: str, **kwargs) -> FakeInvite:
+        self.http_calls += 1
+        return FakeInvite(self.invite_guilds.get(code, 999))
+
+    def dispatch(self, *args, **kwargs) -> None:
+        pass
+
+    def get_plugin(self, name: str):
+        return None
+
+
+# --- corpora -----------------------------------------------------------------------------------------------------
+
+
+WORDS = [
+    "the", "a", "is", "it", "this", "that", "game", "server", "anyone", "know", "when", "event", "starts", "today",
+    "lol", "nice", "thanks", "help", "please", "what", "time", "patch", "update", "new", "bug", "fixed", "yes", "no",
+    "maybe", "tomorrow", "weekend", "play", "join", "voice", "chat", "good", "morning", "night", "everyone", "again"
+]
+
+
+def chat_line(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 18)))
+
+
+def random_word(rng: random.Random, lo: int = 4, hi: int = 10) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(lo, hi)))
+
+
+CORPORA: Dict[str, Callable[[random.Random, List[str]], str]] = {
+    "clean": lambda rng, bl: chat_line(rng),
+    "link_spam": lambda rng, bl: f"{chat_line(rng)} https://{random_word(rng)}.com/{random_word(rng)} check it",
+    "invite_spam": lambda rng, bl: f"join us discord.gg/{rng.choice(['abc', 'xyz', 'raid', random_word(rng)])} {chat_line(rng)}",
+    "zalgo": lambda rng, bl: "".join(c + "̶̵̿" if c.isalpha() else c for c in chat_line(rng)),
+    "caps": lambda rng, bl: chat_line(rng).upper(),
+    "mention_flood": lambda rng, bl: " ".join(f"<@{GUILD_ID + 100000 + rng.randrange(200)}>" for _ in range(rng.randint(5, 25))),
+    "filter_hits": lambda rng, bl: f"{chat_line(rng)} {rng.choice(bl[:1000]).rstrip('*')}" if rng.random() < 0.2 else chat_line(rng)
+}
+
+
+# --- rule configs ------------------------------------------------------------------------------------------------
+
+
+def make_config(GuildConfig, guild: FakeGuild, name: str, blacklist: List[str]) -> Dict[str, Any]:
+    cfg = GuildConfig(guild, "+")
+    if name == "none": return cfg
+
+    cfg["automod"] = {
+        "invites": {"warns": 0},
+        "links": {"warns": 0},
+        "files": {"warns": 0},
+        "zalgo": {"warns": 0},
+        "mentions": {"threshold": 10},
+        "lines": {"threshold": 15},
+        "length": {"threshold": 1500},
+        "emotes": {"threshold": 15},
+        "repeat": {"threshold": 8},
+        "copypasta": {"threshold": 5},
+        "caps": {"warns": 0}
+    }
+    cfg["antispam"] = {"enabled": True, "rate": 10, "per": 10, "warns": 0}
+    cfg["white_listed_links"] = ["youtube.com", "discord.com"]
+    cfg["black_listed_links"] = ["grabify.link"]
+
+    per_filter = 200 if name == "all_rules" else 2000
+    cfg["filters"] = {
+        f"filter{i}": {"words": blacklist[i * per_filter:(i + 1) * per_filter], "channels": [], "warns": 0} for i in range(5)
+    }
+    cfg["regexes"] = {
+        "phone": {"regex": r"\b\d{3}[-. ]\d{3}[-. ]\d{4}\b", "channels": [], "warns": 0},
+        "crypto": {"regex": r"free\s+(nitro|crypto|btc)", "channels": [], "warns": 0},
+        "ip": {"regex": r"\b(?:\d{1,3}\.){3}\d{1,3}\b", "channels": [], "warns": 0}
+    }
+    return cfg
+
+
+SCENARIOS = [
+    ("none", "clean"),
+    ("all_rules", "clean"),
+    ("all_rules", "link_spam"),
+    ("all_rules", "invite_spam"),
+    ("all_rules", "zalgo"),
+    ("all_rules", "caps"),
+    ("all_rules", "mention_flood"),
+    ("all_rules", "filter_hits"),
+    ("filters_10k", "clean"),
+    ("filters_10k", "filter_hits")
+]
+
+
+# --- runner ------------------------------------------------------------------------------------------------------
+
+
+def percentile(values: List[int], q: float) -> float:
+    if len(values) < 1: return 0.0
+    values = sorted(values)
+    return float(values[min(int(q * len(values)), len(values) - 1)])
+
+
+async def replay(mods, config_name: str, corpus: str, amount: int) -> Dict[str, Any]:
+    plugin_mod, utils, Object, ConfigView, GuildConfig = mods
+    rng = random.Random(f"{config_name}-{corpus}")
+
+    bot = FakeBot(utils, Object, ConfigView, asyncio.get_running_loop())
+    guild = FakeGuild(GUILD_ID, 200, 10)
+    blacklist = [random_word(rng) + ("*" if i % 10 == 0 else "") for i in range(10000)]
+    bot.db.configs.insert(make_config(GuildConfig, guild, config_name, blacklist))
+
+    plugin = plugin_mod.AutomodPlugin(bot)
+    start = datetime.datetime.now(datetime.timezone.utc)
+
+    def messages(n: int, offset: int) -> List[FakeMessage]:
+        out = []
+        for i in range(n):
+            # spam corpora come from a handful of accounts, chat from everyone
+            authors = guild.members[:5] if corpus not in ["clean", "filter_hits"] else guild.members
+            created_at = start + datetime.timedelta(seconds=(offset + i) * 0.05)
+            out.append(FakeMessage(
+                discord.utils.time_snowflake(created_at) + i % 4096,
+                CORPORA[corpus](rng, blacklist),
+                guild,
+                rng.choice(guild.channels),
+                rng.choice(authors),
+                created_at
+            ))
+        return out
+
+    # warm up plan/matcher caches, then time
+    for m in messages(50, 0): await plugin.enforce_rules(m)
+    bot.metrics = utils.RuleMetrics(1, False)
+
+    msgs = messages(amount, 100)
+    latencies = []
+    t = time.perf_counter()
+    for m in msgs:
+        s = time.perf_counter_ns()
+        await plugin.enforce_rules(m)
+        latencies.append(time.perf_counter_ns() - s)
+    elapsed = time.perf_counter() - t
+
+    # per-rule timings of the timed pass only
+    rules = {
+        k: {"avg_us": round(v.avg() / 1000, 2), "hits": v.hits} for k, v in sorted(bot.metrics.rules.items()) if v.samples > 0 or v.hits > 0
+    }
+
+    # allocations are measured on a separate pass, tracing slows everything down
+    alloc_msgs = messages(min(amount, 500), 100 + amount)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for m in alloc_msgs: await plugin.enforce_rules(m)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    allocated = sum(x.size_diff for x in diff if x.size_diff > 0)
+    blocks = sum(x.count_diff for x in diff if x.count_diff > 0)
+
+    queue = getattr(plugin, "action_queue", None)
+    while queue != None and len(queue) > 0: await asyncio.sleep(0.01)
+    if queue != None:
+        for t in queue.workers: t.cancel()
+    await bot.deletions.flush()
+    bot.regex_sandbox.executor.shutdown(wait=False)
+    return {
+        "messages": amount,
+        "msgs_per_sec": round(amount / elapsed, 1),
+        "p50_us": round(percentile(latencies, 0.50) / 1000, 2),
+        "p99_us": round(percentile(latencies, 0.99) / 1000, 2),
+        "actions": sum(1 for m in msgs if m.id in guild.deleted),
+        "retained_bytes_per_msg": round(allocated / len(alloc_msgs), 1),
+        "retained_blocks_per_msg": round(blocks / len(alloc_msgs), 2),
+        "peak_kib": round(peak / 1024, 1),
+        "invite_fetches": bot.http_calls,
+        "delete_requests": bot.deletions.requests,
+        "queued_actions": {
+            "processed": queue.processed, 
+            "merged": queue.merged, 
+            "dropped": queue.dropped
+        } if queue != None else None,
+        "rules": rules
+    }
+
+
+def git_rev() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> int:
+    regressions = 0
+    for name, res in results["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name, None)
+        if old == None: continue
+        change = (res["msgs_per_sec"] - old["msgs_per_sec"]) / max(old["msgs_per_sec"], 1e-9)
+        flag = ""
+        if change < -REGRESSION_THRESHOLD:
+            flag = "  <-- regression"
+            regressions += 1
+        print(f"{name:<28} {old['msgs_per_sec']:>10.0f} -> {res['msgs_per_sec']:>10.0f} msg/s ({change * 100:+.1f}%){flag}")
+    return regressions
+
+
+async def main(args) -> int:
+    mods = load_automod()
+    results = {
+        "commit": git_rev(),
+        "python": platform.python_version(),
+        "date": datetime.datetime.utcnow().isoformat(timespec="seconds"),
+        "scenarios": {}
+    }
+    for config_name, corpus in SCENARIOS:
+        name = f"{config_name}/{corpus}"
+        res = await replay(mods, config_name, corpus, args.messages)
+        results["scenarios"][name] = res
+        print(
+            f"{name:<28} {res['msgs_per_sec']:>10.0f} msg/s | p50 {res['p50_us']:>8.1f}us | p99 {res['p99_us']:>8.1f}us"
+            f" | {res['retained_bytes_per_msg']:>8.0f} B/msg | {res['actions']:>5} actions"
+        )
+
+    regressions = 0
+    if args.baseline != None:
+        with open(args.baseline, "r", encoding="utf8") as f:
+            regressions = compare(results, json.load(f))
+
+    with open(args.out, "w", encoding="utf8") as f:
+        json.dump(results, f, indent=4)
+    print(f"Results written to {args.out}")
+    return 1 if regressions > 0 else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--out", type=str, default=os.path.join(tempfile.gettempdir(), "automod_replay.json"))
+    parser.add_argument("--baseline", type=str, default=None, help="previous results to compare against")
+    args = parser.parse_args()
+    args.out = str(Path(args.out).resolve())
+    if args.baseline != None: args.baseline = str(Path(args.baseline).resolve())
+
+    sys.exit(asyncio.run(main(args)))
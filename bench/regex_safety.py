@@ -0,0 +1,82 @@
+"""
+Regression cases for the static catastrophic-backtracking check (is_catastrophic in
+automod/utils/sandbox.py). Every unsafe pattern has to be rejected, every safe one
+accepted. The unsafe ones are also timed against an adversarial input for reference.
+Exits 1 if the check classifies any pattern wrong.
+
+Usage (from the repo root):
+    python bench/regex_safety.py [--timeout 0.1]
+"""
+
+import argparse
+import importlib.util
+import sys
+import time
+from typing import List, Tuple
+
+
+
+# (pattern, adversarial input)
+UNSAFE: List[Tuple[str, str]] = [
+    (r"(a|aa)+$", "a" * 40 + "!"),
+    (r"(ab|a)+$", "ab" * 20 + "!"),
+    (r"(foo|foobar)*$", "foo" * 20 + "!"),
+    (r"(?:a|aa)+$", "a" * 40 + "!"),
+    (r"(a|)+$", "a" * 40 + "!"),
+    (r"(a+)+$", "a" * 40 + "!"),
+    (r"(\w+\s?)*$", "word " * 12 + "!"),
+    (r"(a*b*)*$", "ab" * 20 + "!"),
+]
+
+
+SAFE: List[str] = [
+    r"(cat|dog)+",
+    r"(a|b)+",
+    r"(ab|cd)+x",
+    r"https?://\S+",
+    r"(\d{1,3}\.){3}\d{1,3}",
+    r"(free|nitro)\s+(gift|steam)",
+    r"(?:discord\.gg|discord\.com/invite)/\w+",
+    r"[a-z]+@[a-z]+\.com",
+]
+
+
+def load_sandbox():
+    # Loaded by path, importing the automod package would require a bot config
+    spec = importlib.util.spec_from_file_location("sandbox", "automod/utils/sandbox.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--timeout", type=float, default=0.1, help="Seconds an unsafe pattern may run")
+    args = parser.parse_args()
+
+    sandbox = load_sandbox()
+    wrong = 0
+
+    for pattern, text in UNSAFE:
+        flagged = sandbox.is_catastrophic(pattern)
+        start = time.perf_counter()
+        try:
+            sandbox.compile_regex(pattern).search(text, timeout=args.timeout)
+            took = f"{(time.perf_counter() - start) * 1000:8.2f}ms"
+        except TimeoutError:
+            took = "  timeout"
+        wrong += not flagged
+        print(f"{'ok   ' if flagged else 'MISS '} unsafe {pattern:<45} {took}")
+
+    for pattern in SAFE:
+        flagged = sandbox.is_catastrophic(pattern)
+        wrong += flagged
+        print(f"{'FALSE' if flagged else 'ok   '} safe   {pattern}")
+
+    if wrong > 0:
+        print(f"{wrong} pattern(s) classified wrong")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()